@@ -19,6 +19,7 @@ from backend.app.services.note_file_service import NoteFileService
 from backend.app.services.note_metadata_service import NoteMetadataService
 from backend.app.services.note_vectorization_service import NoteVectorizationService
 from backend.app.services.workflow_orchestrator import WorkflowOrchestrator
+from backend.app.utils.filesystem import note_id_from_path
 
 logger = logging.getLogger(__name__)
 
@@ -123,7 +124,7 @@ async def get_note_links(file_path: str):
         links = metadata.links
 
         # Get linked notes from SQLite
-        note_id = str(file_path).replace("\\", "/").replace(".md", "")
+        note_id = note_id_from_path(file_path)
         linked_notes = note_metadata_service.get_linked_notes(note_id)
         backlinks = note_metadata_service.get_backlinks(note_id)
 
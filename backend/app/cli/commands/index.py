@@ -179,7 +179,7 @@ def reindex_notes():
     note_service = NoteVectorizationService()
     
     try:
-        vectorized_count, skipped_count = note_service.vectorize_all_notes(
+        vectorized_count, skipped_count = note_service.vectorize_all_notes_batched(
             force=True, incremental=False
         )
         
@@ -274,7 +274,7 @@ def clean(chromadb, sqlite, all_databases, yes):
     WARNING: This will permanently delete all indexed data!
     """
     from backend.app.utils.filesystem import BASE_DIR
-    from backend.app.utils.chromadb_config import chromadb_config
+    from backend.app.utils.chromadb_config import get_chromadb_config
     import shutil
     
     if all_databases:
@@ -299,7 +299,7 @@ def clean(chromadb, sqlite, all_databases, yes):
     try:
         if chromadb:
             # Delete ChromaDB directory
-            chroma_path = chromadb_config.persist_directory
+            chroma_path = get_chromadb_config().persist_directory
             if chroma_path.exists():
                 shutil.rmtree(chroma_path)
                 click.echo(f"✓ Deleted ChromaDB directory: {chroma_path}")
@@ -10,6 +10,7 @@ from backend.app.services.note_file_service import NoteFileService
 from backend.app.services.note_metadata_service import NoteMetadataService
 from backend.app.services.note_vectorization_service import NoteVectorizationService
 from backend.app.services.workflow_orchestrator import WorkflowOrchestrator
+from backend.app.utils.filesystem import note_id_from_path
 
 
 @click.group(name="note")
@@ -224,7 +225,7 @@ def show_links(file_path, from_note_id, json_output):
             links = metadata.links
 
             # Also get linked notes from SQLite if available
-            note_id = str(file_path).replace("\\", "/").replace(".md", "")
+            note_id = note_id_from_path(file_path)
             linked_notes = note_metadata_service.get_linked_notes(note_id)
 
             if json_output:
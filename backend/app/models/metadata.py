@@ -172,6 +172,9 @@ class DocumentMetadata(BaseModel):
         """
         Create DocumentMetadata from ChromaDB metadata.
 
+        ChromaDB metadata is written by to_chromadb_metadata, so field
+        validation is skipped; only the enum values are checked.
+
         Args:
             metadata: ChromaDB metadata dictionary
 
@@ -188,16 +191,16 @@ class DocumentMetadata(BaseModel):
         if "links" in metadata and metadata["links"]:
             links = metadata["links"].split(",") if isinstance(metadata["links"], str) else metadata["links"]
 
-        return cls(
+        return cls.model_construct(
             doc_id=metadata["doc_id"],
-            doc_type=DocType(metadata["doc_type"]),
+            doc_type=DocType(metadata["doc_type"]).value,
             file_path=metadata.get("file_path"),
             title=metadata["title"],
             created_at=metadata["created_at"],
             updated_at=metadata.get("updated_at"),
             tags=tags,
             links=links,
-            source=SourceType(metadata.get("source", "unknown")),
+            source=SourceType(metadata.get("source", "unknown")).value,
             chunk_index=metadata.get("chunk_index", 0),
             chunk_total=metadata.get("chunk_total"),
             author=metadata.get("author"),
@@ -1,7 +1,12 @@
 """Agent tools for Agentic Search - defines search and retrieval tools."""
 
+import functools
 import logging
-from typing import Any, Dict, List, Optional
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from langchain_core.documents import Document
 
@@ -9,11 +14,46 @@ from backend.app.models.metadata import NoteMetadata
 from backend.app.services.embedding_service import EmbeddingService
 from backend.app.services.note_file_service import NoteFileService
 from backend.app.services.note_metadata_service import NoteMetadataService
-from backend.app.services.retriever import ChromaDBRetriever
+from backend.app.services.retriever import ChromaDBRetriever, embed_query_cached
 from backend.app.services.vector_service import VectorService
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of per-note tool results kept in memory
+NOTE_CACHE_SIZE = int(os.getenv("AGENT_NOTE_CACHE_SIZE", "1024"))
+
+# Seconds a cached per-note tool result stays valid (notes may be edited)
+NOTE_CACHE_TTL = float(os.getenv("AGENT_NOTE_CACHE_TTL", "60"))
+
+
+def _copy_result(value: Any) -> Any:
+    """Shallow-copy a tool result so callers can annotate it without touching the cache."""
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, list):
+        return [dict(item) if isinstance(item, dict) else item for item in value]
+    return value
+
+
+def _cached_by_note_id(method: Callable) -> Callable:
+    """
+    Memoize a per-note tool method on (method name, note_id).
+
+    Search strategies revisit the same notes within a session (e.g. the hybrid
+    strategy runs note-first and then link expansion from the same seed), so
+    recent results are served from memory for NOTE_CACHE_TTL seconds.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: "AgentTools", note_id: str):
+        hit, value = self._get_cached_note_result(method.__name__, note_id)
+        if not hit:
+            value = method(self, note_id)
+            self._put_cached_note_result(method.__name__, note_id, value)
+        return _copy_result(value)
+
+    return wrapper
+
 
 class AgentTools:
     """Collection of tools for agentic search."""
@@ -42,6 +82,10 @@ class AgentTools:
         self.embedding_service = embedding_service
         self.collection_name = collection_name
 
+        # Recent per-note tool results, see _cached_by_note_id
+        self._note_cache: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._note_cache_lock = threading.Lock()
+
         # Create retriever for PDF/document chunks
         self.retriever = ChromaDBRetriever(
             vector_service=vector_service,
@@ -72,8 +116,9 @@ class AgentTools:
             if not all_notes:
                 return []
 
-            # Generate query embedding
-            query_embedding = self.embedding_service.embed_text(query)
+            # Generate query embedding (shared with the document retriever's
+            # cache, so a following search_pdf_chunks for the same query reuses it)
+            query_embedding = embed_query_cached(self.embedding_service, query)
 
             # Generate embeddings for all note titles
             note_titles = [note.title for note in all_notes]
@@ -126,6 +171,45 @@ class AgentTools:
             logger.error(f"Error searching notes by title: {e}")
             return []
 
+    def _get_cached_note_result(self, tool_name: str, note_id: str) -> Tuple[bool, Any]:
+        """
+        Look up a fresh cached per-note tool result.
+
+        Returns:
+            (True, value) on a hit, (False, None) otherwise
+        """
+        key = (tool_name, note_id)
+        with self._note_cache_lock:
+            entry = self._note_cache.get(key)
+            if entry is None or time.monotonic() - entry[0] >= NOTE_CACHE_TTL:
+                return False, None
+            self._note_cache.move_to_end(key)
+            return True, entry[1]
+
+    def _put_cached_note_result(self, tool_name: str, note_id: str, value: Any):
+        """Cache a per-note tool result, evicting the least recently used entries."""
+        key = (tool_name, note_id)
+        with self._note_cache_lock:
+            self._note_cache[key] = (time.monotonic(), value)
+            self._note_cache.move_to_end(key)
+            while len(self._note_cache) > NOTE_CACHE_SIZE:
+                self._note_cache.popitem(last=False)
+
+    @staticmethod
+    def _note_metadata_to_dict(note: NoteMetadata) -> Dict[str, Any]:
+        """Convert NoteMetadata to the dictionary returned by get_note_metadata."""
+        return {
+            "note_id": note.note_id,
+            "title": note.title,
+            "file_path": note.file_path,
+            "tags": note.tags,
+            "links": note.links,
+            "frontmatter": note.frontmatter,
+            "created_at": note.created_at.isoformat(),
+            "updated_at": note.updated_at.isoformat(),
+        }
+
+    @_cached_by_note_id
     def get_note_metadata(self, note_id: str) -> Optional[Dict[str, Any]]:
         """
         Get note metadata by note_id.
@@ -141,22 +225,13 @@ class AgentTools:
             if not note:
                 return None
 
-            return {
-                "note_id": note.note_id,
-                "title": note.title,
-                "file_path": note.file_path,
-                "tags": note.tags,
-                "links": note.links,
-                "frontmatter": note.frontmatter,
-                "created_at": note.created_at.isoformat(),
-                "updated_at": note.updated_at.isoformat(),
-            }
+            return self._note_metadata_to_dict(note)
 
         except Exception as e:
             logger.error(f"Error getting note metadata: {e}")
             return None
 
-    def get_notes_by_tag(self, tag: str) -> List[Dict[str, Any]]:
+    def get_notes_by_tag(self, tag: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Get all notes with a specific tag.
         
@@ -164,6 +239,7 @@ class AgentTools:
 
         Args:
             tag: Tag name (with or without # prefix)
+            limit: Optional maximum number of notes
 
         Returns:
             List of note metadata dictionaries
@@ -172,7 +248,7 @@ class AgentTools:
             # Normalize tag to Obsidian style (#tag)
             normalized_tag = tag if tag.startswith("#") else f"#{tag}"
             
-            notes = self.note_metadata_service.get_notes_by_tag(normalized_tag)
+            notes = self.note_metadata_service.get_notes_by_tag(normalized_tag, limit=limit)
             return [
                 {
                     "note_id": note.note_id,
@@ -188,6 +264,7 @@ class AgentTools:
             logger.error(f"Error getting notes by tag: {e}")
             return []
 
+    @_cached_by_note_id
     def get_linked_notes(self, note_id: str) -> List[Dict[str, Any]]:
         """
         Get all notes linked from a given note.
@@ -240,6 +317,7 @@ class AgentTools:
             logger.error(f"Error getting backlinks: {e}")
             return []
 
+    @_cached_by_note_id
     def read_note_content(self, note_id: str) -> Optional[str]:
         """
         Read full content of a note.
@@ -262,6 +340,93 @@ class AgentTools:
             logger.error(f"Error reading note content: {e}")
             return None
 
+    def get_notes_metadata(self, note_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get metadata for several notes with a single lookup.
+
+        Shares the per-note cache with get_note_metadata.
+
+        Args:
+            note_ids: Note identifiers
+
+        Returns:
+            Dictionary mapping note_id to metadata dictionary (missing notes are omitted)
+        """
+        found, missing = self._split_cached("get_note_metadata", note_ids)
+        if missing:
+            try:
+                notes = self.note_metadata_service.get_note_metadata_by_ids(missing)
+            except Exception as e:
+                logger.error(f"Error getting note metadata: {e}")
+                return found
+
+            for note_id in missing:
+                note = notes.get(note_id)
+                metadata = self._note_metadata_to_dict(note) if note else None
+                self._put_cached_note_result("get_note_metadata", note_id, metadata)
+                if metadata:
+                    found[note_id] = _copy_result(metadata)
+
+        return found
+
+    def read_note_contents(self, note_ids: List[str]) -> Dict[str, str]:
+        """
+        Read full content of several notes, resolving their paths in one lookup.
+
+        Shares the per-note cache with read_note_content.
+
+        Args:
+            note_ids: Note identifiers
+
+        Returns:
+            Dictionary mapping note_id to content (missing notes are omitted)
+        """
+        found, missing = self._split_cached("read_note_content", note_ids)
+        if missing:
+            try:
+                notes = self.note_metadata_service.get_note_metadata_by_ids(missing)
+            except Exception as e:
+                logger.error(f"Error reading note content: {e}")
+                return found
+
+            for note_id in missing:
+                content = None
+                note = notes.get(note_id)
+                if note:
+                    try:
+                        _, _, content = self.note_file_service.read_note(note.file_path)
+                    except Exception as e:
+                        logger.error(f"Error reading note content: {e}")
+                self._put_cached_note_result("read_note_content", note_id, content)
+                if content:
+                    found[note_id] = content
+
+        return found
+
+    def _split_cached(
+        self, tool_name: str, note_ids: List[str]
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Split note_ids into cached results and ids that still need a lookup.
+
+        Returns:
+            (note_id -> non-empty cached value, unique uncached note_ids)
+        """
+        found: Dict[str, Any] = {}
+        missing: List[str] = []
+        for note_id in dict.fromkeys(note_ids):
+            hit, value = self._get_cached_note_result(tool_name, note_id)
+            if not hit:
+                missing.append(note_id)
+            elif value:
+                found[note_id] = _copy_result(value)
+        return found, missing
+
+    def clear_note_cache(self):
+        """Drop cached per-note tool results (e.g. after notes are edited)."""
+        with self._note_cache_lock:
+            self._note_cache.clear()
+
     def search_pdf_chunks(
         self, query: str, limit: int = 5
     ) -> List[Dict[str, Any]]:
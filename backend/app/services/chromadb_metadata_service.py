@@ -1,14 +1,23 @@
 """Service for querying note and document metadata from ChromaDB."""
 
 import logging
+import threading
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from backend.app.models.metadata import DocumentMetadata, DocType, NoteMetadata, SourceType
 from backend.app.services.vector_service import VectorService
+from backend.app.utils.filesystem import note_id_from_path
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of values per $in filter (keeps SQLite under its variable limit)
+IN_FILTER_BATCH_SIZE = 900
+
+# Notes are kept in an in-memory cache only up to this many (typical vaults
+# are far smaller); larger stores are always queried directly
+NOTE_CACHE_MAX_NOTES = 50000
+
 
 class ChromaDBMetadataService:
     """
@@ -18,6 +27,12 @@ class ChromaDBMetadataService:
     Supports all material types: PDF, URL, picture, note, etc.
     """
     
+    # In-memory note snapshots shared by all instances (services are often
+    # created per request), keyed by (persist directory, collection name).
+    # Each entry is (write generation, doc_id -> NoteMetadata, file_path -> doc_id).
+    _note_caches: Dict[tuple, tuple] = {}
+    _cache_lock = threading.RLock()
+    
     def __init__(self, vector_service: Optional[VectorService] = None):
         """
         Initialize ChromaDB metadata service.
@@ -27,9 +42,72 @@ class ChromaDBMetadataService:
         """
         self.vector_service = vector_service or VectorService()
         self.collection_name = self.vector_service.collection_names["documents"]
+        self._collection = None
+        self._cache_key = (
+            str(self.vector_service.config.persist_directory),
+            self.collection_name,
+        )
         logger.info("ChromaDB metadata service initialized")
     
-    def get_notes_by_tag(self, tag: str) -> List[NoteMetadata]:
+    @property
+    def collection(self):
+        """
+        ChromaDB collection holding document and note chunks.
+        
+        Resolved on first use and reused afterwards, so repeated metadata
+        lookups don't re-run get_or_create_collection.
+        """
+        if self._collection is None:
+            self._collection = self.vector_service.get_or_create_collection(self.collection_name)
+        return self._collection
+    
+    def _get_note_cache(self) -> Tuple[Optional[Dict[str, NoteMetadata]], Dict[str, str]]:
+        """
+        Get the in-memory note cache, (re)loading it if stored notes changed.
+        
+        Returns:
+            Tuple of (doc_id -> NoteMetadata, file_path -> doc_id). The first
+            item is None if the store holds more than NOTE_CACHE_MAX_NOTES notes.
+        """
+        with self._cache_lock:
+            generation = VectorService.write_generation
+            cached = self._note_caches.get(self._cache_key)
+            if cached is not None and cached[0] == generation:
+                return cached[1], cached[2]
+            
+            results = self.collection.get(
+                where={
+                    "$and": [
+                        {"doc_type": DocType.NOTE.value},
+                        {"chunk_index": 0},
+                    ]
+                },
+                include=["metadatas"]
+            )
+            metadatas = results.get("metadatas") or []
+            
+            note_cache = None
+            path_index = {}
+            if len(metadatas) <= NOTE_CACHE_MAX_NOTES:
+                note_cache = {}
+                for metadata_dict in metadatas:
+                    doc_id = metadata_dict.get("doc_id")
+                    if doc_id and doc_id not in note_cache:
+                        doc_metadata = DocumentMetadata.from_chromadb_metadata(metadata_dict)
+                        note_cache[doc_id] = self._document_to_note_metadata(doc_metadata)
+                        path_index.setdefault(metadata_dict.get("file_path"), doc_id)
+            else:
+                logger.debug(f"Skipping note cache: {len(metadatas)} notes exceeds limit")
+            
+            self._note_caches[self._cache_key] = (generation, note_cache, path_index)
+            return note_cache, path_index
+    
+    def invalidate_cache(self):
+        """Drop the in-memory note cache so the next lookup reloads it."""
+        with self._cache_lock:
+            self._note_caches.pop(self._cache_key, None)
+    
+    def get_notes_by_tag(self, tag: str, limit: Optional[int] = None) -> List[NoteMetadata]:
         """
         Get all notes with a specific tag.
         
@@ -37,12 +115,13 @@ class ChromaDBMetadataService:
         
         Args:
             tag: Tag name (with or without # prefix)
+            limit: Optional maximum number of notes; lookups stop once reached
             
         Returns:
             List of NoteMetadata instances
         """
         try:
-            collection = self.vector_service.get_or_create_collection(self.collection_name)
+            collection = self.collection
             
             # Normalize tag to Obsidian style (#tag)
             normalized_tag = tag if tag.startswith("#") else f"#{tag}"
@@ -57,19 +136,15 @@ class ChromaDBMetadataService:
                 where_document={"$contains": normalized_tag}
             )
             
-            # Method 2: Filter by metadata tags (application layer)
-            # This is more precise but requires getting all notes first
-            all_notes = collection.get(
-                where={"doc_type": DocType.NOTE.value},
-                include=["metadatas"]
-            )
-            
             note_metadata_list = []
             seen_note_ids = set()
             
             # Process results from document search
             if results.get("ids") and len(results["ids"]) > 0:
                 for i, doc_id in enumerate(results["ids"][0]):
+                    if limit is not None and len(note_metadata_list) >= limit:
+                        break
+
                     metadata_dict = results["metadatas"][0][i]
                     note_id = metadata_dict.get("doc_id", doc_id)
                     
@@ -95,6 +170,17 @@ class ChromaDBMetadataService:
                         note_metadata = self._document_to_note_metadata(full_metadata)
                         note_metadata_list.append(note_metadata)
             
+            if limit is not None and len(note_metadata_list) >= limit:
+                logger.debug(f"Found {len(note_metadata_list)} notes with tag '{tag}' (limit reached)")
+                return note_metadata_list
+
+            # Method 2: Filter by metadata tags (application layer)
+            # This is more precise but requires getting all notes first
+            all_notes = collection.get(
+                where={"doc_type": DocType.NOTE.value},
+                include=["metadatas"]
+            )
+
             # Also check metadata tags (more precise)
             for metadata_dict in all_notes.get("metadatas", []):
                 tags_str = metadata_dict.get("tags", "")
@@ -112,6 +198,8 @@ class ChromaDBMetadataService:
                             full_metadata = DocumentMetadata.from_chromadb_metadata(metadata_dict)
                             note_metadata = self._document_to_note_metadata(full_metadata)
                             note_metadata_list.append(note_metadata)
+                            if limit is not None and len(note_metadata_list) >= limit:
+                                break
             
             logger.debug(f"Found {len(note_metadata_list)} notes with tag '{tag}'")
             return note_metadata_list
@@ -131,7 +219,7 @@ class ChromaDBMetadataService:
             List of linked NoteMetadata instances
         """
         try:
-            collection = self.vector_service.get_or_create_collection(self.collection_name)
+            collection = self.collection
             
             # Get source note
             source_results = collection.get(
@@ -156,58 +244,68 @@ class ChromaDBMetadataService:
             if not links:
                 return []
             
+            # Method 1: By doc_id - resolve all links with a single lookup
+            id_results = collection.get(
+                where={"doc_id": {"$in": links}},
+                include=["metadatas"]
+            )
+            metadata_by_doc_id = {}
+            for metadata_dict in id_results.get("metadatas") or []:
+                metadata_by_doc_id.setdefault(metadata_dict.get("doc_id"), metadata_dict)
+
+            # (file_path, file_path without extension, metadata) for the
+            # file_path fallback, fetched and normalized at most once
+            note_paths = None
+
             # Find linked notes
             linked_notes = []
             for link_name in links:
-                # Try to find note by various methods
-                # Method 1: By doc_id
-                results = collection.get(
-                    where={"doc_id": link_name},
-                    limit=1,
-                    include=["metadatas"]
-                )
-                
+                metadata_dict = metadata_by_doc_id.get(link_name)
+
                 # Method 2: By file_path
-                if not results["ids"]:
+                if metadata_dict is None:
                     # ChromaDB doesn't support $contains in where clause directly
                     # So we need to get all notes and filter
-                    all_notes = collection.get(
-                        where={"doc_type": DocType.NOTE.value},
-                        include=["metadatas"]
+                    if note_paths is None:
+                        note_metadatas = collection.get(
+                            where={
+                                "$and": [
+                                    {"doc_type": DocType.NOTE.value},
+                                    {"chunk_index": 0},
+                                ]
+                            },
+                            include=["metadatas"]
+                        ).get("metadatas") or []
+                        note_paths = []
+                        for candidate in note_metadatas:
+                            file_path = candidate.get("file_path", "")
+                            note_paths.append((file_path, note_id_from_path(file_path), candidate))
+                    metadata_dict = next(
+                        (
+                            candidate
+                            for file_path, stem, candidate in note_paths
+                            if link_name in file_path or stem == link_name
+                        ),
+                        None
                     )
-                    for metadata_dict in all_notes.get("metadatas", []):
-                        file_path = metadata_dict.get("file_path", "")
-                        if link_name in file_path or file_path.replace(".md", "") == link_name:
-                            results = collection.get(
-                                where={"doc_id": metadata_dict.get("doc_id")},
-                                limit=1,
-                                include=["metadatas"]
-                            )
-                            break
-                
+
                 # Method 3: By title (using document search)
-                if not results["ids"]:
+                if metadata_dict is None:
                     search_results = collection.query(
                         query_texts=[link_name],
-                        n_results=5,
-                        where={"doc_type": DocType.NOTE.value}
-                    )
-                    if search_results.get("ids") and len(search_results["ids"]) > 0:
-                        # Get first result's metadata
-                        first_id = search_results["ids"][0][0]
-                        results = collection.get(
-                            where={"doc_id": first_id},
-                            limit=1,
-                            include=["metadatas"]
-                        )
-                
-                if results["ids"]:
-                    linked_metadata = DocumentMetadata.from_chromadb_metadata(
-                        results["metadatas"][0]
+                        n_results=1,
+                        where={"doc_type": DocType.NOTE.value},
+                        include=["metadatas"]
                     )
+                    if search_results.get("ids") and search_results["ids"][0]:
+                        # Use first result's metadata directly
+                        metadata_dict = search_results["metadatas"][0][0]
+
+                if metadata_dict is not None:
+                    linked_metadata = DocumentMetadata.from_chromadb_metadata(metadata_dict)
                     linked_note = self._document_to_note_metadata(linked_metadata)
                     linked_notes.append(linked_note)
-            
+
             logger.debug(f"Found {len(linked_notes)} linked notes for '{note_id}'")
             return linked_notes
             
@@ -228,7 +326,7 @@ class ChromaDBMetadataService:
             List of NoteMetadata instances that link to this note
         """
         try:
-            collection = self.vector_service.get_or_create_collection(self.collection_name)
+            collection = self.collection
             
             # Get target note to find its title/file_path for searching
             target_results = collection.get(
@@ -253,38 +351,31 @@ class ChromaDBMetadataService:
             
             # Also try file_path without extension
             if target_metadata.file_path:
-                file_stem = target_metadata.file_path.replace("\\", "/").replace(".md", "")
+                file_stem = note_id_from_path(target_metadata.file_path)
                 search_terms.append(f"[[{file_stem}]]")
             
             backlinks = []
             seen_note_ids = set()
             
-            for search_term in search_terms:
-                results = collection.query(
-                    query_texts=[""],
-                    n_results=100,
-                    where={"doc_type": DocType.NOTE.value},
-                    where_document={"$contains": search_term}
-                )
-                
-                if results.get("ids") and len(results["ids"]) > 0:
-                    for doc_id in results["ids"][0]:
-                        # Get full metadata for this note
-                        note_results = collection.get(
-                            where={"doc_id": doc_id},
-                            limit=1,
-                            include=["metadatas"]
-                        )
-                        
-                        if note_results["ids"]:
-                            note_id_from_result = note_results["metadatas"][0].get("doc_id", doc_id)
-                            if note_id_from_result not in seen_note_ids and note_id_from_result != note_id:
-                                seen_note_ids.add(note_id_from_result)
-                                note_metadata = DocumentMetadata.from_chromadb_metadata(
-                                    note_results["metadatas"][0]
-                                )
-                                backlink_note = self._document_to_note_metadata(note_metadata)
-                                backlinks.append(backlink_note)
+            # A single filtered get() matches every search term at once and
+            # returns the chunk metadata directly, so no per-hit lookups or
+            # query embedding are needed
+            results = collection.get(
+                where={"doc_type": DocType.NOTE.value},
+                where_document={
+                    "$or": [{"$contains": search_term} for search_term in search_terms]
+                },
+                limit=100 * len(search_terms),
+                include=["metadatas"]
+            )
+
+            for doc_id, metadata_dict in zip(results["ids"], results["metadatas"]):
+                note_id_from_result = metadata_dict.get("doc_id", doc_id)
+                if note_id_from_result not in seen_note_ids and note_id_from_result != note_id:
+                    seen_note_ids.add(note_id_from_result)
+                    note_metadata = DocumentMetadata.from_chromadb_metadata(metadata_dict)
+                    backlink_note = self._document_to_note_metadata(note_metadata)
+                    backlinks.append(backlink_note)
             
             # Method 2: Check links metadata field
             all_notes = collection.get(
@@ -322,7 +413,7 @@ class ChromaDBMetadataService:
             List of DocumentMetadata instances
         """
         try:
-            collection = self.vector_service.get_or_create_collection(self.collection_name)
+            collection = self.collection
             
             results = collection.get(
                 where={"source": source_type.value},
@@ -366,7 +457,7 @@ class ChromaDBMetadataService:
             List of DocumentMetadata instances
         """
         try:
-            collection = self.vector_service.get_or_create_collection(self.collection_name)
+            collection = self.collection
             
             # Get all materials with this tag in metadata
             all_materials = collection.get(
@@ -411,7 +502,11 @@ class ChromaDBMetadataService:
             NoteMetadata instance or None if not found
         """
         try:
-            collection = self.vector_service.get_or_create_collection(self.collection_name)
+            note_cache, _ = self._get_note_cache()
+            if note_cache is not None:
+                return note_cache.get(note_id)
+            
+            collection = self.collection
             
             results = collection.get(
                 where={
@@ -442,30 +537,121 @@ class ChromaDBMetadataService:
         Returns:
             NoteMetadata instance or None if not found
         """
+        return self.get_note_metadata_by_paths([file_path]).get(file_path)
+    
+    def get_note_metadata_by_paths(self, file_paths: List[str]) -> Dict[str, NoteMetadata]:
+        """
+        Get note metadata for many file paths at once.
+        
+        Issues one `$in` lookup per batch of paths instead of one query per path.
+        
+        Args:
+            file_paths: File paths relative to notes directory
+            
+        Returns:
+            Dictionary mapping file path to NoteMetadata (missing paths are omitted)
+        """
+        notes_by_path: Dict[str, NoteMetadata] = {}
+        if not file_paths:
+            return notes_by_path
+        
         try:
-            collection = self.vector_service.get_or_create_collection(self.collection_name)
+            note_cache, path_index = self._get_note_cache()
+            if note_cache is not None:
+                for file_path in file_paths:
+                    doc_id = path_index.get(file_path)
+                    if doc_id is not None:
+                        notes_by_path[file_path] = note_cache[doc_id]
+                return notes_by_path
+            
+            collection = self.collection
+            
+            unique_paths = list(dict.fromkeys(file_paths))
+            for i in range(0, len(unique_paths), IN_FILTER_BATCH_SIZE):
+                batch = unique_paths[i:i + IN_FILTER_BATCH_SIZE]
+                results = collection.get(
+                    where={
+                        "$and": [
+                            {"doc_type": DocType.NOTE.value},
+                            {"chunk_index": 0},
+                            {"file_path": {"$in": batch}},
+                        ]
+                    },
+                    include=["metadatas"]
+                )
+                
+                for metadata_dict in results.get("metadatas") or []:
+                    file_path = metadata_dict.get("file_path")
+                    if file_path not in notes_by_path:
+                        doc_metadata = DocumentMetadata.from_chromadb_metadata(metadata_dict)
+                        notes_by_path[file_path] = self._document_to_note_metadata(doc_metadata)
             
-            # Get all notes and filter by file_path
-            all_notes = collection.get(
-                where={"doc_type": DocType.NOTE.value},
-                include=["metadatas"]
-            )
+            return notes_by_path
             
-            for metadata_dict in all_notes.get("metadatas", []):
-                if metadata_dict.get("file_path") == file_path:
-                    doc_metadata = DocumentMetadata.from_chromadb_metadata(metadata_dict)
-                    return self._document_to_note_metadata(doc_metadata)
+        except Exception as e:
+            logger.error(f"Error getting note metadata by paths: {e}")
+            return notes_by_path
+    
+    def get_note_metadata_by_ids(self, note_ids: List[str]) -> Dict[str, NoteMetadata]:
+        """
+        Get note metadata for many note_ids at once.
+        
+        Issues one `$in` lookup per batch of ids instead of one query per note.
+        
+        Args:
+            note_ids: Note identifiers
             
-            return None
+        Returns:
+            Dictionary mapping note_id to NoteMetadata (missing ids are omitted)
+        """
+        notes_by_id: Dict[str, NoteMetadata] = {}
+        if not note_ids:
+            return notes_by_id
+        
+        try:
+            note_cache, _ = self._get_note_cache()
+            if note_cache is not None:
+                for note_id in note_ids:
+                    note = note_cache.get(note_id)
+                    if note is not None:
+                        notes_by_id[note_id] = note
+                return notes_by_id
+            
+            collection = self.collection
+            
+            unique_ids = list(dict.fromkeys(note_ids))
+            for i in range(0, len(unique_ids), IN_FILTER_BATCH_SIZE):
+                batch = unique_ids[i:i + IN_FILTER_BATCH_SIZE]
+                results = collection.get(
+                    where={
+                        "$and": [
+                            {"doc_type": DocType.NOTE.value},
+                            {"chunk_index": 0},
+                            {"doc_id": {"$in": batch}},
+                        ]
+                    },
+                    include=["metadatas"]
+                )
+                
+                for metadata_dict in results.get("metadatas") or []:
+                    note_id = metadata_dict.get("doc_id")
+                    if note_id not in notes_by_id:
+                        doc_metadata = DocumentMetadata.from_chromadb_metadata(metadata_dict)
+                        notes_by_id[note_id] = self._document_to_note_metadata(doc_metadata)
+            
+            return notes_by_id
             
         except Exception as e:
-            logger.error(f"Error getting note metadata by path: {e}")
-            return None
+            logger.error(f"Error getting note metadata by ids: {e}")
+            return notes_by_id
     
     def _document_to_note_metadata(self, doc_metadata: DocumentMetadata) -> NoteMetadata:
         """
         Convert DocumentMetadata to NoteMetadata.
         
+        The input comes from stored ChromaDB metadata, so NoteMetadata is
+        built without re-running field validation.
+        
         Args:
             doc_metadata: DocumentMetadata instance
             
@@ -474,23 +660,29 @@ class ChromaDBMetadataService:
         """
         # Parse file_path to get note_id
         note_id = (
-            doc_metadata.file_path.replace("\\", "/").replace(".md", "")
+            note_id_from_path(doc_metadata.file_path)
             if doc_metadata.file_path
             else doc_metadata.doc_id
         )
         
-        return NoteMetadata(
+        created_at = datetime.fromisoformat(doc_metadata.created_at)
+        # Most notes are never edited after indexing, so updated_at is either
+        # missing or identical to created_at; reuse the parsed value then
+        if not doc_metadata.updated_at:
+            updated_at = datetime.now()
+        elif doc_metadata.updated_at == doc_metadata.created_at:
+            updated_at = created_at
+        else:
+            updated_at = datetime.fromisoformat(doc_metadata.updated_at)
+
+        return NoteMetadata.model_construct(
             note_id=note_id,
             title=doc_metadata.title,
             file_path=doc_metadata.file_path or "",
             tags=doc_metadata.tags,
             links=doc_metadata.links,
-            created_at=datetime.fromisoformat(doc_metadata.created_at),
-            updated_at=(
-                datetime.fromisoformat(doc_metadata.updated_at)
-                if doc_metadata.updated_at
-                else datetime.now()
-            ),
+            created_at=created_at,
+            updated_at=updated_at,
             frontmatter={},  # Could be extracted from metadata if stored
         )
 
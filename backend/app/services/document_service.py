@@ -14,7 +14,7 @@ from backend.app.services.embedding_service import EmbeddingService
 from backend.app.services.note_metadata_service import NoteMetadataService
 from backend.app.services.vector_service import VectorService
 from backend.app.utils.file_hash import get_file_hash_and_metadata
-from backend.app.utils.filesystem import BASE_DIR, RESOURCES_DIR, NOTES_DIR, ensure_file_directory
+from backend.app.utils.filesystem import BASE_DIR, RESOURCES_DIR, NOTES_DIR, ensure_file_directory, note_id_from_path, posix_path_str
 from backend.app.utils.text_cleaner import TextCleaner
 
 logger = logging.getLogger(__name__)
@@ -78,7 +78,7 @@ class DocumentService:
 
             # Query by file_hash
             results = collection.get(
-                where={"file_hash": file_hash}, include=["metadatas"]
+                where={"file_hash": file_hash}, limit=1, include=["metadatas"]
             )
 
             if results["ids"]:
@@ -101,7 +101,7 @@ class DocumentService:
         Returns:
             Tuple of (DocType, SourceType)
         """
-        path_str = str(file_path).replace("\\", "/")
+        path_str = posix_path_str(file_path)
         
         # Check if it's a note (in resources/notes/ directory)
         if "resources/notes/" in path_str or path_str.startswith("notes/"):
@@ -188,6 +188,42 @@ class DocumentService:
         Returns:
             DocumentMetadata of the processed document
 
+        Raises:
+            DuplicateDocumentError: If duplicate found and skip_duplicates=True
+        """
+        text, metadata = self.prepare_markdown(
+            content,
+            file_path=file_path,
+            skip_duplicates=skip_duplicates,
+            import_batch=import_batch,
+        )
+
+        try:
+            # Process and store (pass original content for note processing)
+            return self._process_and_store(text, metadata, original_content=content)
+        except Exception as e:
+            logger.error(f"Error processing markdown: {e}")
+            raise
+
+    def prepare_markdown(
+        self,
+        content: str,
+        file_path: Optional[str] = None,
+        skip_duplicates: bool = True,
+        import_batch: Optional[str] = None,
+    ) -> Tuple[str, DocumentMetadata]:
+        """
+        Process markdown content and build its metadata without storing it.
+
+        Args:
+            content: Markdown content
+            file_path: Optional file path
+            skip_duplicates: If True, skip files that already exist
+            import_batch: Optional batch identifier for tracking
+
+        Returns:
+            Tuple of (processed text, DocumentMetadata)
+
         Raises:
             DuplicateDocumentError: If duplicate found and skip_duplicates=True
         """
@@ -240,8 +276,7 @@ class DocumentService:
                 metadata.doc_type = doc_type
                 metadata.source = source_type
 
-            # Process and store (pass original content for note processing)
-            return self._process_and_store(text, metadata, original_content=content)
+            return text, metadata
 
         except DuplicateDocumentError:
             raise
@@ -367,6 +402,55 @@ class DocumentService:
         Returns:
             Updated DocumentMetadata with chunk information
         """
+        try:
+            document_ids, document_texts, document_metadatas = self.prepare_chunks(
+                text, metadata, original_content=original_content
+            )
+
+            if not document_texts:
+                return metadata
+
+            # Generate embeddings
+            embeddings = self.embedding_service.embed_texts(document_texts)
+
+            # Store in vector database
+            collection_name = self.vector_service.collection_names["documents"]
+            self.vector_service.add_documents(
+                collection_name=collection_name,
+                documents=document_texts,
+                ids=document_ids,
+                metadatas=document_metadatas,
+                embeddings=embeddings,
+            )
+
+            logger.info(
+                f"Stored {len(document_texts)} chunks for document: {metadata.title}"
+            )
+
+            return metadata
+
+        except Exception as e:
+            logger.error(f"Error processing and storing document: {e}")
+            raise
+
+    def prepare_chunks(
+        self, text: str, metadata: DocumentMetadata, original_content: Optional[str] = None
+    ) -> Tuple[List[str], List[str], List[dict]]:
+        """
+        Chunk a document and build the ChromaDB IDs and metadatas for its chunks.
+
+        Nothing is embedded or stored, so callers can batch chunks from many
+        documents into a single embedding and insert call.
+
+        Args:
+            text: Processed text content
+            metadata: Document metadata (chunk_total is updated in place)
+            original_content: Optional original markdown content (needed for note processing)
+
+        Returns:
+            Tuple of (chunk IDs, chunk texts, chunk metadatas); all empty if
+            no chunks were generated
+        """
         try:
             # Check if this is a note that needs structured information storage
             is_note = (
@@ -389,53 +473,39 @@ class DocumentService:
 
             if not chunks:
                 logger.warning(f"No chunks generated for document: {metadata.title}")
-                return metadata
+                return [], [], []
 
             logger.info(
                 f"Generated {total_chunks} chunks for document: {metadata.title}"
             )
 
-            # Generate embeddings
-            embeddings = self.embedding_service.embed_texts(chunks)
-
             # Prepare documents, IDs, and metadatas for ChromaDB
+            # Serialize the document-level metadata (tags, links, ...) once and
+            # only stamp the per-chunk fields onto each copy
+            base_metadata = metadata.to_chromadb_metadata()
+            base_metadata["chunk_total"] = total_chunks
+
             document_ids = []
             document_texts = []
             document_metadatas = []
 
-            for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
+            for i, chunk in enumerate(chunks):
                 # Create chunk ID
                 chunk_id = f"{metadata.doc_id}_chunk_{i}"
 
-                # Update metadata for this chunk
-                chunk_metadata = metadata.model_copy()
-                chunk_metadata.chunk_index = i
-                chunk_metadata.chunk_total = total_chunks
+                chunk_metadata = dict(base_metadata)
+                chunk_metadata["chunk_index"] = i
 
                 document_ids.append(chunk_id)
                 document_texts.append(chunk)
-                document_metadatas.append(chunk_metadata.to_chromadb_metadata())
-
-            # Store in vector database
-            collection_name = self.vector_service.collection_names["documents"]
-            self.vector_service.add_documents(
-                collection_name=collection_name,
-                documents=document_texts,
-                ids=document_ids,
-                metadatas=document_metadatas,
-                embeddings=embeddings,
-            )
-
-            logger.info(
-                f"Stored {total_chunks} chunks for document: {metadata.title}"
-            )
+                document_metadatas.append(chunk_metadata)
 
             # Update metadata with chunk information
             metadata.chunk_total = total_chunks
-            return metadata
+            return document_ids, document_texts, document_metadatas
 
         except Exception as e:
-            logger.error(f"Error processing and storing document: {e}")
+            logger.error(f"Error preparing document chunks: {e}")
             raise
 
     def _is_note_path(self, file_path: str) -> bool:
@@ -450,7 +520,7 @@ class DocumentService:
         """
         try:
             path = Path(file_path)
-            path_str = str(path).replace("\\", "/")
+            path_str = posix_path_str(path)
             
             # Check if it's in resources/notes/ directory
             if "resources/notes/" in path_str:
@@ -523,9 +593,9 @@ class DocumentService:
                 # Try to get relative path from resources/notes directory
                 try:
                     # Check if it's in resources/notes/
-                    if "resources/notes/" in str(file_path_obj).replace("\\", "/"):
+                    if "resources/notes/" in posix_path_str(file_path_obj):
                         # Extract relative path from resources/notes/
-                        path_str = str(file_path_obj).replace("\\", "/")
+                        path_str = posix_path_str(file_path_obj)
                         if "resources/notes/" in path_str:
                             relative_path_str = path_str.split("resources/notes/")[-1]
                             relative_path = Path(relative_path_str)
@@ -534,12 +604,12 @@ class DocumentService:
                     else:
                         # Try old notes directory for backward compatibility
                         relative_path = file_path_obj.relative_to(NOTES_DIR)
-                    note_id = str(relative_path).replace("\\", "/").replace(".md", "")
+                    note_id = note_id_from_path(relative_path)
                     # Also update file_path to relative path for consistency
                     file_path_for_db = str(relative_path)
                 except ValueError:
                     # If not in notes directory, use the file path as-is
-                    note_id = str(file_path_obj).replace("\\", "/").replace(".md", "")
+                    note_id = note_id_from_path(file_path_obj)
                     file_path_for_db = metadata.file_path
             else:
                 note_id = metadata.doc_id
@@ -630,13 +700,13 @@ class DocumentService:
         try:
             collection_name = self.vector_service.collection_names["documents"]
 
-            # Query all chunks for this document
+            # Query all chunks for this document (only the IDs are needed)
             collection = self.vector_service.get_or_create_collection(collection_name)
-            results = collection.get(where={"doc_id": doc_id})
+            results = collection.get(where={"doc_id": doc_id}, include=[])
 
             if results["ids"]:
                 # Delete all chunks
-                collection.delete(ids=results["ids"])
+                self.vector_service.delete_documents(collection_name, results["ids"])
                 logger.info(f"Deleted {len(results['ids'])} chunks for document: {doc_id}")
             else:
                 logger.warning(f"No chunks found for document: {doc_id}")
@@ -660,11 +730,11 @@ class DocumentService:
             collection = self.vector_service.get_or_create_collection(collection_name)
 
             # Query all chunks for this file hash
-            results = collection.get(where={"file_hash": file_hash})
+            results = collection.get(where={"file_hash": file_hash}, include=[])
 
             if results["ids"]:
                 # Delete all chunks
-                collection.delete(ids=results["ids"])
+                self.vector_service.delete_documents(collection_name, results["ids"])
                 logger.info(f"Deleted {len(results['ids'])} chunks for file hash: {file_hash[:8]}...")
                 return True
             else:
@@ -0,0 +1,112 @@
+"""Persistent cache of text embeddings keyed by content hash."""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from backend.app.utils.chromadb_config import get_chromadb_config
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of values per IN clause (keeps SQLite under its variable limit)
+IN_CLAUSE_BATCH_SIZE = 900
+
+
+class EmbeddingCache:
+    """
+    SQLite-backed cache mapping text content hashes to embeddings.
+
+    Notes often repeat boilerplate (templates, headers), so identical chunks
+    only need to be embedded once. Embeddings are stored as float32 blobs.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None, namespace: str = ""):
+        """
+        Initialize embedding cache.
+
+        Args:
+            db_path: Path to the cache database. If None, stored next to the
+                    ChromaDB data so both are removed together.
+            namespace: Identifies the embedding model/precision; texts hashed
+                      under different namespaces never share entries.
+        """
+        self.db_path = Path(db_path) if db_path else (
+            get_chromadb_config().persist_directory / "embedding_cache.sqlite3"
+        )
+        self.namespace = namespace
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embedding_cache "
+            "(hash TEXT PRIMARY KEY, embedding BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+        logger.info(f"Initialized embedding cache at {self.db_path} (namespace={namespace})")
+
+    def hash_text(self, text: str) -> str:
+        """
+        Hash a text within this cache's namespace.
+
+        Args:
+            text: Text to hash
+
+        Returns:
+            Hex digest used as the cache key
+        """
+        payload = f"{self.namespace}\0{text}".encode("utf-8")
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def get_many(self, hashes: List[str]) -> Dict[str, List[float]]:
+        """
+        Look up cached embeddings.
+
+        Args:
+            hashes: Keys from hash_text
+
+        Returns:
+            Dictionary mapping found keys to embeddings
+        """
+        found: Dict[str, List[float]] = {}
+        unique_hashes = list(dict.fromkeys(hashes))
+
+        with self._lock:
+            for i in range(0, len(unique_hashes), IN_CLAUSE_BATCH_SIZE):
+                batch = unique_hashes[i:i + IN_CLAUSE_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT hash, embedding FROM embedding_cache WHERE hash IN ({placeholders})",
+                    batch,
+                )
+                for key, blob in rows:
+                    vector = array("f")
+                    vector.frombytes(blob)
+                    found[key] = vector.tolist()
+
+        return found
+
+    def put_many(self, embeddings: Dict[str, List[float]]):
+        """
+        Store embeddings, keeping existing entries.
+
+        Args:
+            embeddings: Dictionary mapping keys from hash_text to embeddings
+        """
+        if not embeddings:
+            return
+
+        rows = [
+            (key, array("f", embedding).tobytes())
+            for key, embedding in embeddings.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embedding_cache (hash, embedding) VALUES (?, ?)",
+                rows,
+            )
+            self._conn.commit()
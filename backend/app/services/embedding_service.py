@@ -17,6 +17,9 @@ from backend.app.utils.embedding_config import (
 
 logger = logging.getLogger(__name__)
 
+# Supported model weight precisions
+SUPPORTED_DTYPES = ("float32", "float16", "bfloat16")
+
 
 class EmbeddingService:
     """Service for generating text embeddings using unified configuration."""
@@ -27,6 +30,7 @@ class EmbeddingService:
         device: Optional[str] = None,
         preload: bool = False,
         config=None,
+        dtype: Optional[str] = None,
     ):
         """
         Initialize embedding service.
@@ -38,6 +42,9 @@ class EmbeddingService:
                    If None, uses global embedding_config device setting.
             preload: If True, load the model immediately. Default False (lazy loading).
             config: Optional EmbeddingConfig instance. If None, uses global embedding_config.
+            dtype: Model weight precision ('float32', 'float16' or 'bfloat16').
+                  If None, uses global embedding_config dtype setting.
+                  Half precision is only used on CUDA devices.
         """
         # Use provided config or global config
         self.config = config if config is not None else embedding_config
@@ -67,11 +74,23 @@ class EmbeddingService:
                 device = "cpu"
 
         self.device = device
+
+        # Precision selection: parameter > config > float32
+        if dtype is None:
+            dtype = getattr(self.config, "dtype", "float32")
+        if dtype not in SUPPORTED_DTYPES:
+            logger.warning(f"Unsupported embedding dtype '{dtype}', using float32")
+            dtype = "float32"
+        elif dtype != "float32" and (torch is None or device != "cuda"):
+            logger.warning(f"Embedding dtype '{dtype}' requires CUDA, using float32")
+            dtype = "float32"
+        self.dtype = dtype
+
         self._model: Optional[SentenceTransformer] = None
 
         logger.info(
             f"Initialized embedding service: model={model_name}, "
-            f"device={device}, dimension={self.config.dimension}"
+            f"device={device}, dtype={dtype}, dimension={self.config.dimension}"
         )
         if device == "cuda" and torch is not None:
             logger.info(f"Using GPU: {torch.cuda.get_device_name(0)}")
@@ -92,6 +111,8 @@ class EmbeddingService:
             try:
                 logger.info(f"Loading embedding model: {self.model_name}")
                 self._model = SentenceTransformer(self.model_name, device=self.device)
+                if self.dtype != "float32":
+                    self._model.to(getattr(torch, self.dtype))
                 logger.info(f"Embedding model loaded successfully on {self.device}")
             except Exception as e:
                 logger.error(f"Error loading embedding model: {e}")
@@ -99,6 +120,18 @@ class EmbeddingService:
 
         return self._model
 
+    def _encode(self, texts, **kwargs):
+        """
+        Encode text(s) into a float32 numpy array.
+
+        Half-precision model outputs are upcast to float32 so stored vectors
+        and cosine distances keep full precision.
+        """
+        if self.dtype == "float32":
+            return self.model.encode(texts, convert_to_numpy=True, **kwargs)
+        embeddings = self.model.encode(texts, convert_to_tensor=True, **kwargs)
+        return embeddings.float().cpu().numpy()
+
     def embed_text(self, text: str) -> List[float]:
         """
         Generate embedding for a single text.
@@ -110,7 +143,7 @@ class EmbeddingService:
             List of embedding values
         """
         try:
-            embedding = self.model.encode(text, convert_to_numpy=True)
+            embedding = self._encode(text)
             return embedding.tolist()
         except Exception as e:
             logger.error(f"Error generating embedding: {e}")
@@ -139,9 +172,7 @@ class EmbeddingService:
             batch_size = 128 if self.device == "cuda" else 32
 
         try:
-            embeddings = self.model.encode(
-                texts, batch_size=batch_size, convert_to_numpy=True
-            )
+            embeddings = self._encode(texts, batch_size=batch_size)
             return embeddings.tolist()
         except Exception as e:
             logger.error(f"Error generating embeddings: {e}")
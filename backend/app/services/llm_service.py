@@ -68,6 +68,14 @@ class LLMService:
 
         return self._llm
 
+    def warm_up(self):
+        """
+        Create the LLM client ahead of the first request.
+
+        Lets callers overlap client setup with other work, such as retrieval.
+        """
+        _ = self.llm
+
     def invoke(self, prompt: str, **kwargs) -> str:
         """
         Generate text synchronously.
@@ -1,15 +1,16 @@
 """Note file management service for Obsidian-style notes."""
 
 import logging
+import os
 import re
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import yaml
 
 from backend.app.models.metadata import NoteMetadata
-from backend.app.utils.filesystem import NOTES_DIR, ensure_directories
+from backend.app.utils.filesystem import NOTES_DIR, ensure_directories, note_id_from_path
 
 logger = logging.getLogger(__name__)
 
@@ -173,20 +174,46 @@ class NoteFileService:
         Returns:
             List of note file paths (relative to notes directory)
         """
+        relative_notes = list(self.iter_notes(subdirectory))
+        logger.debug(f"Found {len(relative_notes)} notes")
+        return relative_notes
+
+    def iter_notes(self, subdirectory: Optional[str] = None) -> Iterator[Path]:
+        """
+        Iterate over note files without collecting them into a list first.
+
+        Walks the directory tree with os.scandir, so the first paths are
+        available immediately and memory stays flat for large vaults.
+
+        Args:
+            subdirectory: Optional subdirectory to search within notes directory
+
+        Yields:
+            Note file paths (relative to notes directory)
+        """
         search_dir = (
             self.notes_directory / subdirectory if subdirectory else self.notes_directory
         )
 
         if not search_dir.exists():
-            return []
-
-        notes = list(search_dir.rglob("*.md"))
-        # Convert to relative paths
-        relative_notes = [
-            note.relative_to(self.notes_directory) for note in notes
-        ]
-        logger.debug(f"Found {len(relative_notes)} notes")
-        return relative_notes
+            return
+
+        # Depth-first, each directory's notes before its subdirectories, the
+        # same order as rglob; symlinked directories aren't followed
+        pending_dirs = [search_dir]
+        while pending_dirs:
+            directory = pending_dirs.pop()
+            subdirectories = []
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirectories.append(Path(entry.path))
+                        elif entry.name.endswith(".md") and entry.is_file():
+                            yield Path(entry.path).relative_to(self.notes_directory)
+            except OSError as e:
+                logger.warning(f"Error listing notes in '{directory}': {e}")
+            pending_dirs.extend(reversed(subdirectories))
 
     def get_note_metadata(self, file_path: str) -> NoteMetadata:
         """
@@ -255,7 +282,7 @@ class NoteFileService:
                 tags.append(normalized_tag)
 
         # Generate note ID from file path
-        note_id = str(file_path).replace("\\", "/").replace(".md", "")
+        note_id = note_id_from_path(file_path)
 
         return NoteMetadata(
             note_id=note_id,
@@ -2,9 +2,9 @@
 
 import logging
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional
 
-from backend.app.models.metadata import DocumentMetadata, NoteMetadata
+from backend.app.models.metadata import DocumentMetadata, DocType, NoteMetadata
 from backend.app.services.chromadb_metadata_service import ChromaDBMetadataService
 
 logger = logging.getLogger(__name__)
@@ -67,6 +67,18 @@ class NoteMetadataService:
         """
         return self.chromadb_service.get_note_metadata(note_id)
 
+    def get_note_metadata_by_ids(self, note_ids: List[str]) -> Dict[str, NoteMetadata]:
+        """
+        Get note metadata for many note_ids in a single lookup.
+
+        Args:
+            note_ids: Note identifiers
+
+        Returns:
+            Dictionary mapping note_id to NoteMetadata (missing ids are omitted)
+        """
+        return self.chromadb_service.get_note_metadata_by_ids(note_ids)
+
     def get_note_metadata_by_path(self, file_path: str) -> Optional[NoteMetadata]:
         """
         Get note metadata by file path.
@@ -79,17 +91,30 @@ class NoteMetadataService:
         """
         return self.chromadb_service.get_note_metadata_by_path(file_path)
 
-    def get_notes_by_tag(self, tag: str) -> List[NoteMetadata]:
+    def get_note_metadata_by_paths(self, file_paths: List[str]) -> Dict[str, NoteMetadata]:
+        """
+        Get note metadata for many file paths in a single lookup.
+
+        Args:
+            file_paths: File paths relative to notes directory
+
+        Returns:
+            Dictionary mapping file path to NoteMetadata (missing paths are omitted)
+        """
+        return self.chromadb_service.get_note_metadata_by_paths(file_paths)
+
+    def get_notes_by_tag(self, tag: str, limit: Optional[int] = None) -> List[NoteMetadata]:
         """
         Get all notes with a specific tag.
 
         Args:
             tag: Tag name
+            limit: Optional maximum number of notes
 
         Returns:
             List of NoteMetadata instances
         """
-        return self.chromadb_service.get_notes_by_tag(tag)
+        return self.chromadb_service.get_notes_by_tag(tag, limit=limit)
 
     def get_linked_notes(self, note_id: str) -> List[NoteMetadata]:
         """
@@ -137,6 +162,9 @@ class NoteMetadataService:
         """
         List all notes.
 
+        Only the first chunk of each note is fetched: every chunk carries the
+        same note-level metadata, so one row per note is enough to rebuild it.
+
         Returns:
             List of NoteMetadata instances
         """
@@ -144,35 +172,99 @@ class NoteMetadataService:
             collection = self.chromadb_service.vector_service.get_or_create_collection(
                 self.chromadb_service.collection_name
             )
-            
+
             results = collection.get(
-                where={"doc_type": "note"},
+                where={
+                    "$and": [
+                        {"doc_type": DocType.NOTE.value},
+                        {"chunk_index": 0},
+                    ]
+                },
                 include=["metadatas"]
             )
-            
+
             notes = []
             seen_note_ids = set()
-            
-            for metadata_dict in results.get("metadatas", []):
+
+            for metadata_dict in results.get("metadatas") or []:
                 doc_id = metadata_dict.get("doc_id")
                 if doc_id and doc_id not in seen_note_ids:
                     seen_note_ids.add(doc_id)
-                    # Get first chunk for each note
-                    note_chunks = collection.get(
-                        where={"doc_id": doc_id},
-                        limit=1,
-                        include=["metadatas"]
-                    )
-                    if note_chunks["metadatas"]:
-                        doc_metadata = DocumentMetadata.from_chromadb_metadata(
-                            note_chunks["metadatas"][0]
-                        )
-                        note_metadata = self.chromadb_service._document_to_note_metadata(doc_metadata)
-                        notes.append(note_metadata)
-            
+                    doc_metadata = DocumentMetadata.from_chromadb_metadata(metadata_dict)
+                    note_metadata = self.chromadb_service._document_to_note_metadata(doc_metadata)
+                    notes.append(note_metadata)
+
             return notes
         except Exception as e:
             logger.error(f"Error listing all notes: {e}")
             return []
 
+    def list_notes_page(self, offset: int = 0, limit: int = 100) -> List[NoteMetadata]:
+        """
+        List one page of notes.
+
+        Only the requested slice of first chunks is fetched and converted, so
+        callers rendering a single page don't pay for the whole vault.
+
+        Args:
+            offset: Number of notes to skip
+            limit: Maximum number of notes to return
+
+        Returns:
+            List of NoteMetadata instances (empty once past the last note or on error)
+        """
+        try:
+            return self._fetch_notes_page(offset, limit)
+        except Exception as e:
+            logger.error(f"Error listing notes page (offset={offset}, limit={limit}): {e}")
+            return []
 
+    def _fetch_notes_page(self, offset: int, limit: int) -> List[NoteMetadata]:
+        """Fetch one page of notes, letting ChromaDB errors propagate."""
+        results = self.chromadb_service.collection.get(
+            where={
+                "$and": [
+                    {"doc_type": DocType.NOTE.value},
+                    {"chunk_index": 0},
+                ]
+            },
+            offset=offset,
+            limit=limit,
+            include=["metadatas"]
+        )
+
+        return [
+            self.chromadb_service._document_to_note_metadata(
+                DocumentMetadata.from_chromadb_metadata(metadata_dict)
+            )
+            for metadata_dict in results.get("metadatas") or []
+        ]
+
+    def iter_all_notes(self, page_size: int = 500) -> Iterator[NoteMetadata]:
+        """
+        Iterate over all notes, fetching them page by page.
+
+        Yields the first notes after a single page query instead of
+        materializing the whole vault like list_all_notes.
+
+        Unlike list_notes_page, errors are raised rather than turned into an
+        empty page, so a failure mid-iteration can't pass for the end of the
+        notes.
+
+        Args:
+            page_size: Number of notes fetched per query
+
+        Yields:
+            NoteMetadata instances
+        """
+        offset = 0
+        while True:
+            try:
+                page = self._fetch_notes_page(offset, page_size)
+            except Exception as e:
+                logger.error(f"Error iterating notes at offset {offset}: {e}")
+                raise
+            yield from page
+            if len(page) < page_size:
+                return
+            offset += page_size
@@ -1,23 +1,48 @@
 """Service for vectorizing notes and managing note embeddings."""
 
+import json
 import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
+from queue import Full, Queue
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import List, Optional, Set, Tuple
 from uuid import uuid4
 
 from backend.app.models.metadata import DocumentMetadata, DocType, NoteMetadata, SourceType
 from backend.app.services.chunking_service import ChunkingService
 from backend.app.services.document_service import DocumentService
+from backend.app.services.embedding_cache import EmbeddingCache
 from backend.app.services.embedding_service import EmbeddingService
 from backend.app.services.note_file_service import NoteFileService
 from backend.app.services.note_metadata_service import NoteMetadataService
 from backend.app.services.vector_service import VectorService
-from backend.app.utils.filesystem import NOTES_DIR
+from backend.app.utils.file_hash import calculate_file_hash
+from backend.app.utils.filesystem import NOTES_DIR, note_id_from_path, posix_path_str
 from backend.app.utils.text_cleaner import TextCleaner
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of values per $in filter (keeps SQLite under its variable limit)
+IN_FILTER_BATCH_SIZE = 900
+
+# Seconds between checks that the writer thread is still alive while
+# waiting for room in its queue
+WRITE_QUEUE_POLL_INTERVAL = 1.0
+
+# Filter shared by every note lookup; merged into per-path where clauses
+NOTE_FILTER = {"doc_type": DocType.NOTE.value}
+
+# Per-note progress is logged once every this many notes
+PROGRESS_LOG_INTERVAL = 100
+
+# Notes handled per window in batched vectorization; each note contributes
+# two paths to the force-mode delete filter
+NOTE_WINDOW_SIZE = IN_FILTER_BATCH_SIZE // 2
+
 
 class NoteVectorizationService:
     """Service for vectorizing notes and managing note embeddings."""
@@ -49,8 +74,71 @@ class NoteVectorizationService:
         self.chunking_service = chunking_service or ChunkingService()
         self.embedding_service = embedding_service or EmbeddingService()
 
+        self.collection_name = self.vector_service.collection_names["documents"]
+        self._collection = None
+        self._embedding_cache: Optional[EmbeddingCache] = None
+
         logger.info("Note vectorization service initialized")
 
+    @property
+    def collection(self):
+        """
+        ChromaDB collection holding note chunks.
+
+        Resolved on first use and reused afterwards instead of calling
+        get_or_create_collection on every operation.
+        """
+        if self._collection is None:
+            self._collection = self.vector_service.get_or_create_collection(self.collection_name)
+        return self._collection
+
+    def reset_collection(self):
+        """Drop the cached collection handle, e.g. after the collection is recreated."""
+        self._collection = None
+
+    @property
+    def embedding_cache(self) -> EmbeddingCache:
+        """Content-hash embedding cache, scoped to the current model and precision."""
+        if self._embedding_cache is None:
+            self._embedding_cache = EmbeddingCache(
+                namespace=f"{self.embedding_service.model_name}:{self.embedding_service.dtype}"
+            )
+        return self._embedding_cache
+
+    def _embed_chunks(self, texts: List[str], batch_size: int) -> List[List[float]]:
+        """
+        Embed chunk texts, reusing cached embeddings for previously seen content.
+
+        Args:
+            texts: Chunk texts to embed
+            batch_size: Embedding batch size
+
+        Returns:
+            List of embeddings in the same order as texts
+        """
+        cache = self.embedding_cache
+        hashes = [cache.hash_text(text) for text in texts]
+        embeddings = cache.get_many(hashes)
+
+        # Embed each unseen text once, even if it repeats within the batch
+        missing = {}
+        for key, text in zip(hashes, texts):
+            if key not in embeddings and key not in missing:
+                missing[key] = text
+
+        if missing:
+            new_embeddings = self.embedding_service.embed_texts(
+                list(missing.values()), batch_size=batch_size
+            )
+            computed = dict(zip(missing.keys(), new_embeddings))
+            cache.put_many(computed)
+            embeddings.update(computed)
+
+        logger.debug(
+            f"Embedding cache: {len(texts) - len(missing)}/{len(texts)} chunks reused"
+        )
+        return [embeddings[key] for key in hashes]
+
     def is_note_vectorized(self, file_path: str) -> bool:
         """
         Check if a note is already vectorized in ChromaDB.
@@ -62,19 +150,16 @@ class NoteVectorizationService:
             True if note is vectorized, False otherwise
         """
         try:
-            collection_name = self.vector_service.collection_names["documents"]
-            collection = self.vector_service.get_or_create_collection(collection_name)
+            collection = self.collection
 
             # Generate note_id from file_path (same logic as DocumentService)
-            note_id = str(file_path).replace("\\", "/").replace(".md", "")
+            note_id = note_id_from_path(file_path)
 
             # Query for documents with matching file_path and doc_type=note
             results = collection.get(
-                where={
-                    "file_path": str(file_path),
-                    "doc_type": DocType.NOTE.value,
-                },
+                where={"file_path": str(file_path), **NOTE_FILTER},
                 limit=1,
+                include=[],
             )
 
             return len(results["ids"]) > 0
@@ -82,6 +167,60 @@ class NoteVectorizationService:
             logger.warning(f"Error checking if note is vectorized: {e}")
             return False
 
+    def _delete_notes_vectors(self, file_paths: List[str]) -> int:
+        """
+        Delete all vectors for many notes with one lookup and one delete.
+
+        Args:
+            file_paths: Note file paths as stored in chunk metadata
+
+        Returns:
+            Number of deleted chunks
+        """
+        collection = self.collection
+
+        ids = []
+        for i in range(0, len(file_paths), IN_FILTER_BATCH_SIZE):
+            batch = file_paths[i:i + IN_FILTER_BATCH_SIZE]
+            results = collection.get(
+                where={
+                    "$and": [
+                        NOTE_FILTER,
+                        {"file_path": {"$in": batch}},
+                    ]
+                },
+                include=[],
+            )
+            ids.extend(results["ids"])
+
+        if ids:
+            self.vector_service.delete_documents(self.collection_name, ids)
+            logger.info(f"Deleted {len(ids)} vectors for {len(file_paths)} note paths")
+        return len(ids)
+
+    def _get_vectorized_note_paths(self) -> Set[str]:
+        """
+        Get the file paths of all vectorized notes with a single query.
+
+        Returns:
+            Set of stored note file paths
+        """
+        collection = self.collection
+        results = collection.get(
+            where={
+                "$and": [
+                    NOTE_FILTER,
+                    {"chunk_index": 0},
+                ]
+            },
+            include=["metadatas"],
+        )
+        return {
+            metadata["file_path"]
+            for metadata in results.get("metadatas") or []
+            if metadata.get("file_path")
+        }
+
     def vectorize_note(self, file_path: str, force: bool = False) -> DocumentMetadata:
         """
         Vectorize a single note.
@@ -105,19 +244,81 @@ class NoteVectorizationService:
         if not force and self.is_note_vectorized(file_path):
             logger.info(f"Note '{file_path}' is already vectorized. Use --force to re-vectorize.")
             # Get existing metadata from ChromaDB
-            collection_name = self.vector_service.collection_names["documents"]
-            collection = self.vector_service.get_or_create_collection(collection_name)
+            collection = self.collection
             results = collection.get(
-                where={
-                    "file_path": str(file_path),
-                    "doc_type": DocType.NOTE.value,
-                },
+                where={"file_path": str(file_path), **NOTE_FILTER},
                 limit=1,
+                include=["metadatas"],
             )
             if results["ids"]:
                 metadata_dict = results["metadatas"][0]
                 return DocumentMetadata.from_chromadb_metadata(metadata_dict)
 
+        stale_doc_id = None
+        if not force:
+            unchanged, stale_doc_id = self._diff_stored_note(note_path)
+            if unchanged is not None:
+                logger.debug(f"Note '{file_path}' is unchanged, skipping re-vectorization")
+                return DocumentMetadata.from_chromadb_metadata(unchanged)
+
+        return self._store_note(file_path, note_path, force=force, stale_doc_id=stale_doc_id)
+
+    def _vectorize_note_or_skip(self, file_path: str, force: bool = False) -> Optional[str]:
+        """
+        Vectorize a single note unless it is already stored and unchanged.
+
+        Unlike vectorize_note, skipped notes don't have their stored metadata
+        fetched and rebuilt, which keeps repeat runs over many notes cheap.
+
+        Args:
+            file_path: Relative path from notes directory
+            force: If True, re-vectorize even if already vectorized
+
+        Returns:
+            doc_id of the stored note, or None if it was skipped
+
+        Raises:
+            FileNotFoundError: If note file doesn't exist
+        """
+        note_path = self.note_file_service.notes_directory / file_path
+
+        if not note_path.exists():
+            raise FileNotFoundError(f"Note not found: {note_path}")
+
+        stale_doc_id = None
+        if not force:
+            already_stored = self.is_note_vectorized(file_path)
+            if not already_stored:
+                unchanged, stale_doc_id = self._diff_stored_note(note_path)
+                already_stored = unchanged is not None
+            if already_stored:
+                logger.debug(f"Note '{file_path}' is already vectorized, skipping")
+                return None
+
+        return self._store_note(
+            file_path, note_path, force=force, stale_doc_id=stale_doc_id
+        ).doc_id
+
+    def _store_note(
+        self,
+        file_path: str,
+        note_path: Path,
+        force: bool = False,
+        stale_doc_id: Optional[str] = None,
+    ) -> DocumentMetadata:
+        """
+        Read, chunk, embed and store a note.
+
+        Args:
+            file_path: Relative path from notes directory
+            note_path: Absolute path of the note file
+            force: If True, delete the note's existing vectors first
+            stale_doc_id: doc_id of an outdated copy of the note, deleted
+                once the new chunks are stored
+
+        Returns:
+            DocumentMetadata of the vectorized note
+        """
         # Read note content
         title, frontmatter, content = self.note_file_service.read_note(file_path)
 
@@ -138,9 +339,68 @@ class NoteVectorizationService:
             skip_duplicates=False,  # Allow re-processing (we check duplicates ourselves)
         )
 
+        if stale_doc_id is not None:
+            self.document_service.delete_document(stale_doc_id)
+
         logger.info(f"Vectorized note: {file_path} (doc_id: {metadata.doc_id})")
         return metadata
 
+    def _diff_stored_note(self, note_path: Path) -> Tuple[Optional[dict], Optional[str]]:
+        """
+        Compare a note file with the chunks stored for it.
+
+        Nothing is written here: the stale chunks of a changed note are only
+        deleted once its replacement chunks have been stored.
+
+        Args:
+            note_path: Absolute path of the note file
+
+        Returns:
+            Tuple of (stored chunk metadata if the note is unchanged,
+            doc_id of the stale chunks if the note changed)
+        """
+        collection = self.collection
+        stored = collection.get(
+            where={
+                "$and": [
+                    {"file_path": str(note_path)},
+                    NOTE_FILTER,
+                    {"chunk_index": 0},
+                ]
+            },
+            include=["metadatas"],
+        )
+        if not stored["ids"]:
+            return None, None
+
+        stored_metadata = stored["metadatas"][0]
+        if stored_metadata.get("file_hash") == calculate_file_hash(note_path):
+            return stored_metadata, None
+        return None, stored_metadata["doc_id"]
+
+    def _delete_docs_vectors(self, doc_ids: List[str]) -> int:
+        """
+        Delete all vectors for many documents with one lookup and one delete.
+
+        Args:
+            doc_ids: Document IDs whose chunks should be deleted
+
+        Returns:
+            Number of deleted chunks
+        """
+        collection = self.collection
+
+        ids = []
+        for i in range(0, len(doc_ids), IN_FILTER_BATCH_SIZE):
+            batch = doc_ids[i:i + IN_FILTER_BATCH_SIZE]
+            results = collection.get(where={"doc_id": {"$in": batch}}, include=[])
+            ids.extend(results["ids"])
+
+        if ids:
+            self.vector_service.delete_documents(self.collection_name, ids)
+            logger.info(f"Deleted {len(ids)} stale vectors for {len(doc_ids)} documents")
+        return len(ids)
+
     def vectorize_all_notes(
         self, force: bool = False, incremental: bool = True
     ) -> Tuple[int, int]:
@@ -168,26 +428,304 @@ class NoteVectorizationService:
         skipped_count = 0
         error_count = 0
 
-        for note_file in note_files:
-            file_path_str = str(note_file).replace("\\", "/")
+        # Look up which notes are already stored once, not once per note
+        vectorized_paths = None
+        if incremental and not force:
+            vectorized_paths = self._get_vectorized_note_paths()
 
-            try:
-                # Check if should skip
-                if incremental and not force:
-                    if self.is_note_vectorized(file_path_str):
-                        logger.debug(f"Skipping already vectorized note: {file_path_str}")
+        # Initial indexing issues thousands of small writes; skip fsync for them
+        with self.vector_service.bulk_load():
+            for note_file in note_files:
+                file_path_str = posix_path_str(note_file)
+
+                try:
+                    # Check if should skip
+                    if vectorized_paths is not None:
+                        if file_path_str in vectorized_paths:
+                            logger.debug(f"Skipping already vectorized note: {file_path_str}")
+                            skipped_count += 1
+                            continue
+
+                    # Vectorize note
+                    if self._vectorize_note_or_skip(file_path_str, force=force) is None:
                         skipped_count += 1
                         continue
+                    vectorized_count += 1
+                    if (
+                        vectorized_count % PROGRESS_LOG_INTERVAL == 0
+                        or vectorized_count + skipped_count + error_count == total_notes
+                    ):
+                        logger.info(f"Vectorized {vectorized_count}/{total_notes}: {file_path_str}")
+
+                except Exception as e:
+                    error_count += 1
+                    logger.error(f"Error vectorizing note '{file_path_str}': {e}")
+
+        logger.info(
+            f"Vectorization complete: {vectorized_count} vectorized, "
+            f"{skipped_count} skipped, {error_count} errors"
+        )
+
+        return (vectorized_count, skipped_count)
+
+    def _prepare_note_chunks(
+        self, file_path: str, note_path: Path
+    ) -> Tuple[List[str], List[str], List[dict]]:
+        """
+        Read a note and build its chunks without embedding or storing them.
+
+        Args:
+            file_path: Relative path from notes directory
+            note_path: Absolute path of the note file
+
+        Returns:
+            Tuple of (chunk IDs, chunk texts, chunk metadatas)
+        """
+        title, frontmatter, content = self.note_file_service.read_note(file_path)
+        text, metadata = self.document_service.prepare_markdown(
+            content=content,
+            file_path=str(note_path),
+            skip_duplicates=False,
+        )
+        return self.document_service.prepare_chunks(
+            text, metadata, original_content=content
+        )
+
+    def vectorize_all_notes_batched(
+        self,
+        force: bool = False,
+        incremental: bool = True,
+        batch_size: int = 128,
+        max_workers: int = 8,
+        max_pending_writes: int = 2,
+    ) -> Tuple[int, int]:
+        """
+        Vectorize all notes, embedding and storing chunks from many notes at once.
+
+        Same result as vectorize_all_notes, but chunks are accumulated across
+        notes and flushed with one embedding call and one insert per
+        `batch_size * 4` chunks instead of once per note.
+
+        Args:
+            force: If True, re-vectorize all notes even if already vectorized
+            incremental: If True, only vectorize notes that aren't already vectorized
+            batch_size: Embedding batch size
+            max_workers: Threads used to read and chunk notes ahead of embedding
+            max_pending_writes: Embedded batches allowed to wait for the writer
+
+        Returns:
+            Tuple of (vectorized_count, skipped_count)
+
+        Raises:
+            RuntimeError: If the writer thread stops, e.g. because bulk_load fails
+        """
+        # Notes are streamed from disk and handled one window at a time, so
+        # memory doesn't grow with the size of the vault
+        note_files = self.note_file_service.iter_notes()
+
+        flush_size = batch_size * 4
+
+        total_notes = 0
+        skipped_count = 0
+        error_count = 0
+
+        pending_ids: List[str] = []
+        pending_texts: List[str] = []
+        pending_metadatas: List[dict] = []
+        pending_notes: List[str] = []
+        pending_stale_doc_ids: List[str] = []
+
+        # Look up which notes are already stored once, not once per note
+        vectorized_paths = None
+        if incremental and not force:
+            vectorized_paths = self._get_vectorized_note_paths()
+
+        # Inserts run on a single writer thread so the next batch can be
+        # embedded while the previous one is written. The bounded queue caps
+        # how many embedded batches wait in memory; one writer keeps SQLite
+        # free of write contention. Counters below are only touched by it.
+        write_queue: Queue = Queue(maxsize=max_pending_writes)
+        stored_count = 0
+        store_error_count = 0
+        writer_error: Optional[Exception] = None
+
+        def write_batches():
+            nonlocal stored_count, store_error_count, writer_error
+            try:
+                # PRAGMAs are per connection and ChromaDB pools one per thread
+                with self.vector_service.bulk_load():
+                    while True:
+                        batch = write_queue.get()
+                        if batch is None:
+                            return
+                        ids, texts, metadatas, embeddings, stale_doc_ids, note_count = batch
+                        try:
+                            if texts:
+                                self.vector_service.add_documents(
+                                    collection_name=self.collection_name,
+                                    documents=texts,
+                                    ids=ids,
+                                    metadatas=metadatas,
+                                    embeddings=embeddings,
+                                )
+                            # Outdated copies go only once their replacements are stored
+                            if stale_doc_ids:
+                                self._delete_docs_vectors(stale_doc_ids)
+                            stored_count += note_count
+                            logger.info(
+                                f"Vectorized {stored_count} notes "
+                                f"({len(texts)} chunks in last batch)"
+                            )
+                        except Exception as e:
+                            store_error_count += note_count
+                            logger.error(f"Error storing batch of {note_count} notes: {e}")
+            except Exception as e:
+                writer_error = e
+                logger.error(f"Note vector writer stopped: {e}")
 
-                # Vectorize note
-                self.vectorize_note(file_path_str, force=force)
-                vectorized_count += 1
-                logger.info(f"Vectorized {vectorized_count}/{total_notes}: {file_path_str}")
+        def enqueue(item) -> bool:
+            # A dead writer never drains the queue, so don't block on it
+            while writer.is_alive():
+                try:
+                    write_queue.put(item, timeout=WRITE_QUEUE_POLL_INTERVAL)
+                    return True
+                except Full:
+                    continue
+            return False
 
+        def flush():
+            nonlocal error_count
+            if not pending_notes:
+                return
+            batch = None
+            try:
+                embeddings = []
+                if pending_texts:
+                    # SentenceTransformer.encode length-sorts its inputs before
+                    # splitting them into model batches, so flushing several
+                    # batches' worth of chunks at once keeps padding low
+                    embeddings = self._embed_chunks(pending_texts, batch_size)
+                batch = (
+                    list(pending_ids),
+                    list(pending_texts),
+                    list(pending_metadatas),
+                    embeddings,
+                    list(pending_stale_doc_ids),
+                    len(pending_notes),
+                )
+            except Exception as e:
+                error_count += len(pending_notes)
+                logger.error(f"Error embedding batch of {len(pending_notes)} notes: {e}")
+            pending_ids.clear()
+            pending_texts.clear()
+            pending_metadatas.clear()
+            pending_notes.clear()
+            pending_stale_doc_ids.clear()
+
+            if batch is not None and not enqueue(batch):
+                raise RuntimeError("Note vector writer stopped") from writer_error
+
+        def collect(file_path_str: str, stale_doc_id: Optional[str], future):
+            nonlocal error_count
+            try:
+                ids, texts, metadatas = future.result()
+                pending_ids.extend(ids)
+                pending_texts.extend(texts)
+                pending_metadatas.extend(metadatas)
+                pending_notes.append(file_path_str)
+                if stale_doc_id is not None:
+                    pending_stale_doc_ids.append(stale_doc_id)
             except Exception as e:
                 error_count += 1
                 logger.error(f"Error vectorizing note '{file_path_str}': {e}")
 
+            if len(pending_texts) >= flush_size:
+                flush()
+
+        # Reading, parsing and chunking run in worker threads; ChromaDB reads
+        # and force-mode deletes stay on this thread. Results are collected in
+        # submission order with a bounded number in flight.
+        in_flight = deque()
+
+        writer = threading.Thread(target=write_batches, name="note-vector-writer", daemon=True)
+        writer.start()
+
+        try:
+            with self.vector_service.bulk_load(), ThreadPoolExecutor(
+                max_workers=max_workers
+            ) as executor:
+                while True:
+                    window = list(islice(note_files, NOTE_WINDOW_SIZE))
+                    if not window:
+                        break
+                    total_notes += len(window)
+
+                    if force:
+                        # Clear the window's old chunks in one delete, under either
+                        # the relative or the absolute path they may be stored with
+                        file_paths = []
+                        for note_file in window:
+                            file_path_str = posix_path_str(note_file)
+                            file_paths.append(file_path_str)
+                            file_paths.append(
+                                str(self.note_file_service.notes_directory / file_path_str)
+                            )
+                        try:
+                            self._delete_notes_vectors(file_paths)
+                        except Exception as e:
+                            logger.warning(f"Error deleting note vectors: {e}")
+
+                    for note_file in window:
+                        file_path_str = posix_path_str(note_file)
+                        note_path = self.note_file_service.notes_directory / file_path_str
+
+                        stale_doc_id = None
+                        try:
+                            if vectorized_paths is not None:
+                                if file_path_str in vectorized_paths:
+                                    logger.debug(f"Skipping already vectorized note: {file_path_str}")
+                                    skipped_count += 1
+                                    continue
+
+                            if not force:
+                                unchanged, stale_doc_id = self._diff_stored_note(note_path)
+                                if unchanged is not None:
+                                    logger.debug(f"Skipping unchanged note: {file_path_str}")
+                                    skipped_count += 1
+                                    continue
+                        except Exception as e:
+                            error_count += 1
+                            logger.error(f"Error vectorizing note '{file_path_str}': {e}")
+                            continue
+
+                        in_flight.append(
+                            (
+                                file_path_str,
+                                stale_doc_id,
+                                executor.submit(self._prepare_note_chunks, file_path_str, note_path),
+                            )
+                        )
+                        if len(in_flight) >= max_workers * 4:
+                            collect(*in_flight.popleft())
+
+                while in_flight:
+                    collect(*in_flight.popleft())
+
+                flush()
+        finally:
+            enqueue(None)
+            writer.join()
+
+        if writer_error is not None:
+            raise RuntimeError("Note vector writer stopped") from writer_error
+
+        vectorized_count = stored_count
+        error_count += store_error_count
+
+        if total_notes == 0:
+            logger.info("No notes found to vectorize")
+            return (0, 0)
+
         logger.info(
             f"Vectorization complete: {vectorized_count} vectorized, "
             f"{skipped_count} skipped, {error_count} errors"
@@ -229,7 +767,7 @@ class NoteVectorizationService:
         self.document_service._process_note_metadata(metadata, content)
 
         # Get updated metadata from SQLite
-        note_id = str(file_path).replace("\\", "/").replace(".md", "")
+        note_id = note_id_from_path(file_path)
         updated_metadata = self.note_metadata_service.get_note_metadata(note_id)
 
         if not updated_metadata:
@@ -259,12 +797,16 @@ class NoteVectorizationService:
         error_count = 0
 
         for note_file in note_files:
-            file_path_str = str(note_file).replace("\\", "/")
+            file_path_str = posix_path_str(note_file)
 
             try:
                 self.update_note_metadata(file_path_str)
                 updated_count += 1
-                logger.info(f"Updated {updated_count}/{total_notes}: {file_path_str}")
+                if (
+                    updated_count % PROGRESS_LOG_INTERVAL == 0
+                    or updated_count + error_count == total_notes
+                ):
+                    logger.info(f"Updated {updated_count}/{total_notes}: {file_path_str}")
 
             except Exception as e:
                 error_count += 1
@@ -284,19 +826,16 @@ class NoteVectorizationService:
             file_path: Relative path from notes directory
         """
         try:
-            collection_name = self.vector_service.collection_names["documents"]
-            collection = self.vector_service.get_or_create_collection(collection_name)
+            collection = self.collection
 
-            # Find all chunks for this note
+            # Find all chunks for this note (only the IDs are needed)
             results = collection.get(
-                where={
-                    "file_path": str(file_path),
-                    "doc_type": DocType.NOTE.value,
-                },
+                where={"file_path": str(file_path), **NOTE_FILTER},
+                include=[],
             )
 
             if results["ids"]:
-                collection.delete(ids=results["ids"])
+                self.vector_service.delete_documents(self.collection_name, results["ids"])
                 logger.info(f"Deleted {len(results['ids'])} vectors for note: {file_path}")
         except Exception as e:
             logger.warning(f"Error deleting note vectors: {e}")
@@ -324,16 +863,36 @@ class NoteVectorizationService:
             if not query:
                 raise ValueError("At least one of 'query' or 'tag' must be provided")
 
-            collection_name = self.vector_service.collection_names["documents"]
             
             # Build where clause
-            where_clause = {"doc_type": DocType.NOTE.value}
+            where_clause = NOTE_FILTER
+            n_results = limit * 2  # Get more results to filter by tag if needed
+            filter_tag_per_result = False
+
+            if tag:
+                # Resolve the tagged notes first and restrict the vector search
+                # to their chunks, so no result has to be filtered out afterwards
+                normalized_tag = tag if tag.startswith("#") else f"#{tag}"
+                tagged_paths = list(dict.fromkeys(
+                    note.file_path
+                    for note in self.note_metadata_service.get_notes_by_tag(normalized_tag)
+                    if note.file_path
+                ))
+                if not tagged_paths:
+                    return []
+                if len(tagged_paths) <= IN_FILTER_BATCH_SIZE:
+                    where_clause = {
+                        "$and": [where_clause, {"file_path": {"$in": tagged_paths}}]
+                    }
+                    n_results = limit
+                else:
+                    filter_tag_per_result = True
 
             # Query ChromaDB
             results = self.vector_service.query(
-                collection_name=collection_name,
+                collection_name=self.collection_name,
                 query_texts=[query],
-                n_results=limit * 2,  # Get more results to filter by tag if needed
+                n_results=n_results,
                 where=where_clause,
             )
 
@@ -348,26 +907,26 @@ class NoteVectorizationService:
                 for i, (doc_id, doc_text, metadata_dict, distance) in enumerate(
                     zip(ids, documents, metadatas, distances)
                 ):
-                    # Filter by tag if specified
-                    if tag:
-                        # Normalize tag to Obsidian style (#tag)
-                        normalized_tag = tag if tag.startswith("#") else f"#{tag}"
-                        
+                    # Filter by tag if it couldn't be pushed into the query
+                    if filter_tag_per_result:
                         note_tags = metadata_dict.get("tags", [])
                         if isinstance(note_tags, str):
-                            # Parse JSON string if needed
-                            import json
+                            # Tags are stored comma-joined; older entries may hold JSON
                             try:
-                                note_tags = json.loads(note_tags)
-                            except:
-                                note_tags = []
-                        
+                                note_tags = json.loads(note_tags) if note_tags.startswith("[") else None
+                            except ValueError:
+                                note_tags = None
+                            if not isinstance(note_tags, list):
+                                note_tags = [
+                                    t.strip() for t in metadata_dict["tags"].split(",") if t.strip()
+                                ]
+
                         # Normalize note tags to Obsidian style for comparison
-                        normalized_note_tags = [
+                        note_tag_set = {
                             t if t.startswith("#") else f"#{t}" for t in note_tags
-                        ]
-                        
-                        if normalized_tag not in normalized_note_tags:
+                        }
+
+                        if normalized_tag not in note_tag_set:
                             continue
 
                     # Get note metadata from SQLite if available
@@ -375,7 +934,7 @@ class NoteVectorizationService:
                     note_metadata = None
                     if file_path:
                         try:
-                            note_id = str(file_path).replace("\\", "/").replace(".md", "")
+                            note_id = note_id_from_path(file_path)
                             note_metadata = self.note_metadata_service.get_note_metadata(note_id)
                         except:
                             pass
@@ -428,27 +987,35 @@ class NoteVectorizationService:
             # Limit results
             notes = notes[:limit]
 
-            # Build results with content preview from ChromaDB if available
-            note_results = []
-            collection_name = self.vector_service.collection_names["documents"]
-            collection = self.vector_service.get_or_create_collection(collection_name)
-
-            for note in notes:
-                # Try to get content preview from ChromaDB
-                content_preview = ""
+            # Fetch content previews from ChromaDB with one query per batch of
+            # paths instead of one per note; the first chunk is the preview
+            previews = {}
+            collection = self.collection
+            file_paths = list(dict.fromkeys(note.file_path for note in notes if note.file_path))
+            for i in range(0, len(file_paths), IN_FILTER_BATCH_SIZE):
+                batch = file_paths[i:i + IN_FILTER_BATCH_SIZE]
                 try:
                     results = collection.get(
                         where={
-                            "file_path": note.file_path,
-                            "doc_type": DocType.NOTE.value,
+                            "$and": [
+                                {"file_path": {"$in": batch}},
+                                {"chunk_index": 0},
+                                NOTE_FILTER,
+                            ]
                         },
-                        limit=1,
+                        include=["documents", "metadatas"],
                     )
-                    if results.get("documents") and len(results["documents"]) > 0:
-                        doc_text = results["documents"][0]
-                        content_preview = doc_text[:200] + "..." if len(doc_text) > 200 else doc_text
-                except Exception:
-                    pass
+                    for doc_text, metadata_dict in zip(
+                        results.get("documents") or [], results.get("metadatas") or []
+                    ):
+                        previews.setdefault(metadata_dict.get("file_path"), doc_text)
+                except Exception as e:
+                    logger.warning(f"Error fetching note previews: {e}")
+
+            note_results = []
+            for note in notes:
+                doc_text = previews.get(note.file_path, "")
+                content_preview = doc_text[:200] + "..." if len(doc_text) > 200 else doc_text
 
                 note_results.append(
                     {
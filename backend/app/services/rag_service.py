@@ -1,6 +1,14 @@
 """RAG service for retrieval-augmented generation."""
 
+import asyncio
+import copy
+import hashlib
+import json
 import logging
+import os
+import threading
+import time
+from collections import OrderedDict
 from typing import AsyncIterator, Iterator, List, Optional
 
 from langchain_core.documents import Document
@@ -23,6 +31,17 @@ Question: {question}
 
 Answer:"""
 
+# Maximum number of cached RAG responses
+RESPONSE_CACHE_SIZE = 1024
+
+# Seconds a cached RAG response stays valid; bounds staleness after writes
+# made by other processes (e.g. a CLI reindex), which don't bump the
+# in-process write generation
+RESPONSE_CACHE_TTL = float(os.getenv("RAG_RESPONSE_CACHE_TTL", "60"))
+
+# Characters per chunk when replaying a cached answer to a stream
+CACHED_STREAM_CHUNK_SIZE = 16
+
 
 class RAGService:
     """
@@ -32,6 +51,13 @@ class RAGService:
     then uses an LLM to generate answers based on the retrieved context.
     """
 
+    # Responses shared by all instances (the API builds one per request),
+    # keyed by question, filter, retrieval and LLM settings. Each entry
+    # records when and at which VectorService write generation it was
+    # computed.
+    _response_cache: "OrderedDict[str, tuple]" = OrderedDict()
+    _response_cache_lock = threading.Lock()
+
     def __init__(
         self,
         vector_service: VectorService,
@@ -66,6 +92,14 @@ class RAGService:
         self.llm_service = llm_service
         self.prompt_template = prompt_template or DEFAULT_RAG_PROMPT
         self.max_context_length = max_context_length
+        # Parsed once; only the context and question change per query
+        self._prompt = PromptTemplate.from_template(self.prompt_template)
+        llm_config = llm_service.config
+        self._cache_scope = [
+            collection_name, k, score_threshold, self.prompt_template, max_context_length,
+            llm_config.provider.value, llm_config.model, llm_config.temperature,
+            llm_config.max_tokens,
+        ]
 
         logger.info(
             f"Initialized RAG service: collection={collection_name}, k={k}, "
@@ -82,9 +116,8 @@ class RAGService:
         Returns:
             Formatted context string
         """
-        context_parts = []
+        doc_texts = []
         current_length = 0
-
         for i, doc in enumerate(documents):
             # Include metadata information
             doc_info = f"[Document {i+1}]"
@@ -93,16 +126,18 @@ class RAGService:
             if "doc_id" in doc.metadata:
                 doc_info += f" (ID: {doc.metadata['doc_id']})"
 
-            doc_text = f"{doc_info}\n{doc.page_content}"
-
-            # Check if adding this document would exceed max length
-            if current_length + len(doc_text) > self.max_context_length:
+            # Count the "\n" after the header and the "\n\n" separator, and
+            # stop before formatting a document that would exceed the budget
+            doc_length = len(doc_info) + 1 + len(doc.page_content)
+            if doc_texts:
+                doc_length += 2
+            if current_length + doc_length > self.max_context_length:
                 break
 
-            context_parts.append(doc_text)
-            current_length += len(doc_text)
+            doc_texts.append(f"{doc_info}\n{doc.page_content}")
+            current_length += doc_length
 
-        return "\n\n".join(context_parts)
+        return "\n\n".join(doc_texts)
 
     def _build_prompt(self, question: str, context: str) -> str:
         """
@@ -115,8 +150,104 @@ class RAGService:
         Returns:
             Formatted prompt
         """
-        prompt = PromptTemplate.from_template(self.prompt_template)
-        return prompt.format(context=context, question=question)
+        return self._prompt.format(context=context, question=question)
+
+    def _cache_key(self, question: str) -> str:
+        """
+        Build the response cache key for a question.
+
+        Uses the retriever's current metadata filter, since filters persist
+        on the retriever between queries.
+
+        Args:
+            question: User question
+
+        Returns:
+            Hex digest identifying the question, filter and retrieval/LLM settings
+        """
+        payload = json.dumps(
+            [self._cache_scope, question, self.retriever.metadata_filter],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _get_cached_response(self, key: str) -> Optional[dict]:
+        """
+        Get a cached response if it is still valid.
+
+        Entries older than RESPONSE_CACHE_TTL seconds, or computed before the
+        last vector store write in this process, are discarded.
+
+        Args:
+            key: Cache key from _cache_key
+
+        Returns:
+            Deep copy of the cached response, or None on a miss
+        """
+        with self._response_cache_lock:
+            entry = self._response_cache.get(key)
+            if entry is None:
+                return None
+            created, generation, response = entry
+            if (
+                generation != VectorService.write_generation
+                or time.monotonic() - created >= RESPONSE_CACHE_TTL
+            ):
+                del self._response_cache[key]
+                return None
+            self._response_cache.move_to_end(key)
+            # Deep copy: sources and metadata are nested and callers may mutate them
+            return copy.deepcopy(response)
+
+    def _cache_response(self, key: str, response: dict):
+        """
+        Store a response, evicting the least recently used beyond the cap.
+
+        Args:
+            key: Cache key from _cache_key
+            response: Response dictionary to cache
+        """
+        with self._response_cache_lock:
+            self._response_cache[key] = (
+                time.monotonic(), VectorService.write_generation, copy.deepcopy(response)
+            )
+            self._response_cache.move_to_end(key)
+            while len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+
+    def _build_response(
+        self, answer: str, documents: List[Document], context: str
+    ) -> dict:
+        """
+        Build the query response dictionary.
+
+        Args:
+            answer: Generated answer
+            documents: Retrieved documents
+            context: Context string given to the LLM
+
+        Returns:
+            Dictionary with answer, sources, and metadata
+        """
+        sources = []
+        for doc in documents:
+            source_info = {
+                "chunk_id": doc.metadata.get("chunk_id"),
+                "title": doc.metadata.get("title", "Unknown"),
+                "doc_id": doc.metadata.get("doc_id"),
+                "distance": doc.metadata.get("distance"),
+            }
+            sources.append(source_info)
+
+        return {
+            "answer": answer,
+            "sources": sources,
+            "metadata": {
+                "retrieved_count": len(documents),
+                "context_length": len(context),
+            },
+        }
 
     def query(
         self, question: str, metadata_filter: Optional[dict] = None
@@ -136,6 +267,11 @@ class RAGService:
             if metadata_filter:
                 self.retriever.metadata_filter = metadata_filter
 
+            cache_key = self._cache_key(question)
+            cached = self._get_cached_response(cache_key)
+            if cached is not None:
+                return cached
+
             # Retrieve relevant documents
             documents = self.retriever.get_relevant_documents(question)
 
@@ -155,25 +291,9 @@ class RAGService:
             # Generate answer
             answer = self.llm_service.invoke(prompt)
 
-            # Extract source information
-            sources = []
-            for doc in documents:
-                source_info = {
-                    "chunk_id": doc.metadata.get("chunk_id"),
-                    "title": doc.metadata.get("title", "Unknown"),
-                    "doc_id": doc.metadata.get("doc_id"),
-                    "distance": doc.metadata.get("distance"),
-                }
-                sources.append(source_info)
-
-            return {
-                "answer": answer,
-                "sources": sources,
-                "metadata": {
-                    "retrieved_count": len(documents),
-                    "context_length": len(context),
-                },
-            }
+            response = self._build_response(answer, documents, context)
+            self._cache_response(cache_key, response)
+            return response
 
         except Exception as e:
             logger.error(f"Error in RAG query: {e}")
@@ -201,6 +321,14 @@ class RAGService:
             if metadata_filter:
                 self.retriever.metadata_filter = metadata_filter
 
+            cache_key = self._cache_key(question)
+            cached = self._get_cached_response(cache_key)
+            if cached is not None:
+                answer = cached["answer"]
+                for start in range(0, len(answer), CACHED_STREAM_CHUNK_SIZE):
+                    yield answer[start:start + CACHED_STREAM_CHUNK_SIZE]
+                return
+
             # Retrieve relevant documents
             documents = self.retriever.get_relevant_documents(question)
 
@@ -215,9 +343,15 @@ class RAGService:
             prompt = self._build_prompt(question, context)
 
             # Stream answer
+            answer_parts = []
             for chunk in self.llm_service.stream(prompt):
+                answer_parts.append(chunk)
                 yield chunk
 
+            self._cache_response(
+                cache_key, self._build_response("".join(answer_parts), documents, context)
+            )
+
         except Exception as e:
             logger.error(f"Error in RAG stream query: {e}")
             yield f"Error generating answer: {str(e)}"
@@ -240,8 +374,13 @@ class RAGService:
             if metadata_filter:
                 self.retriever.metadata_filter = metadata_filter
 
+            cache_key = self._cache_key(question)
+            cached = self._get_cached_response(cache_key)
+            if cached is not None:
+                return cached
+
             # Retrieve relevant documents
-            documents = await self.retriever.aget_relevant_documents(question)
+            documents = await self._aretrieve(question)
 
             if not documents:
                 return {
@@ -259,25 +398,9 @@ class RAGService:
             # Generate answer
             answer = await self.llm_service.ainvoke(prompt)
 
-            # Extract source information
-            sources = []
-            for doc in documents:
-                source_info = {
-                    "chunk_id": doc.metadata.get("chunk_id"),
-                    "title": doc.metadata.get("title", "Unknown"),
-                    "doc_id": doc.metadata.get("doc_id"),
-                    "distance": doc.metadata.get("distance"),
-                }
-                sources.append(source_info)
-
-            return {
-                "answer": answer,
-                "sources": sources,
-                "metadata": {
-                    "retrieved_count": len(documents),
-                    "context_length": len(context),
-                },
-            }
+            response = self._build_response(answer, documents, context)
+            self._cache_response(cache_key, response)
+            return response
 
         except Exception as e:
             logger.error(f"Error in RAG async query: {e}")
@@ -287,6 +410,29 @@ class RAGService:
                 "metadata": {"error": str(e)},
             }
 
+    async def _aretrieve(self, question: str) -> List[Document]:
+        """
+        Retrieve documents while the LLM client is set up in parallel.
+
+        The first query otherwise pays for client creation only after
+        retrieval has finished, delaying the first streamed token.
+
+        Args:
+            question: User question
+
+        Returns:
+            Retrieved documents
+        """
+        warm_up = asyncio.create_task(asyncio.to_thread(self.llm_service.warm_up))
+        try:
+            return await self.retriever.aget_relevant_documents(question)
+        finally:
+            try:
+                await warm_up
+            except Exception as e:
+                # The LLM call itself will surface the error if it persists
+                logger.warning(f"LLM warm-up failed: {e}")
+
     async def astream_query(
         self, question: str, metadata_filter: Optional[dict] = None
     ) -> AsyncIterator[str]:
@@ -305,8 +451,16 @@ class RAGService:
             if metadata_filter:
                 self.retriever.metadata_filter = metadata_filter
 
+            cache_key = self._cache_key(question)
+            cached = self._get_cached_response(cache_key)
+            if cached is not None:
+                answer = cached["answer"]
+                for start in range(0, len(answer), CACHED_STREAM_CHUNK_SIZE):
+                    yield answer[start:start + CACHED_STREAM_CHUNK_SIZE]
+                return
+
             # Retrieve relevant documents
-            documents = await self.retriever.aget_relevant_documents(question)
+            documents = await self._aretrieve(question)
 
             if not documents:
                 yield "I couldn't find any relevant information to answer your question."
@@ -319,9 +473,15 @@ class RAGService:
             prompt = self._build_prompt(question, context)
 
             # Stream answer
+            answer_parts = []
             async for chunk in self.llm_service.astream(prompt):
+                answer_parts.append(chunk)
                 yield chunk
 
+            self._cache_response(
+                cache_key, self._build_response("".join(answer_parts), documents, context)
+            )
+
         except Exception as e:
             logger.error(f"Error in RAG async stream query: {e}")
             yield f"Error generating answer: {str(e)}"
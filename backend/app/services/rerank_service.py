@@ -1,17 +1,109 @@
 """Rerank service for reordering retrieval results."""
 
+import asyncio
+import hashlib
+import importlib.util
+import json
 import logging
 import os
+import threading
+from collections import OrderedDict
 from enum import Enum
+from pathlib import Path
 from typing import List, Optional, Tuple
 
+import httpx
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+from backend.app.services.embedding_service import EmbeddingService
+
 logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
+# Where quantized ONNX exports of local rerank models are kept
+RERANK_ONNX_CACHE_DIR = Path.home() / ".cache" / "omnikb" / "rerank"
+
+# Maximum number of cached (query, document) scores per service
+RERANK_CACHE_SIZE = int(os.getenv("RERANK_CACHE_SIZE", "50000"))
+
+# Maximum number of cached document embeddings per service (embedding backend);
+# each entry holds a full float32 vector, so this is far smaller than the score cache
+RERANK_EMBED_CACHE_SIZE = int(os.getenv("RERANK_EMBED_CACHE_SIZE", "2048"))
+
+# Timeout in seconds for rerank API requests
+RERANK_API_TIMEOUT = 30
+
+# HTTP/2 lets concurrent requests share one connection; needs httpx[http2]
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Documents per request to rerank APIs (providers cap the batch size)
+RERANK_API_WINDOW = 100
+
+# Local rerank backends: PyTorch, or int8-quantized ONNX Runtime
+SUPPORTED_BACKENDS = ("torch", "onnx")
+
+# Telescoping strategy (RERANK_STRATEGY=telescoping): candidate sets of at
+# least MIN_DOCS are first scored on their leading PREFIX_CHARS characters,
+# and only the best max(top_k * FACTOR, MIN_KEEP) get a full-length score
+RERANK_TELESCOPE_MIN_DOCS = 200
+RERANK_TELESCOPE_PREFIX_CHARS = 256
+RERANK_TELESCOPE_FACTOR = 4
+RERANK_TELESCOPE_MIN_KEEP = 50
+
+# Supported torch model weight precisions for the local reranker
+SUPPORTED_DTYPES = ("float32", "float16", "bfloat16")
+
+
+def _dumps(payload: dict) -> bytes:
+    """Serialize a rerank API request body, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(content: bytes) -> dict:
+    """Parse a rerank API response body, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _top_k_indices(scores, top_k: Optional[int]):
+    """
+    Get indices of the highest scores, sorted by score (descending).
+
+    Partitions first when only a small top_k is needed, so discarded
+    scores are never sorted.
+
+    Args:
+        scores: Sequence or array of scores
+        top_k: Number of indices to return. If None, returns all.
+
+    Returns:
+        numpy array of indices
+    """
+    import numpy as np
+
+    scores = np.asarray(scores, dtype=np.float64)
+    if top_k and top_k < len(scores) // 2:
+        candidates = np.argpartition(-scores, top_k)[:top_k]
+        return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+    ranking = np.argsort(-scores, kind="stable")
+    return ranking[:top_k] if top_k else ranking
+
 
 class RerankProvider(str, Enum):
     """Supported rerank providers."""
@@ -30,6 +122,7 @@ class RerankService:
         self,
         provider: Optional[str] = None,
         model_name: Optional[str] = None,
+        embedding_service: Optional[EmbeddingService] = None,
     ):
         """
         Initialize rerank service.
@@ -37,6 +130,8 @@ class RerankService:
         Args:
             provider: Rerank provider name. If None, uses RERANK_PROVIDER env var.
             model_name: Model name for local provider. If None, uses RERANK_MODEL env var.
+            embedding_service: Optional EmbeddingService for the openai provider's
+                              embedding similarity scoring
         """
         # Provider selection
         if provider is None:
@@ -50,6 +145,13 @@ class RerankService:
             )
             self.provider = RerankProvider.LOCAL
 
+        # Shared async HTTP client for API providers, created on first use
+        self._async_client = None
+
+        # (query, document) digest -> relevance score, least recently used first
+        self._score_cache: "OrderedDict[bytes, float]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
         # Initialize provider-specific components
         if self.provider == RerankProvider.LOCAL:
             self._init_local(model_name)
@@ -60,7 +162,16 @@ class RerankService:
         elif self.provider == RerankProvider.ALIBABA:
             self._init_alibaba()
         elif self.provider == RerankProvider.OPENAI:
-            self._init_openai()
+            self._init_openai(embedding_service)
+
+        # Bind the provider implementation once instead of branching per call
+        self._impl = {
+            RerankProvider.LOCAL: self._rerank_local,
+            RerankProvider.ZHIPU: self._rerank_zhipu,
+            RerankProvider.BAIDU: self._rerank_baidu,
+            RerankProvider.ALIBABA: self._rerank_alibaba,
+            RerankProvider.OPENAI: self._rerank_openai,
+        }[self.provider]
 
         logger.info(f"Initialized rerank service: provider={self.provider.value}")
 
@@ -75,8 +186,37 @@ class RerankService:
                 )  # 默认使用中文rerank模型
 
             self.model_name = model_name
+            self.batch_size = int(os.getenv("RERANK_BATCH_SIZE", "32"))
+            self.max_length = int(os.getenv("RERANK_MAX_LEN", "512"))
+            # Text beyond this is truncated by the tokenizer anyway; ~4 chars
+            # per token is a safe upper bound for mixed CJK/English text
+            self.max_chars = self.max_length * 4
+
+            backend = os.getenv("RERANK_BACKEND", "torch").lower()
+            if backend not in SUPPORTED_BACKENDS:
+                logger.warning(f"Invalid RERANK_BACKEND '{backend}', defaulting to torch")
+                backend = "torch"
+            self.backend = backend
+            self.onnx_quantization = os.getenv("RERANK_ONNX_QUANTIZATION", "avx2")
+            self.strategy = os.getenv("RERANK_STRATEGY", "exhaustive").lower()
+
+            # Precision: float16 on GPU by default; bfloat16 can be requested
+            # for CPUs with native support (e.g. AMX)
+            cuda_available = torch is not None and torch.cuda.is_available()
+            dtype = os.getenv("RERANK_DTYPE", "auto").lower()
+            if dtype == "auto":
+                dtype = "float16" if cuda_available else "float32"
+            if dtype not in SUPPORTED_DTYPES:
+                logger.warning(f"Unsupported rerank dtype '{dtype}', using float32")
+                dtype = "float32"
+            elif torch is None or (dtype == "float16" and not cuda_available):
+                if dtype != "float32":
+                    logger.warning(f"Rerank dtype '{dtype}' not supported here, using float32")
+                dtype = "float32"
+            self.dtype = dtype
+
             self._model: Optional[CrossEncoder] = None
-            logger.info(f"Local rerank model: {model_name}")
+            logger.info(f"Local rerank model: {model_name} (dtype={self.dtype})")
         except ImportError:
             logger.error(
                 "sentence-transformers not installed. Install with: pip install sentence-transformers"
@@ -91,6 +231,7 @@ class RerankService:
             "https://open.bigmodel.cn/api/paas/v4/rerank",
         )
         self.model = os.getenv("ZHIPU_RERANK_MODEL", "rerank")
+        self._client = self._create_client()
 
     def _init_baidu(self):
         """Initialize Baidu rerank service."""
@@ -105,10 +246,32 @@ class RerankService:
             "https://dashscope.aliyuncs.com/api/v1/services/rerank/rerank",
         )
         self.model = os.getenv("ALIBABA_RERANK_MODEL", "rerank-v1")
+        self._client = self._create_client()
+
+    def _create_client(self) -> httpx.Client:
+        """Create a keep-alive HTTP client with the API key headers preset."""
+        return httpx.Client(
+            http2=HTTP2_AVAILABLE,
+            headers=self._api_headers(),
+            timeout=httpx.Timeout(RERANK_API_TIMEOUT),
+            limits=httpx.Limits(max_keepalive_connections=16),
+        )
+
+    def _api_headers(self) -> dict:
+        """Headers sent with every rerank API request."""
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
 
-    def _init_openai(self):
+    def _init_openai(self, embedding_service: Optional[EmbeddingService] = None):
         """Initialize OpenAI rerank service."""
         self.api_key = os.getenv("OPENAI_API_KEY", "")
+        self.embedding_service = embedding_service or EmbeddingService()
+        # Document digest -> float32 embedding, least recently used first
+        self._doc_embedding_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        # (documents, normalized embedding matrix) of the last candidate set
+        self._doc_matrix = None
 
     def rerank(
         self, query: str, documents: List[str], top_k: Optional[int] = None
@@ -127,52 +290,292 @@ class RerankService:
         if not documents:
             return []
 
-        if self.provider == RerankProvider.LOCAL:
-            return self._rerank_local(query, documents, top_k)
-        elif self.provider == RerankProvider.ZHIPU:
-            return self._rerank_zhipu(query, documents, top_k)
-        elif self.provider == RerankProvider.BAIDU:
-            return self._rerank_baidu(query, documents, top_k)
-        elif self.provider == RerankProvider.ALIBABA:
-            return self._rerank_alibaba(query, documents, top_k)
-        elif self.provider == RerankProvider.OPENAI:
-            return self._rerank_openai(query, documents, top_k)
-        else:
-            raise ValueError(f"Unsupported rerank provider: {self.provider}")
+        keys, scores = self._lookup_scores(query, documents)
+
+        # Only score documents not seen with this query before; all of their
+        # scores are needed to merge them with the cached ones
+        miss_docs = self._telescope(query, self._missing_documents(documents, scores), top_k)
+        if miss_docs:
+            miss_scores = dict(self._rerank_uncached(query, miss_docs, None))
+            self._store_scores(documents, keys, scores, miss_scores)
+
+        return self._rank(documents, scores, top_k)
+
+    async def arerank(
+        self, query: str, documents: List[str], top_k: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Async version of rerank.
+
+        API providers send windows of documents concurrently over a shared
+        keep-alive connection pool; other providers run in a worker thread.
+
+        Args:
+            query: Query text
+            documents: List of document texts to rerank
+            top_k: Number of top results to return. If None, returns all.
+
+        Returns:
+            List of (document, score) tuples, sorted by score (descending)
+        """
+        if not documents:
+            return []
+
+        keys, scores = self._lookup_scores(query, documents)
+
+        miss_docs = self._missing_documents(documents, scores)
+        if miss_docs and self.provider == RerankProvider.LOCAL:
+            miss_docs = await asyncio.to_thread(self._telescope, query, miss_docs, top_k)
+        if miss_docs:
+            if self.provider in (RerankProvider.ZHIPU, RerankProvider.ALIBABA):
+                reranked = await self._arerank_api(query, miss_docs)
+            else:
+                reranked = await asyncio.to_thread(
+                    self._rerank_uncached, query, miss_docs, None
+                )
+            self._store_scores(documents, keys, scores, dict(reranked))
+
+        return self._rank(documents, scores, top_k)
+
+    def _lookup_scores(
+        self, query: str, documents: List[str]
+    ) -> Tuple[List[bytes], List[Optional[float]]]:
+        """
+        Look up cached scores for each document.
+
+        Returns:
+            Tuple of (cache keys, scores with None for cache misses)
+        """
+        keys = [self._cache_key(query, doc) for doc in documents]
+        scores: List[Optional[float]] = [None] * len(documents)
+
+        with self._cache_lock:
+            for i, key in enumerate(keys):
+                score = self._score_cache.get(key)
+                if score is not None:
+                    self._score_cache.move_to_end(key)
+                    scores[i] = score
+
+        return keys, scores
+
+    @staticmethod
+    def _missing_documents(
+        documents: List[str], scores: List[Optional[float]]
+    ) -> List[str]:
+        """Get the unique documents that still need scoring."""
+        return list(
+            dict.fromkeys(doc for doc, score in zip(documents, scores) if score is None)
+        )
+
+    def _store_scores(
+        self,
+        documents: List[str],
+        keys: List[bytes],
+        scores: List[Optional[float]],
+        new_scores: dict,
+    ):
+        """Fill in and cache freshly computed scores."""
+        with self._cache_lock:
+            for i, doc in enumerate(documents):
+                if scores[i] is None:
+                    score = new_scores.get(doc)
+                    if score is not None:
+                        scores[i] = score
+                        self._score_cache[keys[i]] = score
+            while len(self._score_cache) > RERANK_CACHE_SIZE:
+                self._score_cache.popitem(last=False)
+
+    @staticmethod
+    def _rank(
+        documents: List[str], scores: List[Optional[float]], top_k: Optional[int]
+    ) -> List[Tuple[str, float]]:
+        """Sort scored documents (descending); unscored documents are dropped."""
+        scored = [i for i, score in enumerate(scores) if score is not None]
+        ranking = _top_k_indices([scores[i] for i in scored], top_k)
+
+        return [(documents[scored[j]], scores[scored[j]]) for j in ranking]
+
+    @staticmethod
+    def _cache_key(query: str, document: str) -> bytes:
+        """Build the score cache key for a query-document pair."""
+        return (
+            hashlib.blake2b(query.encode("utf-8"), digest_size=16).digest()
+            + hashlib.blake2b(document.encode("utf-8"), digest_size=16).digest()
+        )
+
+    def _rerank_uncached(
+        self, query: str, documents: List[str], top_k: Optional[int]
+    ) -> List[Tuple[str, float]]:
+        """Rerank documents with the configured provider."""
+        return self._impl(query, documents, top_k)
 
     def _rerank_local(
         self, query: str, documents: List[str], top_k: Optional[int]
     ) -> List[Tuple[str, float]]:
         """Rerank using local CrossEncoder model."""
+        scores = self._score_local(query, documents)
+
+        # Sort by score (descending)
+        ranking = _top_k_indices(scores, top_k)
+
+        return [(documents[i], float(scores[i])) for i in ranking]
+
+    def _score_local(self, query: str, documents: List[str]):
+        """
+        Score documents against a query with the local CrossEncoder.
+
+        Args:
+            query: Query text
+            documents: List of document texts
+
+        Returns:
+            float32 numpy array of scores in document order; empty documents
+            score -inf
+        """
         if self._model is None:
-            from sentence_transformers import CrossEncoder
+            self._model = self._load_local_model()
+
+        import numpy as np
 
-            logger.info(f"Loading rerank model: {self.model_name}")
-            self._model = CrossEncoder(self.model_name)
+        # Cut documents before tokenization so the tokenizer doesn't walk
+        # text that would be truncated away
+        texts = [doc[:self.max_chars] for doc in documents]
+        scores = np.full(len(documents), -np.inf, dtype=np.float32)
 
-        # Create query-document pairs
-        pairs = [[query, doc] for doc in documents]
+        # Score pairs in length order so each batch pads to a similar length
+        order = sorted(
+            (i for i, text in enumerate(texts) if text.strip()),
+            key=lambda i: len(texts[i]),
+        )
+        if not order:
+            return scores
+        pairs = [[query, texts[i]] for i in order]
+
+        if self.dtype == "float32":
+            sorted_scores = self._model.predict(
+                pairs,
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            )
+        else:
+            # Half-precision scores are upcast; numpy has no bfloat16
+            with torch.inference_mode():
+                sorted_scores = self._model.predict(
+                    pairs,
+                    batch_size=self.batch_size,
+                    convert_to_tensor=True,
+                    show_progress_bar=False,
+                )
+            sorted_scores = sorted_scores.float().cpu().numpy()
+
+        # Map scores back to the original document order
+        scores[order] = sorted_scores
+
+        return scores
+
+    def _telescope(
+        self, query: str, documents: List[str], top_k: Optional[int]
+    ) -> List[str]:
+        """
+        Narrow a large candidate set before full scoring (telescoping strategy).
 
-        # Get scores
-        scores = self._model.predict(pairs)
+        Candidates are scored on a short prefix, which is much cheaper to
+        encode, and only the best survive to full-length scoring. This is
+        approximate: a document whose relevance only shows later in its
+        text can be dropped. Only applies to the local provider with
+        RERANK_STRATEGY=telescoping.
 
-        # Sort by score (descending)
-        scored_docs = list(zip(documents, scores.tolist()))
-        scored_docs.sort(key=lambda x: x[1], reverse=True)
+        Args:
+            query: Query text
+            documents: Candidate document texts
+            top_k: Number of results the caller needs
+
+        Returns:
+            Documents to score in full
+        """
+        if (
+            self.provider != RerankProvider.LOCAL
+            or self.strategy != "telescoping"
+            or not top_k
+            or len(documents) < RERANK_TELESCOPE_MIN_DOCS
+        ):
+            return documents
+
+        keep = max(top_k * RERANK_TELESCOPE_FACTOR, RERANK_TELESCOPE_MIN_KEEP)
+        if keep >= len(documents):
+            return documents
+
+        prefixes = [doc[:RERANK_TELESCOPE_PREFIX_CHARS] for doc in documents]
+        survivors = _top_k_indices(self._score_local(query, prefixes), keep)
+
+        logger.debug(f"Telescoping rerank: kept {keep} of {len(documents)} candidates")
+        return [documents[i] for i in survivors]
+
+    def _load_local_model(self):
+        """
+        Load the local CrossEncoder with the configured backend.
+
+        Returns:
+            CrossEncoder instance
+        """
+        from sentence_transformers import CrossEncoder
+
+        logger.info(f"Loading rerank model: {self.model_name} (backend={self.backend})")
+
+        if self.backend == "onnx":
+            try:
+                model = self._load_onnx_model()
+                # The quantized graph has its own precision
+                self.dtype = "float32"
+                return model
+            except Exception as e:
+                logger.warning(
+                    f"ONNX rerank backend unavailable ({e}), falling back to torch"
+                )
+
+        model = CrossEncoder(self.model_name, max_length=self.max_length)
+        if self.dtype != "float32":
+            model.model.to(getattr(torch, self.dtype))
+        return model
+
+    def _load_onnx_model(self):
+        """
+        Load an int8 dynamically quantized ONNX export of the rerank model.
+
+        The model is exported and quantized on first use and cached under
+        RERANK_ONNX_CACHE_DIR. Requires sentence-transformers[onnx].
+
+        Returns:
+            CrossEncoder instance running on ONNX Runtime
+        """
+        from sentence_transformers import CrossEncoder
+        from sentence_transformers.backend import export_dynamic_quantized_onnx_model
+
+        export_dir = RERANK_ONNX_CACHE_DIR / self.model_name.replace("/", "--")
+        file_name = f"onnx/model_qint8_{self.onnx_quantization}.onnx"
+
+        if not (export_dir / file_name).exists():
+            logger.info(f"Exporting quantized ONNX rerank model to {export_dir}")
+            model = CrossEncoder(
+                self.model_name, max_length=self.max_length, backend="onnx"
+            )
+            model.save_pretrained(str(export_dir))
+            export_dynamic_quantized_onnx_model(
+                model, self.onnx_quantization, str(export_dir)
+            )
 
-        if top_k:
-            return scored_docs[:top_k]
-        return scored_docs
+        return CrossEncoder(
+            str(export_dir),
+            max_length=self.max_length,
+            backend="onnx",
+            model_kwargs={"file_name": file_name},
+        )
 
     def _rerank_zhipu(
         self, query: str, documents: List[str], top_k: Optional[int]
     ) -> List[Tuple[str, float]]:
         """Rerank using Zhipu API."""
-        import requests
-
-        url = f"{self.api_base}"
-        headers = {"Authorization": f"Bearer {self.api_key}"}
-
         payload = {
             "model": self.model,
             "query": query,
@@ -180,10 +583,10 @@ class RerankService:
             "top_n": top_k or len(documents),
         }
 
-        response = requests.post(url, json=payload, headers=headers)
+        response = self._client.post(self.api_base, content=_dumps(payload))
         response.raise_for_status()
 
-        results = response.json()
+        results = _loads(response.content)
         reranked = [
             (documents[item["index"]], item["relevance_score"])
             for item in results.get("results", [])
@@ -191,6 +594,65 @@ class RerankService:
 
         return reranked
 
+    def _get_async_client(self):
+        """Get the keep-alive async HTTP client for API providers."""
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                headers=self._api_headers(),
+                timeout=httpx.Timeout(RERANK_API_TIMEOUT),
+                limits=httpx.Limits(max_connections=10, keepalive_expiry=60),
+            )
+        return self._async_client
+
+    async def _arerank_api(
+        self, query: str, documents: List[str]
+    ) -> List[Tuple[str, float]]:
+        """
+        Rerank using the Zhipu or Alibaba API with concurrent requests.
+
+        Documents are split into windows of RERANK_API_WINDOW that are sent
+        at the same time; result indices are relative to each window.
+        """
+        client = self._get_async_client()
+        windows = [
+            documents[start:start + RERANK_API_WINDOW]
+            for start in range(0, len(documents), RERANK_API_WINDOW)
+        ]
+
+        responses = await asyncio.gather(
+            *(
+                client.post(
+                    self.api_base,
+                    content=_dumps(
+                        {
+                            "model": self.model,
+                            "query": query,
+                            "documents": window,
+                            "top_n": len(window),
+                        }
+                    ),
+                )
+                for window in windows
+            )
+        )
+
+        reranked = []
+        for window, response in zip(windows, responses):
+            response.raise_for_status()
+            reranked.extend(
+                (window[item["index"]], item["relevance_score"])
+                for item in _loads(response.content).get("results", [])
+            )
+
+        return reranked
+
+    async def aclose(self):
+        """Close the async HTTP client, if one was created."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
     def _rerank_baidu(
         self, query: str, documents: List[str], top_k: Optional[int]
     ) -> List[Tuple[str, float]]:
@@ -204,14 +666,6 @@ class RerankService:
         self, query: str, documents: List[str], top_k: Optional[int]
     ) -> List[Tuple[str, float]]:
         """Rerank using Alibaba API."""
-        import requests
-
-        url = f"{self.api_base}"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
-
         payload = {
             "model": self.model,
             "query": query,
@@ -219,10 +673,10 @@ class RerankService:
             "top_n": top_k or len(documents),
         }
 
-        response = requests.post(url, json=payload, headers=headers)
+        response = self._client.post(self.api_base, content=_dumps(payload))
         response.raise_for_status()
 
-        results = response.json()
+        results = _loads(response.content)
         reranked = [
             (documents[item["index"]], item["relevance_score"])
             for item in results.get("results", [])
@@ -233,9 +687,86 @@ class RerankService:
     def _rerank_openai(
         self, query: str, documents: List[str], top_k: Optional[int]
     ) -> List[Tuple[str, float]]:
-        """Rerank using OpenAI API."""
+        """Rerank using embeddings + cosine similarity (bi-encoder)."""
         # OpenAI doesn't have a dedicated rerank API, use embeddings + cosine similarity
-        logger.warning("OpenAI rerank using embeddings fallback")
-        # Fallback to local model
-        return self._rerank_local(query, documents, top_k)
+        import numpy as np
+
+        query_vector = np.asarray(self.embedding_service.embed_text(query), dtype=np.float32)
+        query_vector /= np.linalg.norm(query_vector) or 1.0
+
+        doc_matrix = self._get_doc_matrix(documents)
+
+        # One BLAS matrix-vector product over the contiguous (n, d) matrix
+        scores = np.einsum("nd,d->n", doc_matrix, query_vector, optimize=True)
 
+        # Sort by score (descending)
+        ranking = _top_k_indices(scores, top_k)
+
+        return [(documents[i], float(scores[i])) for i in ranking]
+
+    def _get_doc_matrix(self, documents: List[str]):
+        """
+        Get the L2-normalized float32 embedding matrix for documents.
+
+        The matrix for the most recent candidate set is kept, so reranking
+        the same documents for another query skips rebuilding it.
+
+        Args:
+            documents: List of document texts
+
+        Returns:
+            C-contiguous numpy array of shape (len(documents), dim)
+        """
+        import numpy as np
+
+        matrix_key = tuple(documents)
+        cached = self._doc_matrix
+        if cached is not None and cached[0] == matrix_key:
+            return cached[1]
+
+        doc_matrix = np.stack(self._embed_documents(documents))
+        doc_norms = np.linalg.norm(doc_matrix, axis=1, keepdims=True)
+        doc_norms[doc_norms == 0] = 1.0
+        doc_matrix /= doc_norms
+
+        self._doc_matrix = (matrix_key, doc_matrix)
+        return doc_matrix
+
+    def _embed_documents(self, documents: List[str]) -> List["np.ndarray"]:
+        """
+        Embed documents, reusing embeddings of documents seen before.
+
+        Args:
+            documents: List of document texts
+
+        Returns:
+            List of float32 embeddings in the same order as documents
+        """
+        import numpy as np
+
+        keys = [hashlib.blake2b(doc.encode("utf-8"), digest_size=16).digest() for doc in documents]
+        embeddings: dict = {}
+
+        with self._cache_lock:
+            for key in keys:
+                embedding = self._doc_embedding_cache.get(key)
+                if embedding is not None:
+                    self._doc_embedding_cache.move_to_end(key)
+                    embeddings[key] = embedding
+
+        missing = {}
+        for key, doc in zip(keys, documents):
+            if key not in embeddings:
+                missing.setdefault(key, doc)
+
+        if missing:
+            new_embeddings = self.embedding_service.embed_texts(list(missing.values()))
+            with self._cache_lock:
+                for key, embedding in zip(missing.keys(), new_embeddings):
+                    embedding = np.asarray(embedding, dtype=np.float32)
+                    embeddings[key] = embedding
+                    self._doc_embedding_cache[key] = embedding
+                while len(self._doc_embedding_cache) > RERANK_EMBED_CACHE_SIZE:
+                    self._doc_embedding_cache.popitem(last=False)
+
+        return [embeddings[key] for key in keys]
@@ -1,17 +1,65 @@
 """Retriever service for RAG - wraps VectorService for LangChain compatibility."""
 
+import asyncio
+import functools
+import hashlib
 import logging
-from typing import List, Optional
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
 from langchain_core.documents import Document
 from langchain_core.retrievers import BaseRetriever
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
 from backend.app.services.embedding_service import EmbeddingService
+from backend.app.services.rerank_service import RerankService
 from backend.app.services.vector_service import VectorService
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of cached query embeddings per embedding model
+QUERY_EMB_CACHE_SIZE = int(os.getenv("QUERY_EMB_CACHE_SIZE", "2048"))
+
+# Query embeddings shared by all retrievers (see embed_query_cached), keyed by embedding model
+_query_embedding_caches: Dict[str, "OrderedDict[str, List[float]]"] = {}
+_query_embedding_lock = threading.Lock()
+
+
+def embed_query_cached(embedding_service: EmbeddingService, query: str) -> List[float]:
+    """
+    Embed a query, reusing the embedding of an identical earlier query.
+
+    The cache is shared by all callers using the same embedding model.
+
+    Args:
+        embedding_service: Service used on a cache miss
+        query: Query string
+
+    Returns:
+        Query embedding
+    """
+    model_key = f"{embedding_service.model_name}:{embedding_service.dtype}"
+    query_key = hashlib.blake2b(query.encode("utf-8"), digest_size=16).hexdigest()
+
+    with _query_embedding_lock:
+        cache = _query_embedding_caches.setdefault(model_key, OrderedDict())
+        embedding = cache.get(query_key)
+        if embedding is not None:
+            cache.move_to_end(query_key)
+            return embedding
+
+    embedding = embedding_service.embed_text(query)
+
+    with _query_embedding_lock:
+        cache[query_key] = embedding
+        while len(cache) > QUERY_EMB_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    return embedding
+
 
 class ChromaDBRetriever(BaseRetriever):
     """
@@ -27,6 +75,16 @@ class ChromaDBRetriever(BaseRetriever):
     k: int = 4
     score_threshold: Optional[float] = None
     metadata_filter: Optional[dict] = None
+    rerank_service: Optional[RerankService] = Field(default=None, exclude=True)
+    fetch_k: int = 100
+
+    # Set once the collection and model dimensions have been checked
+    _validated: bool = PrivateAttr(default=False)
+    _collection_dim: Optional[int] = PrivateAttr(default=None)
+    _model_dim: Optional[int] = PrivateAttr(default=None)
+
+    # vector_service.query with the per-retriever arguments bound
+    _query_fn: Optional[functools.partial] = PrivateAttr(default=None)
 
     def __init__(
         self,
@@ -36,6 +94,8 @@ class ChromaDBRetriever(BaseRetriever):
         k: int = 4,
         score_threshold: Optional[float] = None,
         metadata_filter: Optional[dict] = None,
+        rerank_service: Optional[RerankService] = None,
+        fetch_k: int = 100,
         **kwargs,
     ):
         """
@@ -48,6 +108,9 @@ class ChromaDBRetriever(BaseRetriever):
             k: Number of documents to retrieve (default: 4)
             score_threshold: Optional similarity score threshold (0-1)
             metadata_filter: Optional metadata filter dict for ChromaDB where clause
+            rerank_service: Optional RerankService. If set, `fetch_k` candidates are
+                           retrieved and reranked down to `k`.
+            fetch_k: Number of candidates to retrieve before reranking (default: 100)
         """
         super().__init__(
             vector_service=vector_service,
@@ -56,13 +119,32 @@ class ChromaDBRetriever(BaseRetriever):
             k=k,
             score_threshold=score_threshold,
             metadata_filter=metadata_filter,
+            rerank_service=rerank_service,
+            fetch_k=fetch_k,
             **kwargs,
         )
 
+        self._bind_query_fn()
+
         logger.info(
             f"Initialized ChromaDBRetriever: collection={collection_name}, k={k}"
         )
 
+    def __setattr__(self, name, value):
+        """Set an attribute, rebinding the query function when its inputs change."""
+        super().__setattr__(name, value)
+        if name in ("vector_service", "collection_name", "metadata_filter", "k"):
+            self._bind_query_fn()
+
+    def _bind_query_fn(self):
+        """Bind the collection, filter and default result count for ChromaDB queries."""
+        self._query_fn = functools.partial(
+            self.vector_service.query,
+            collection_name=self.collection_name,
+            n_results=self.k,
+            where=self.metadata_filter,
+        )
+
     def _get_relevant_documents(
         self, query: str
     ) -> List[Document]:
@@ -75,51 +157,27 @@ class ChromaDBRetriever(BaseRetriever):
         Returns:
             List of LangChain Document objects
         """
-        try:
-            # Validate embedding dimension before querying
-            # Temporarily disabled to let ChromaDB report actual error
-            # self._validate_embedding_dimension()
-            
-            # Generate query embedding
-            query_embedding = self.embedding_service.embed_text(query)
-
-            # Query ChromaDB
-            results = self.vector_service.query(
-                collection_name=self.collection_name,
-                query_embeddings=[query_embedding],
-                n_results=self.k,
-                where=self.metadata_filter,
-            )
+        if self.rerank_service is not None:
+            return self.retrieve_and_rerank(query)
+        return self._retrieve(query, self.k)
+
+    def _retrieve(self, query: str, n_results: int) -> List[Document]:
+        """
+        Run the vector search for a query.
+
+        Args:
+            query: Query string
+            n_results: Number of documents to retrieve
 
+        Returns:
+            List of LangChain Document objects
+        """
+        try:
             # Convert ChromaDB results to LangChain Documents
-            documents = []
-            if results and "ids" in results and len(results["ids"]) > 0:
-                ids = results["ids"][0]
-                documents_list = results.get("documents", [[]])[0]
-                metadatas_list = results.get("metadatas", [[]])[0]
-                distances = results.get("distances", [[]])[0]
-
-                for i, (doc_id, doc_text, metadata) in enumerate(
-                    zip(ids, documents_list, metadatas_list)
-                ):
-                    # Apply score threshold if specified
-                    if self.score_threshold is not None:
-                        # ChromaDB uses distance (lower is better), convert to similarity
-                        # Cosine similarity ≈ 1 - distance (for normalized vectors)
-                        similarity = 1.0 - distances[i] if distances else 1.0
-                        if similarity < self.score_threshold:
-                            continue
-
-                    # Create LangChain Document
-                    doc = Document(
-                        page_content=doc_text,
-                        metadata={
-                            **metadata,
-                            "chunk_id": doc_id,
-                            "distance": distances[i] if distances else None,
-                        },
-                    )
-                    documents.append(doc)
+            documents = [
+                Document(page_content=text, metadata=metadata)
+                for text, metadata, _ in self._iter_hits(query, n_results)
+            ]
 
             logger.debug(
                 f"Retrieved {len(documents)} documents for query: {query[:50]}..."
@@ -130,6 +188,162 @@ class ChromaDBRetriever(BaseRetriever):
             logger.error(f"Error retrieving documents: {e}")
             return []
 
+    def _iter_hits(
+        self, query: str, n_results: int
+    ) -> Iterator[Tuple[str, dict, Optional[float]]]:
+        """
+        Query ChromaDB and yield hits that pass the score threshold.
+
+        Args:
+            query: Query string
+            n_results: Number of documents to retrieve
+
+        Yields:
+            Tuples of (chunk text, metadata with chunk_id and distance added,
+            similarity score or None if ChromaDB returned no distances)
+        """
+        # Validate embedding dimension before querying (checked once)
+        self._validate_embedding_dimension()
+
+        # Generate query embedding
+        query_embedding = self._embed_query(query)
+
+        # Query ChromaDB
+        results = self._query_fn(
+            query_embeddings=[query_embedding], n_results=n_results
+        )
+
+        if not results or "ids" not in results or len(results["ids"]) == 0:
+            return
+
+        ids = results["ids"][0]
+        documents_list = results.get("documents", [[]])[0]
+        metadatas_list = results.get("metadatas", [[]])[0]
+        distances = results.get("distances", [[]])[0]
+
+        # ChromaDB uses distance (lower is better), convert to similarity
+        # Cosine similarity ≈ 1 - distance (for normalized vectors)
+        # Similarities are computed once, for the threshold and the scores
+        similarities = (
+            1.0 - np.asarray(distances, dtype=np.float64) if distances else None
+        )
+        if self.score_threshold is not None and similarities is not None:
+            keep = np.flatnonzero(similarities >= self.score_threshold)
+        else:
+            keep = range(min(len(ids), len(documents_list), len(metadatas_list)))
+
+        for i in keep:
+            metadata = dict(metadatas_list[i]) if metadatas_list[i] else {}
+            metadata["chunk_id"] = ids[i]
+            metadata["distance"] = distances[i] if distances else None
+            similarity = float(similarities[i]) if similarities is not None else None
+            yield documents_list[i], metadata, similarity
+
+    def retrieve_and_rerank(
+        self,
+        query: str,
+        fetch_k: Optional[int] = None,
+        final_k: Optional[int] = None,
+        rerank_service: Optional[RerankService] = None,
+    ) -> List[Document]:
+        """
+        Retrieve `fetch_k` candidates and rerank them down to `final_k`.
+
+        Args:
+            query: Query string
+            fetch_k: Number of candidates to retrieve. If None, uses self.fetch_k.
+            final_k: Number of documents to return. If None, uses self.k.
+            rerank_service: RerankService to use. If None, uses self.rerank_service.
+
+        Returns:
+            List of LangChain Document objects ordered by rerank score, with
+            the score in metadata["rerank_score"]
+        """
+        rerank_service = rerank_service or self.rerank_service
+        final_k = final_k or self.k
+        candidates = self._retrieve(query, fetch_k or self.fetch_k)
+
+        if rerank_service is None or not candidates:
+            return candidates[:final_k]
+
+        by_text = self._index_by_text(candidates)
+        try:
+            scored = rerank_service.rerank(query, list(by_text), top_k=final_k)
+        except Exception as e:
+            logger.error(f"Error reranking documents: {e}")
+            return candidates[:final_k]
+
+        return self._apply_rerank_scores(by_text, scored)
+
+    async def aretrieve_and_rerank(
+        self,
+        query: str,
+        fetch_k: Optional[int] = None,
+        final_k: Optional[int] = None,
+        rerank_service: Optional[RerankService] = None,
+    ) -> List[Document]:
+        """
+        Async version of retrieve_and_rerank.
+
+        Args:
+            query: Query string
+            fetch_k: Number of candidates to retrieve. If None, uses self.fetch_k.
+            final_k: Number of documents to return. If None, uses self.k.
+            rerank_service: RerankService to use. If None, uses self.rerank_service.
+
+        Returns:
+            List of LangChain Document objects ordered by rerank score
+        """
+        rerank_service = rerank_service or self.rerank_service
+        final_k = final_k or self.k
+        candidates = await asyncio.to_thread(
+            self._retrieve, query, fetch_k or self.fetch_k
+        )
+
+        if rerank_service is None or not candidates:
+            return candidates[:final_k]
+
+        by_text = self._index_by_text(candidates)
+        try:
+            scored = await rerank_service.arerank(query, list(by_text), top_k=final_k)
+        except Exception as e:
+            logger.error(f"Error reranking documents: {e}")
+            return candidates[:final_k]
+
+        return self._apply_rerank_scores(by_text, scored)
+
+    @staticmethod
+    def _index_by_text(documents: List[Document]) -> Dict[str, Document]:
+        """Map chunk text to its best-ranked Document (the reranker scores texts)."""
+        by_text: Dict[str, Document] = {}
+        for doc in documents:
+            by_text.setdefault(doc.page_content, doc)
+        return by_text
+
+    @staticmethod
+    def _apply_rerank_scores(
+        by_text: Dict[str, Document], scored: List[tuple]
+    ) -> List[Document]:
+        """Order Documents by rerank result and record their rerank scores."""
+        reranked = []
+        for text, score in scored:
+            doc = by_text[text]
+            doc.metadata["rerank_score"] = score
+            reranked.append(doc)
+        return reranked
+
+    def _embed_query(self, query: str) -> List[float]:
+        """
+        Embed a query, reusing the embedding of an identical earlier query.
+
+        Args:
+            query: Query string
+
+        Returns:
+            Query embedding
+        """
+        return embed_query_cached(self.embedding_service, query)
+
     def _validate_embedding_dimension(self):
         """
         Validate that the embedding service dimension matches the collection dimension.
@@ -137,9 +351,15 @@ class ChromaDBRetriever(BaseRetriever):
         This validation is done by attempting a test query. If the query fails due to
         dimension mismatch, ChromaDB will raise an error with the expected dimension.
         
+        The result is remembered, so only the first query pays for the
+        lookups; call reset_validation() after re-indexing.
+
         Raises:
             ValueError: If dimensions don't match
         """
+        if self._validated:
+            return
+
         # Get collection dimension (may return None if collection is empty or check fails)
         collection_dim = self.vector_service.get_collection_embedding_dimension(
             self.collection_name
@@ -166,12 +386,22 @@ class ChromaDBRetriever(BaseRetriever):
             logger.error(error_msg)
             raise ValueError(error_msg)
         
+        self._collection_dim = collection_dim
+        self._model_dim = current_dim
+        self._validated = True
+
         # Log dimension match for debugging
         logger.debug(
             f"Embedding dimension validated: collection={collection_dim}D, "
             f"model={current_dim}D"
         )
 
+    def reset_validation(self):
+        """Forget the embedding dimension check, e.g. after re-indexing."""
+        self._validated = False
+        self._collection_dim = None
+        self._model_dim = None
+
     async def _aget_relevant_documents(
         self, query: str
     ) -> List[Document]:
@@ -184,8 +414,28 @@ class ChromaDBRetriever(BaseRetriever):
         Returns:
             List of LangChain Document objects
         """
-        # For now, use sync version (ChromaDB query is sync)
-        return self._get_relevant_documents(query)
+        if self.rerank_service is not None:
+            return await self.aretrieve_and_rerank(query)
+
+        # Embedding and the ChromaDB query are blocking; run them in a worker
+        # thread so the event loop stays free
+        return await asyncio.to_thread(self._retrieve, query, self.k)
+
+    async def aget_multi(self, queries: List[str]) -> List[List[Document]]:
+        """
+        Retrieve documents for several queries concurrently.
+
+        Args:
+            queries: Query strings
+
+        Returns:
+            List of Document lists, one per query in the same order
+        """
+        return list(
+            await asyncio.gather(
+                *(self._aget_relevant_documents(query) for query in queries)
+            )
+        )
 
     def get_relevant_documents(self, query: str) -> List[Document]:
         """
@@ -229,30 +479,46 @@ class ChromaDBRetriever(BaseRetriever):
             - source_info: (if include_source_info) dict with original_path,
               storage_path, file_size, import_batch, etc.
         """
-        documents = self.get_relevant_documents(query)
+        if self.rerank_service is not None:
+            hits = (
+                (
+                    doc.page_content,
+                    doc.metadata,
+                    1.0 - doc.metadata["distance"]
+                    if doc.metadata.get("distance") is not None
+                    else None,
+                )
+                for doc in self.get_relevant_documents(query)
+            )
+        else:
+            # Build results straight from the ChromaDB hits, without
+            # materializing intermediate Document objects
+            hits = self._iter_hits(query, self.k)
 
         enhanced_results = []
-        for doc in documents:
-            enhanced = {
-                "text": doc.page_content,
-                "metadata": doc.metadata,
-                "score": 1.0 - doc.metadata.get("distance", 0)
-                if doc.metadata.get("distance") is not None
-                else None,
-            }
-
-            if include_source_info:
-                meta = doc.metadata
-                enhanced["source_info"] = {
-                    "original_path": meta.get("original_path"),
-                    "storage_path": meta.get("storage_path"),
-                    "file_size": meta.get("file_size"),
-                    "file_mtime": meta.get("file_mtime"),
-                    "import_batch": meta.get("import_batch"),
-                    "file_hash": meta.get("file_hash"),
+        try:
+            for text, meta, score in hits:
+                enhanced = {
+                    "text": text,
+                    "metadata": meta,
+                    "score": score,
                 }
 
-            enhanced_results.append(enhanced)
+                if include_source_info:
+                    enhanced["source_info"] = {
+                        "original_path": meta.get("original_path"),
+                        "storage_path": meta.get("storage_path"),
+                        "file_size": meta.get("file_size"),
+                        "file_mtime": meta.get("file_mtime"),
+                        "import_batch": meta.get("import_batch"),
+                        "file_hash": meta.get("file_hash"),
+                    }
+
+                enhanced_results.append(enhanced)
+
+        except Exception as e:
+            logger.error(f"Error retrieving documents: {e}")
+            return []
 
         return enhanced_results
 
@@ -1,24 +1,55 @@
 """Search strategies for Agentic Search."""
 
 import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from typing import Any, Dict, List, Optional
 
 from backend.app.services.agent_tools import AgentTools
 
 logger = logging.getLogger(__name__)
 
+# Worker threads for concurrent (I/O-bound) tool calls, shared by all strategies
+STRATEGY_MAX_WORKERS = int(os.getenv("STRATEGY_MAX_WORKERS", "8"))
+
+# Obsidian-style #tag in a query (any non-space characters, including CJK)
+_TAG_RE = re.compile(r"#([^\s#]+)", re.UNICODE)
+
+# Maximum number of tagged notes read by TagFilterStrategy
+TAG_NOTE_LIMIT = 10
+
+_shared_executor: Optional[ThreadPoolExecutor] = None
+_shared_executor_lock = threading.Lock()
+
+
+def _get_shared_executor() -> ThreadPoolExecutor:
+    """Return the process-wide executor for strategy tool calls, creating it on first use."""
+    global _shared_executor
+    with _shared_executor_lock:
+        if _shared_executor is None:
+            _shared_executor = ThreadPoolExecutor(
+                max_workers=STRATEGY_MAX_WORKERS, thread_name_prefix="search-strategy"
+            )
+        return _shared_executor
+
 
 class SearchStrategy:
     """Base class for search strategies."""
 
-    def __init__(self, tools: AgentTools):
+    def __init__(self, tools: AgentTools, executor: Optional[ThreadPoolExecutor] = None):
         """
         Initialize search strategy.
 
         Args:
             tools: AgentTools instance
+            executor: Optional executor for concurrent tool calls.
+                     If None, a process-wide executor is shared.
         """
         self.tools = tools
+        self.executor = executor or _get_shared_executor()
 
     def execute(self, query: str, context: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
@@ -65,21 +96,30 @@ class NoteFirstStrategy(SearchStrategy):
             logger.debug("No notes found by title search")
             return results
 
-        # Step 2: Get metadata and linked notes for top results
-        for note in notes[:3]:  # Top 3 notes
+        # Step 2: Get metadata, linked notes and content for top results.
+        # Metadata and content are fetched in one batched lookup each; links
+        # are resolved per note. All lookups are independent and run at once.
+        top_notes = notes[:3]  # Top 3 notes
+        note_ids = [note["note_id"] for note in top_notes]
+
+        metadata_future = self.executor.submit(self.tools.get_notes_metadata, note_ids)
+        content_future = self.executor.submit(self.tools.read_note_contents, note_ids)
+        linked_futures = [
+            self.executor.submit(self.tools.get_linked_notes, note_id) for note_id in note_ids
+        ]
+
+        metadata_by_id = metadata_future.result()
+        content_by_id = content_future.result()
+        for note, linked_future in zip(top_notes, linked_futures):
             note_id = note["note_id"]
 
-            # Get full metadata
-            metadata = self.tools.get_note_metadata(note_id)
+            metadata = metadata_by_id.get(note_id)
             if metadata:
                 note["metadata"] = metadata
 
-            # Get linked notes
-            linked_notes = self.tools.get_linked_notes(note_id)
-            note["linked_notes"] = linked_notes
+            note["linked_notes"] = linked_future.result()
 
-            # Read note content
-            content = self.tools.read_note_content(note_id)
+            content = content_by_id.get(note_id)
             if content:
                 note["content"] = content
 
@@ -134,10 +174,12 @@ class LinkExpansionStrategy(SearchStrategy):
             logger.debug(f"No linked notes found for note {seed_note_id}")
             return results
 
-        # Read content of linked notes
-        for linked_note in linked_notes[:5]:  # Limit to 5 linked notes
-            note_id = linked_note["note_id"]
-            content = self.tools.read_note_content(note_id)
+        # Read content of linked notes concurrently
+        linked_notes = linked_notes[:5]  # Limit to 5 linked notes
+        contents = self.executor.map(
+            self.tools.read_note_content, [note["note_id"] for note in linked_notes]
+        )
+        for linked_note, content in zip(linked_notes, contents):
             if content:
                 linked_note["content"] = content
                 results.append(linked_note)
@@ -172,42 +214,38 @@ class TagFilterStrategy(SearchStrategy):
         results = []
 
         # Extract tags from context or query
-        tags = []
         if context and "tags" in context:
-            tags = context["tags"]
             # Normalize tags to Obsidian style (#tag)
-            tags = [tag if tag.startswith("#") else f"#{tag}" for tag in tags]
+            tags = [tag if tag.startswith("#") else f"#{tag}" for tag in context["tags"]]
         else:
             # Try to extract tags from query (simple heuristic)
-            # Look for #tag patterns
-            # Support Unicode characters (including Chinese, Japanese, Korean, etc.)
-            import re
-            tag_pattern = r"#([^\s#]+)"
-            found_tags = re.findall(tag_pattern, query)
-            tags = [f"#{tag}" for tag in found_tags]
+            tags = [f"#{tag}" for tag in _TAG_RE.findall(query)]
+
+        # Look up each tag once, keeping first-mention order
+        tags = list(dict.fromkeys(tags))
 
         if not tags:
             logger.debug("No tags found in query or context")
             return results
 
-        # Get notes for each tag
-        all_tagged_notes = []
-        for tag in tags:
-            notes = self.tools.get_notes_by_tag(tag)
-            all_tagged_notes.extend(notes)
-
-        # Remove duplicates by note_id
-        seen = set()
-        unique_notes = []
-        for note in all_tagged_notes:
-            if note["note_id"] not in seen:
-                seen.add(note["note_id"])
-                unique_notes.append(note)
-
-        # Read content of tagged notes
-        for note in unique_notes[:10]:  # Limit to 10 notes
-            note_id = note["note_id"]
-            content = self.tools.read_note_content(note_id)
+        # Collect notes for each tag, deduplicated by note_id in tag order.
+        # Lookups run concurrently; merging stops once enough notes are collected.
+        unique_notes: Dict[str, Dict[str, Any]] = {}
+        tag_results = self.executor.map(
+            lambda tag: self.tools.get_notes_by_tag(tag, limit=TAG_NOTE_LIMIT), tags
+        )
+        for tag_notes in tag_results:
+            for note in tag_notes:
+                unique_notes.setdefault(note["note_id"], note)
+            if len(unique_notes) >= TAG_NOTE_LIMIT:
+                break
+
+        # Read content of tagged notes concurrently
+        tagged_notes = list(islice(unique_notes.values(), TAG_NOTE_LIMIT))
+        contents = self.executor.map(
+            self.tools.read_note_content, [note["note_id"] for note in tagged_notes]
+        )
+        for note, content in zip(tagged_notes, contents):
             if content:
                 note["content"] = content
                 results.append(note)
@@ -274,8 +312,13 @@ class HybridStrategy(SearchStrategy):
         all_results = []
         seen_ids = set()
 
+        # Document search does not depend on the note results, so start it
+        # speculatively and discard it if the notes turn out to be sufficient
+        fallback_strategy = FallbackStrategy(self.tools, self.executor)
+        fallback_future = self.executor.submit(fallback_strategy.execute, query, context)
+
         # Step 1: Note-first search
-        note_strategy = NoteFirstStrategy(self.tools)
+        note_strategy = NoteFirstStrategy(self.tools, self.executor)
         note_results = note_strategy.execute(query, context)
         for result in note_results:
             note_id = result.get("note_id")
@@ -285,7 +328,7 @@ class HybridStrategy(SearchStrategy):
 
         # Step 2: If we have a seed note, try link expansion
         if note_results and len(all_results) < 5:
-            link_strategy = LinkExpansionStrategy(self.tools)
+            link_strategy = LinkExpansionStrategy(self.tools, self.executor)
             link_context = {"seed_note_id": note_results[0]["note_id"]}
             link_results = link_strategy.execute(query, link_context)
             for result in link_results:
@@ -296,14 +339,15 @@ class HybridStrategy(SearchStrategy):
 
         # Step 3: Fallback to PDF/document search if still insufficient
         if len(all_results) < 3:
-            fallback_strategy = FallbackStrategy(self.tools)
-            pdf_results = fallback_strategy.execute(query, context)
+            pdf_results = fallback_future.result()
             # PDF results don't have note_id, so we use doc_id
             for result in pdf_results:
                 doc_id = result.get("doc_id")
                 if doc_id and doc_id not in seen_ids:
                     seen_ids.add(doc_id)
                     all_results.append(result)
+        else:
+            fallback_future.cancel()
 
         logger.debug(f"Hybrid strategy found {len(all_results)} total results")
         return all_results
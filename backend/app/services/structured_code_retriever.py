@@ -1,15 +1,47 @@
 """Structured code retrieval service with metadata filtering."""
 
+import functools
+import json
 import logging
 import re
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple
 
 from backend.app.services.embedding_service import EmbeddingService
-from backend.app.services.retriever import ChromaDBRetriever
+from backend.app.services.retriever import ChromaDBRetriever, embed_query_cached
 from backend.app.services.vector_service import VectorService
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per collection.get() page when filtering metadata client-side
+METADATA_SCAN_PAGE_SIZE = 1000
+
+# Over-fetch factor for semantic queries whose $regex conditions are matched
+# client-side after ranking
+POST_FILTER_FETCH_FACTOR = 5
+
+
+def _build_metadata_filter(required: List[Dict], **optional: Optional[str]) -> Dict:
+    """
+    Build a ChromaDB where clause from required and optional equality conditions.
+
+    Args:
+        required: Conditions that are always applied
+        **optional: Metadata key/value pairs, applied only when the value is set
+
+    Returns:
+        Single condition, or an $and of all conditions
+    """
+    conditions = list(required)
+    for key, value in optional.items():
+        if value:
+            conditions.append({key: value})
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
+def _is_regex_condition(value) -> bool:
+    """Check whether a filter value uses the $regex operator."""
+    return isinstance(value, dict) and "$regex" in value
+
 
 class StructuredCodeRetriever:
     """Retriever for structured code search with metadata filtering."""
@@ -35,18 +67,20 @@ class StructuredCodeRetriever:
         self.collection_name = collection_name
         self.k = k
 
-        # Initialize base retriever
-        self.base_retriever = ChromaDBRetriever(
-            vector_service=self.vector_service,
-            embedding_service=self.embedding_service,
-            collection_name=collection_name,
-            k=k,
-        )
-
         logger.info(
             f"Initialized StructuredCodeRetriever: collection={collection_name}, k={k}"
         )
 
+    @functools.cached_property
+    def base_retriever(self) -> ChromaDBRetriever:
+        """Plain semantic retriever over the same collection, built on first use."""
+        return ChromaDBRetriever(
+            vector_service=self.vector_service,
+            embedding_service=self.embedding_service,
+            collection_name=self.collection_name,
+            k=self.k,
+        )
+
     def search_by_function(
         self,
         function_name: str,
@@ -68,27 +102,12 @@ class StructuredCodeRetriever:
         Returns:
             List of search result dictionaries
         """
-        # Build where clause with $and operator for multiple conditions
-        conditions = {"code_function_name": function_name}
-        
-        if class_name:
-            conditions["code_class_name"] = class_name
-        if module_name:
-            conditions["code_module_name"] = module_name
-        if import_batch:
-            conditions["import_batch"] = import_batch
-        
-        # Use $and if multiple conditions
-        if len(conditions) > 1:
-            metadata_filter = {"$and": [{"code_function_name": function_name}]}
-            if class_name:
-                metadata_filter["$and"].append({"code_class_name": class_name})
-            if module_name:
-                metadata_filter["$and"].append({"code_module_name": module_name})
-            if import_batch:
-                metadata_filter["$and"].append({"import_batch": import_batch})
-        else:
-            metadata_filter = conditions
+        metadata_filter = _build_metadata_filter(
+            [{"code_function_name": function_name}],
+            code_class_name=class_name,
+            code_module_name=module_name,
+            import_batch=import_batch,
+        )
 
         return self._query_with_filter(
             query_text=f"function {function_name}",
@@ -115,14 +134,11 @@ class StructuredCodeRetriever:
         Returns:
             List of search result dictionaries
         """
-        conditions = [{"code_class_name": class_name}, {"code_code_type": "class"}]
-        
-        if module_name:
-            conditions.append({"code_module_name": module_name})
-        if import_batch:
-            conditions.append({"import_batch": import_batch})
-        
-        metadata_filter = {"$and": conditions} if len(conditions) > 1 else conditions[0]
+        metadata_filter = _build_metadata_filter(
+            [{"code_class_name": class_name}, {"code_code_type": "class"}],
+            code_module_name=module_name,
+            import_batch=import_batch,
+        )
 
         return self._query_with_filter(
             query_text=f"class {class_name}",
@@ -147,20 +163,14 @@ class StructuredCodeRetriever:
         Returns:
             List of search result dictionaries
         """
-        # ChromaDB regex only works in query, not get
-        # So we need to use semantic search with path filter
-        conditions = [{"file_path": {"$regex": path_pattern}}]
-        
-        if import_batch:
-            conditions.append({"import_batch": import_batch})
-        
-        metadata_filter = {"$and": conditions} if len(conditions) > 1 else conditions[0]
+        # ChromaDB has no $regex for metadata; the pattern is matched
+        # client-side while paging through the other conditions' matches
+        metadata_filter = _build_metadata_filter(
+            [{"file_path": {"$regex": path_pattern}}], import_batch=import_batch
+        )
 
         return self._query_with_filter(
-            query_text="", 
-            metadata_filter=metadata_filter, 
-            k=k, 
-            semantic_search=True  # Use query for regex support
+            query_text="", metadata_filter=metadata_filter, k=k, semantic_search=False
         )
 
     def search_by_module(
@@ -180,12 +190,9 @@ class StructuredCodeRetriever:
         Returns:
             List of search result dictionaries
         """
-        conditions = [{"code_module_name": module_name}]
-        
-        if import_batch:
-            conditions.append({"import_batch": import_batch})
-        
-        metadata_filter = {"$and": conditions} if len(conditions) > 1 else conditions[0]
+        metadata_filter = _build_metadata_filter(
+            [{"code_module_name": module_name}], import_batch=import_batch
+        )
 
         return self._query_with_filter(
             query_text=f"module {module_name}", metadata_filter=metadata_filter, k=k
@@ -217,6 +224,79 @@ class StructuredCodeRetriever:
             score_threshold=score_threshold,
         )
 
+    def batch_search(
+        self,
+        queries: List[Tuple[str, Optional[Dict]]],
+        k: Optional[int] = None,
+        score_threshold: Optional[float] = None,
+    ) -> List[List[Dict]]:
+        """
+        Run several semantic searches with one embedding call.
+
+        Query texts are embedded together, and queries sharing a metadata
+        filter are sent to ChromaDB as a single multi-embedding query.
+        $regex conditions are matched client-side, as in hybrid_search.
+
+        Args:
+            queries: (query text, metadata filter) pairs
+            k: Number of results per query
+            score_threshold: Optional similarity score threshold
+
+        Returns:
+            One list of search result dictionaries per query, in input order
+        """
+        k = k or self.k
+        if not queries:
+            return []
+
+        try:
+            collection = self.vector_service.get_or_create_collection(self.collection_name)
+
+            texts = list(dict.fromkeys(query_text for query_text, _ in queries))
+            embeddings = dict(zip(texts, self.embedding_service.embed_texts(texts)))
+
+            # Group query positions by filter (ChromaDB applies one where
+            # clause to all embeddings of a query call). Raw filters are the
+            # key so queries with different $regex conditions stay apart.
+            groups: Dict[str, Tuple[Optional[Dict], List[Tuple[str, Pattern]], List[int]]] = {}
+            for position, (_, metadata_filter) in enumerate(queries):
+                group_key = json.dumps(metadata_filter, sort_keys=True)
+                if group_key not in groups:
+                    groups[group_key] = (
+                        self._normalize_metadata_filter(metadata_filter) or None,
+                        self._extract_regex_conditions(metadata_filter),
+                        [],
+                    )
+                groups[group_key][2].append(position)
+
+            all_results: List[List[Dict]] = [[] for _ in queries]
+            for normalized_filter, regex_conditions, positions in groups.values():
+                # As in _query_with_filter, over-fetch when $regex conditions
+                # are matched client-side
+                n_results = k * POST_FILTER_FETCH_FACTOR if regex_conditions else k
+                results = collection.query(
+                    query_embeddings=[embeddings[queries[p][0]] for p in positions],
+                    n_results=n_results,
+                    where=normalized_filter,
+                )
+                for index, position in enumerate(positions):
+                    rows = self._unpack_query_result(results, index)
+                    if regex_conditions:
+                        rows = (
+                            row for row in rows
+                            if self._matches_regex(row[2], regex_conditions)
+                        )
+                    all_results[position] = self._build_results(rows, k, score_threshold)
+
+            logger.debug(
+                f"Batch search ran {len(queries)} queries in {len(groups)} ChromaDB calls"
+            )
+            return all_results
+
+        except Exception as e:
+            logger.error(f"Error in structured code batch search: {e}")
+            return [[] for _ in queries]
+
     def _query_with_filter(
         self,
         query_text: str,
@@ -224,6 +304,7 @@ class StructuredCodeRetriever:
         k: Optional[int] = None,
         score_threshold: Optional[float] = None,
         semantic_search: bool = True,
+        post_filter_factor: int = POST_FILTER_FETCH_FACTOR,
     ) -> List[Dict]:
         """
         Query ChromaDB with metadata filter.
@@ -234,6 +315,9 @@ class StructuredCodeRetriever:
             k: Number of results to return
             score_threshold: Optional similarity score threshold
             semantic_search: Whether to perform semantic search
+            post_filter_factor: Multiple of k fetched by semantic search when
+                               $regex conditions must be matched client-side.
+                               Exactly k rows are fetched otherwise.
 
         Returns:
             List of search result dictionaries
@@ -243,78 +327,35 @@ class StructuredCodeRetriever:
         try:
             collection = self.vector_service.get_or_create_collection(self.collection_name)
 
-            if semantic_search:
-                if query_text:
-                    # Semantic search with metadata filter
-                    query_embedding = self.embedding_service.embed_text(query_text)
-                    
-                    # Normalize metadata_filter for ChromaDB
-                    normalized_filter = self._normalize_metadata_filter(metadata_filter)
-                    
-                    results = collection.query(
+            # Normalize metadata_filter for ChromaDB (shared by all branches)
+            normalized_filter = self._normalize_metadata_filter(metadata_filter) or None
+            regex_conditions = self._extract_regex_conditions(metadata_filter)
+
+            if semantic_search and query_text:
+                # Semantic search with metadata filter
+                query_embedding = embed_query_cached(self.embedding_service, query_text)
+
+                # Rows come back ranked, so a score threshold never needs extra
+                # rows; only client-side regex matching can discard them
+                n_results = k * post_filter_factor if regex_conditions else k
+                rows = self._unpack_query_result(
+                    collection.query(
                         query_embeddings=[query_embedding],
-                        n_results=k,
-                        where=normalized_filter if normalized_filter else None,
+                        n_results=n_results,
+                        where=normalized_filter,
                     )
-                else:
-                    # Metadata-only search using query with empty embedding
-                    # For regex support, we need to use query
-                    dummy_embedding = [0.0] * self.embedding_service.get_embedding_dimension()
-                    normalized_filter = self._normalize_metadata_filter(metadata_filter)
-                    results = collection.query(
-                        query_embeddings=[dummy_embedding],
-                        n_results=k * 10,  # Get more to filter
-                        where=normalized_filter if normalized_filter else None,
+                )
+                if regex_conditions:
+                    rows = (
+                        row for row in rows
+                        if self._matches_regex(row[2], regex_conditions)
                     )
             else:
-                # Metadata-only search (get all matching documents)
-                normalized_filter = self._normalize_metadata_filter(metadata_filter)
-                results = collection.get(where=normalized_filter if normalized_filter else None, limit=k)
-
-            # Process results
-            search_results = []
-            if results.get("ids") and len(results["ids"]) > 0:
-                ids = results["ids"][0] if isinstance(results["ids"][0], list) else results["ids"]
-                documents = (
-                    results["documents"][0]
-                    if isinstance(results["documents"][0], list)
-                    else results["documents"]
-                )
-                metadatas = (
-                    results["metadatas"][0]
-                    if isinstance(results["metadatas"][0], list)
-                    else results["metadatas"]
-                )
-                distances = (
-                    results["distances"][0]
-                    if "distances" in results and results["distances"]
-                    else [0.0] * len(ids)
-                )
-                if isinstance(distances, list) and len(distances) > 0 and isinstance(distances[0], list):
-                    distances = distances[0]
-
-                for doc_id, doc_text, metadata_dict, distance in zip(
-                    ids, documents, metadatas, distances
-                ):
-                    # Calculate similarity score (1 - distance for cosine similarity)
-                    score = 1.0 - distance if distance is not None else None
-
-                    # Apply score threshold if specified
-                    if score_threshold is not None and score is not None:
-                        if score < score_threshold:
-                            continue
-
-                    result = {
-                        "id": doc_id,
-                        "text": doc_text,
-                        "metadata": metadata_dict,
-                        "score": score,
-                        "distance": distance,
-                    }
-                    search_results.append(result)
-                
-                # Limit results if we got more than requested
-                search_results = search_results[:k]
+                # Metadata-only search: without a query text there is nothing
+                # to rank by, so read matching documents directly
+                rows = self._scan_metadata(collection, normalized_filter, regex_conditions, k)
+
+            search_results = self._build_results(rows, k, score_threshold)
 
             logger.debug(
                 f"Retrieved {len(search_results)} results for query: {query_text[:50] if query_text else 'metadata-only'}..."
@@ -326,6 +367,162 @@ class StructuredCodeRetriever:
             logger.error(f"Error in structured code retrieval: {e}")
             return []
 
+    @staticmethod
+    def _build_results(
+        rows: Iterator[Tuple[str, str, Dict, float]],
+        k: int,
+        score_threshold: Optional[float] = None,
+    ) -> List[Dict]:
+        """
+        Convert unpacked result rows to search result dictionaries.
+
+        Args:
+            rows: (id, document, metadata, distance) tuples
+            k: Maximum number of results
+            score_threshold: Optional similarity score threshold
+
+        Returns:
+            List of search result dictionaries
+        """
+        # Compare in distance space (score = 1 - distance) so rejected rows
+        # cost a single comparison
+        max_distance = 1.0 - score_threshold if score_threshold is not None else None
+
+        search_results = []
+        for doc_id, doc_text, metadata_dict, distance in rows:
+            if max_distance is not None and distance is not None and distance > max_distance:
+                continue
+
+            search_results.append(
+                {
+                    "id": doc_id,
+                    "text": doc_text,
+                    "metadata": metadata_dict,
+                    # Similarity score (1 - distance for cosine similarity)
+                    "score": 1.0 - distance if distance is not None else None,
+                    "distance": distance,
+                }
+            )
+            if len(search_results) == k:
+                break
+
+        return search_results
+
+    @staticmethod
+    def _unpack_query_result(
+        results: Dict, index: int = 0
+    ) -> Iterator[Tuple[str, str, Dict, float]]:
+        """
+        Iterate rows of a collection.query() result for one query embedding.
+
+        Args:
+            results: Result of collection.query() (one inner list per query)
+            index: Position of the query embedding in the request
+
+        Returns:
+            Iterator of (id, document, metadata, distance) tuples
+        """
+        if not results.get("ids"):
+            return iter(())
+        return zip(
+            results["ids"][index],
+            results["documents"][index],
+            results["metadatas"][index],
+            results["distances"][index],
+        )
+
+    @staticmethod
+    def _unpack_get_result(results: Dict) -> Iterator[Tuple[str, str, Dict, float]]:
+        """
+        Iterate rows of a collection.get() result.
+
+        get() has no ranking, so every row is reported with distance 0.0.
+
+        Args:
+            results: Result of collection.get() (flat lists)
+
+        Returns:
+            Iterator of (id, document, metadata, distance) tuples
+        """
+        ids = results.get("ids") or []
+        return zip(ids, results["documents"], results["metadatas"], [0.0] * len(ids))
+
+    @staticmethod
+    def _extract_regex_conditions(metadata_filter: Optional[Dict]) -> List[Tuple[str, Pattern]]:
+        """
+        Collect $regex conditions, which ChromaDB cannot evaluate on metadata.
+
+        Args:
+            metadata_filter: Raw metadata filter dictionary
+
+        Returns:
+            (metadata key, compiled pattern) pairs
+        """
+        if not metadata_filter:
+            return []
+
+        conditions = metadata_filter.get("$and", [metadata_filter])
+        return [
+            (key, re.compile(value["$regex"]))
+            for condition in conditions
+            for key, value in condition.items()
+            if _is_regex_condition(value)
+        ]
+
+    @staticmethod
+    def _matches_regex(
+        metadata: Optional[Dict], regex_conditions: List[Tuple[str, Pattern]]
+    ) -> bool:
+        """Check whether metadata satisfies all client-side $regex conditions."""
+        metadata = metadata or {}
+        return all(
+            pattern.search(str(metadata.get(key, ""))) for key, pattern in regex_conditions
+        )
+
+    @staticmethod
+    def _scan_metadata(
+        collection,
+        where: Optional[Dict],
+        regex_conditions: List[Tuple[str, Pattern]],
+        k: int,
+    ) -> Iterator[Tuple[str, str, Dict, float]]:
+        """
+        Iterate documents matching a metadata filter without a query embedding.
+
+        Without regex conditions this is a single get(limit=k). Otherwise
+        matches of the remaining conditions are paged through and filtered
+        client-side until k rows match.
+
+        Args:
+            collection: ChromaDB collection
+            where: Normalized (regex-free) where clause
+            regex_conditions: Conditions from _extract_regex_conditions
+            k: Number of rows to return
+
+        Returns:
+            Iterator of (id, document, metadata, distance) tuples
+        """
+        if not regex_conditions:
+            yield from StructuredCodeRetriever._unpack_get_result(
+                collection.get(where=where, limit=k)
+            )
+            return
+
+        matched = 0
+        offset = 0
+        while True:
+            page = collection.get(where=where, limit=METADATA_SCAN_PAGE_SIZE, offset=offset)
+            for row in StructuredCodeRetriever._unpack_get_result(page):
+                if StructuredCodeRetriever._matches_regex(row[2], regex_conditions):
+                    yield row
+                    matched += 1
+                    if matched >= k:
+                        return
+
+            if len(page.get("ids") or []) < METADATA_SCAN_PAGE_SIZE:
+                return
+            offset += METADATA_SCAN_PAGE_SIZE
+
     def _normalize_metadata_filter(self, metadata_filter: Optional[Dict]) -> Optional[Dict]:
         """
         Normalize metadata filter for ChromaDB compatibility.
@@ -334,7 +531,8 @@ class StructuredCodeRetriever:
         - Single condition: {"key": "value"}
         - Multiple conditions: {"$and": [{"key1": "value1"}, {"key2": "value2"}]}
         - Operators: $eq, $ne, $in, $nin, $gt, $gte, $lt, $lte
-        - No $regex in query() - need to use get() or filter after query
+        - No $regex on metadata - such conditions are dropped here and
+          matched client-side (see _extract_regex_conditions)
         
         Args:
             metadata_filter: Raw metadata filter dictionary
@@ -344,43 +542,31 @@ class StructuredCodeRetriever:
         """
         if not metadata_filter:
             return None
-        
-        # If already using $and, return as is
+
+        # Fast path: a single plain condition needs no rewriting
+        if len(metadata_filter) == 1 and "$and" not in metadata_filter:
+            (value,) = metadata_filter.values()
+            # ChromaDB doesn't support $regex; matched client-side
+            return None if _is_regex_condition(value) else metadata_filter
+
+        # $and list, or several conditions to convert to $and format,
+        # minus any $regex conditions
         if "$and" in metadata_filter:
-            return metadata_filter
-        
-        # If single condition, return as is
-        if len(metadata_filter) == 1:
-            key, value = next(iter(metadata_filter.items()))
-            # Check if value is a dict with operators
-            if isinstance(value, dict):
-                # Check for unsupported operators
-                if "$regex" in value:
-                    # ChromaDB doesn't support $regex in query()
-                    # Return None to skip filter, will filter manually
-                    logger.warning(f"$regex operator not supported in ChromaDB query(), will filter manually")
-                    return None
-                return metadata_filter
-            return metadata_filter
-        
-        # Multiple conditions - convert to $and format
-        conditions = []
-        for key, value in metadata_filter.items():
-            if isinstance(value, dict):
-                # Check for unsupported operators
-                if "$regex" in value:
-                    logger.warning(f"$regex operator not supported in ChromaDB query(), will filter manually")
-                    continue
-                conditions.append({key: value})
-            else:
-                conditions.append({key: value})
-        
+            conditions = [
+                condition
+                for condition in metadata_filter["$and"]
+                if not any(_is_regex_condition(value) for value in condition.values())
+            ]
+        else:
+            conditions = [
+                {key: value}
+                for key, value in metadata_filter.items()
+                if not _is_regex_condition(value)
+            ]
+
         if len(conditions) == 0:
             return None
-        elif len(conditions) == 1:
-            return conditions[0]
-        else:
-            return {"$and": conditions}
+        return conditions[0] if len(conditions) == 1 else {"$and": conditions}
 
     def find_code_references(
         self,
@@ -1,16 +1,166 @@
 """Vector store service for ChromaDB integration."""
 
+import hashlib
+import json
 import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import Any, Dict, List, Optional
 
-from backend.app.utils.chromadb_config import chromadb_config
+import numpy as np
+
+from backend.app.utils.chromadb_config import (
+    apply_sqlite_pragmas,
+    get_chromadb_config,
+    get_sqlite_connection,
+)
 
 logger = logging.getLogger(__name__)
 
+# Documents per collection.add() call in add_documents
+ADD_BATCH_SIZE = 200
+
+# Document IDs per collection.delete() call in delete_documents
+DELETE_BATCH_SIZE = 500
+
+# Log add_documents progress every this many sub-batches
+ADD_PROGRESS_LOG_INTERVAL = 50
+
+# Sub-batches with at least this many IDs are checked for already-stored IDs
+# first; below it the extra round-trip costs more than it saves
+EXISTING_ID_PROBE_MIN = 32
+
+# Maximum number of cached query results (0 disables the cache)
+VECTOR_QUERY_CACHE_SIZE = int(os.getenv("VECTOR_QUERY_CACHE_SIZE", "256"))
+
+# Seconds a cached query result stays valid; any write invalidates it sooner
+VECTOR_QUERY_CACHE_TTL = float(os.getenv("VECTOR_QUERY_CACHE_TTL", "60"))
+
+# Cosine similarity at which a cached single-embedding query answers a new
+# one (semantic cache, e.g. 0.95); values >= 1.0 disable it
+VECTOR_QUERY_CACHE_SIMILARITY = float(os.getenv("VECTOR_QUERY_CACHE_SIMILARITY", "1.0"))
+
+
+def _as_float32_matrix(embeddings) -> Optional[np.ndarray]:
+    """
+    Convert embeddings to one float32 matrix, ChromaDB's native format.
+
+    Returns:
+        (n, dim) float32 array, or None if there are no embeddings
+    """
+    if embeddings is None or len(embeddings) == 0:
+        return None
+    return np.asarray(embeddings, dtype=np.float32)
+
+
+def _copy_query_result(results: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a query result down to the metadata dicts so callers cannot alter the cache."""
+    copied = {}
+    for key, value in results.items():
+        if key == "metadatas" and value is not None:
+            copied[key] = [
+                [dict(metadata) if metadata else metadata for metadata in inner]
+                for inner in value
+            ]
+        elif isinstance(value, list):
+            copied[key] = [list(inner) if isinstance(inner, list) else inner for inner in value]
+        else:
+            copied[key] = value
+    return copied
+
+
+class _SemanticQueryCache:
+    """
+    Query results indexed by normalized query embedding.
+
+    Entries are grouped by scope (store, collection, filter and n_results);
+    a lookup returns the result of the most similar cached embedding in the
+    scope if its cosine similarity reaches the threshold. Each scope keeps
+    its embeddings in one float32 matrix so a lookup is a single product.
+    """
+
+    def __init__(self, max_size: int, ttl: float, threshold: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.threshold = threshold
+        # scope -> (embedding matrix, [(created_at, results)], next slot)
+        self._scopes: Dict[str, list] = {}
+        self._generation = VectorService.write_generation
+        self._lock = threading.Lock()
+
+    def _check_generation(self):
+        """Drop every entry once any write happened (called with the lock held)."""
+        if self._generation != VectorService.write_generation:
+            self._scopes.clear()
+            self._generation = VectorService.write_generation
+
+    def get(self, scope: str, embedding: np.ndarray) -> Optional[Dict[str, Any]]:
+        """Return the cached result for a similar query, or None."""
+        with self._lock:
+            self._check_generation()
+            entry = self._scopes.get(scope)
+            if entry is None:
+                return None
+            matrix, results, _ = entry
+            if matrix.shape[1] != embedding.shape[0]:
+                return None
+
+            similarities = matrix[: len(results)] @ embedding
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+
+            created_at, cached = results[best]
+            if time.monotonic() - created_at >= self.ttl:
+                # Zeroed rows never reach a positive threshold again
+                matrix[best] = 0.0
+                return None
+            return cached
+
+    def put(self, scope: str, embedding: np.ndarray, results: Dict[str, Any], generation: int):
+        """Cache a result, replacing the oldest entry of a full scope."""
+        with self._lock:
+            self._check_generation()
+            if generation != self._generation:
+                return
+
+            entry = self._scopes.get(scope)
+            if entry is None or entry[0].shape[1] != embedding.shape[0]:
+                matrix = np.zeros((self.max_size, embedding.shape[0]), dtype=np.float32)
+                entry = self._scopes[scope] = [matrix, [], 0]
+            matrix, cached, slot = entry
+
+            matrix[slot] = embedding
+            if slot < len(cached):
+                cached[slot] = (time.monotonic(), results)
+            else:
+                cached.append((time.monotonic(), results))
+            entry[2] = (slot + 1) % self.max_size
+
 
 class VectorService:
     """Service for managing vector storage with ChromaDB."""
 
+    # Bumped on every write through any instance; caches of collection
+    # contents compare against it to detect stale data
+    write_generation = 0
+
+    # Collection handles shared by all instances, keyed by (persist directory,
+    # collection name); entries are dropped when the collection is deleted
+    _collections: Dict[tuple, Any] = {}
+    _collections_lock = threading.Lock()
+
+    # Recent query results shared by all instances, see query()
+    _query_cache: "OrderedDict[str, tuple]" = OrderedDict()
+    _query_cache_lock = threading.Lock()
+
+    # Similar-query cache shared by all instances, created on first use
+    _semantic_cache: Optional[_SemanticQueryCache] = None
+
     def __init__(self, config=None):
         """
         Initialize ChromaDB client.
@@ -18,7 +168,7 @@ class VectorService:
         Args:
             config: Optional ChromaDBConfig instance. If None, uses global config.
         """
-        self.config = config or chromadb_config
+        self.config = config or get_chromadb_config()
         self.client = self.config.get_client()
         self.collection_names = self.config.get_collection_names()
 
@@ -26,6 +176,63 @@ class VectorService:
             f"Initialized ChromaDB client at {self.config.persist_directory}"
         )
 
+    @classmethod
+    def mark_modified(cls):
+        """Record that stored documents changed, invalidating dependent caches."""
+        cls.write_generation += 1
+
+    @contextmanager
+    def bulk_load(self):
+        """
+        Relax SQLite durability on the ChromaDB store for a bulk ingest.
+
+        Sets `synchronous=OFF` and `journal_mode=MEMORY` for the duration of the
+        block, then restores the previous settings. Writes skip fsync while
+        inside the block, so a crash during a bulk load can leave the store
+        corrupted and require a full re-index.
+
+        Only ChromaDB releases with the Python SQLite backend expose the
+        connection needed for this; on Rust-backed releases (1.x) the block
+        runs with the store's default settings and a warning is logged.
+        """
+        if get_sqlite_connection(self.client) is None:
+            logger.warning(
+                "Bulk load mode unavailable: this ChromaDB release doesn't expose "
+                "its SQLite connection, so store settings are left unchanged"
+            )
+            yield
+            return
+
+        previous = apply_sqlite_pragmas(
+            self.client, {"synchronous": "OFF", "journal_mode": "MEMORY"}
+        )
+        if previous:
+            logger.info("Bulk load mode enabled for ChromaDB store")
+        try:
+            yield
+        finally:
+            if previous:
+                apply_sqlite_pragmas(self.client, previous)
+                logger.info("Bulk load mode disabled for ChromaDB store")
+
+    def get_collection_distance_space(self, collection_name: str) -> str:
+        """
+        Get the HNSW distance space a collection was created with.
+
+        Args:
+            collection_name: Name of the collection
+
+        Returns:
+            "l2", "cosine" or "ip"
+        """
+        collection = self.get_or_create_collection(collection_name)
+        space = (collection.metadata or {}).get("hnsw:space")
+        if space is None:
+            # Newer ChromaDB releases record it in the collection configuration
+            configuration = getattr(collection, "configuration", None) or {}
+            space = (configuration.get("hnsw") or {}).get("space")
+        return space or "l2"
+
     def get_collection_embedding_dimension(self, collection_name: str) -> Optional[int]:
         """
         Get the embedding dimension expected by a collection.
@@ -79,25 +286,39 @@ class VectorService:
         """
         Get or create a ChromaDB collection.
 
+        New collections get the config's HNSW settings, overridden by any
+        given metadata. Existing collections are opened as stored, since
+        their distance space and graph parameters can't change.
+
         Args:
             name: Collection name
             metadata: Optional metadata for the collection.
                     Pass None (not empty dict) if no metadata needed.
 
         Returns:
-            ChromaDB collection object
+            ChromaDB collection object (cached after the first call)
         """
-        try:
-            # ChromaDB requires None instead of empty dict for no metadata
-            collection = self.client.get_or_create_collection(
-                name=name, metadata=metadata if metadata else None
-            )
-            logger.info(f"Collection '{name}' ready")
+        key = (str(self.config.persist_directory), name)
+        collection = self._collections.get(key)
+        if collection is not None:
             return collection
+
+        try:
+            if any(col.name == name for col in self.client.list_collections()):
+                collection = self.client.get_collection(name=name)
+            else:
+                collection = self.client.get_or_create_collection(
+                    name=name, metadata={**self.config.hnsw_config, **(metadata or {})}
+                )
         except Exception as e:
             logger.error(f"Error creating collection '{name}': {e}")
             raise
 
+        with self._collections_lock:
+            collection = self._collections.setdefault(key, collection)
+        logger.info(f"Collection '{name}' ready")
+        return collection
+
     def add_documents(
         self,
         collection_name: str,
@@ -105,37 +326,79 @@ class VectorService:
         ids: List[str],
         metadatas: Optional[List[Dict[str, Any]]] = None,
         embeddings: Optional[List[List[float]]] = None,
+        batch_size: int = ADD_BATCH_SIZE,
     ):
         """
         Add documents to a collection.
 
+        Inputs are written in sub-batches of batch_size documents, one
+        collection.add() call each. IDs already in the collection are
+        skipped (ChromaDB would ignore them anyway, after embedding them).
+
         Args:
             collection_name: Name of the collection
             documents: List of document texts
             ids: List of document IDs
             metadatas: Optional list of metadata dictionaries
             embeddings: Optional pre-computed embeddings
+            batch_size: Documents per collection.add() call
         """
+        if not ids:
+            return
+
         collection = self.get_or_create_collection(collection_name)
 
+        # Converted once; each sub-batch below is a view, not a copy
+        embeddings = _as_float32_matrix(embeddings)
+
+        added = 0
+        skipped = 0
         try:
-            if embeddings:
-                collection.add(
-                    documents=documents,
-                    ids=ids,
-                    metadatas=metadatas,
-                    embeddings=embeddings,
-                )
-            else:
-                collection.add(
-                    documents=documents,
-                    ids=ids,
-                    metadatas=metadatas,
-                )
-            logger.info(f"Added {len(documents)} documents to '{collection_name}'")
+            for batch_number, start in enumerate(range(0, len(ids), batch_size), 1):
+                end = start + batch_size
+                batch_ids = ids[start:end]
+                batch_documents = documents[start:end]
+                batch_metadatas = metadatas[start:end] if metadatas else None
+                batch_embeddings = embeddings[start:end] if embeddings is not None else None
+
+                if len(batch_ids) >= EXISTING_ID_PROBE_MIN:
+                    existing = set(collection.get(ids=batch_ids, include=[])["ids"])
+                    if existing:
+                        keep = [i for i, doc_id in enumerate(batch_ids) if doc_id not in existing]
+                        skipped += len(batch_ids) - len(keep)
+                        batch_ids = [batch_ids[i] for i in keep]
+                        batch_documents = [batch_documents[i] for i in keep]
+                        if batch_metadatas is not None:
+                            batch_metadatas = [batch_metadatas[i] for i in keep]
+                        if batch_embeddings is not None:
+                            batch_embeddings = batch_embeddings[keep]
+
+                if batch_ids:
+                    collection.add(
+                        documents=batch_documents,
+                        ids=batch_ids,
+                        metadatas=batch_metadatas,
+                        embeddings=batch_embeddings,
+                    )
+                added += len(batch_ids)
+
+                if batch_number % ADD_PROGRESS_LOG_INTERVAL == 0:
+                    logger.info(
+                        f"Added {added + skipped}/{len(ids)} documents to '{collection_name}'"
+                    )
+
+            logger.info(
+                f"Added {added} documents to '{collection_name}'"
+                + (f" (skipped {skipped} already stored)" if skipped else "")
+            )
         except Exception as e:
-            logger.error(f"Error adding documents to '{collection_name}': {e}")
+            logger.error(
+                f"Error adding documents to '{collection_name}' after {added} documents: {e}"
+            )
             raise
+        finally:
+            if added:
+                self.mark_modified()
 
     def query(
         self,
@@ -157,11 +420,38 @@ class VectorService:
 
         Returns:
             Query results
+
+        Identical queries repeated within VECTOR_QUERY_CACHE_TTL seconds, with
+        no write through any VectorService in between, are served from memory.
+        If VECTOR_QUERY_CACHE_SIMILARITY is below 1.0, so are single-embedding
+        queries whose embedding is at least that cosine-similar to a cached one.
         """
+        query_embeddings = _as_float32_matrix(query_embeddings)
+        if query_embeddings is None and not query_texts:
+            return {"ids": [[]], "distances": [[]], "documents": [[]], "metadatas": [[]]}
+
+        cache_key = self._query_cache_key(
+            collection_name, query_texts, query_embeddings, n_results, where
+        )
+        cached = self._get_cached_query(cache_key)
+        if cached is not None:
+            logger.debug(f"Query on '{collection_name}' served from cache")
+            return cached
+
+        semantic = self._semantic_lookup(collection_name, query_embeddings, n_results, where)
+        if semantic is not None:
+            semantic_cache, scope, normalized = semantic
+            cached = semantic_cache.get(scope, normalized)
+            if cached is not None:
+                logger.debug(f"Query on '{collection_name}' served from semantic cache")
+                return _copy_query_result(cached)
+        # Taken before querying so a concurrent write leaves the entry stale
+        generation = VectorService.write_generation
+
         collection = self.get_or_create_collection(collection_name)
 
         try:
-            if query_embeddings:
+            if query_embeddings is not None:
                 results = collection.query(
                     query_embeddings=query_embeddings,
                     n_results=n_results,
@@ -174,13 +464,188 @@ class VectorService:
                     where=where,
                 )
             logger.info(
-                f"Query on '{collection_name}' returned {len(results.get('ids', [[]])[0])} results"
+                f"Query on '{collection_name}' returned {len(results['ids'][0])} results"
             )
+            self._put_cached_query(cache_key, generation, results)
+            if semantic is not None:
+                semantic_cache.put(scope, normalized, _copy_query_result(results), generation)
             return results
         except Exception as e:
             logger.error(f"Error querying '{collection_name}': {e}")
             raise
 
+    def batch_query(
+        self,
+        collection_name: str,
+        query_embeddings: List[List[float]],
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        max_workers: int = 4,
+    ) -> List[Dict[str, Any]]:
+        """
+        Run independent single-embedding queries concurrently.
+
+        Cached queries are answered up front; the rest run on a thread pool
+        (ChromaDB's HNSW search releases the GIL) sharing one collection handle.
+
+        Args:
+            collection_name: Name of the collection
+            query_embeddings: Query embeddings, one query each
+            n_results: Number of results per query
+            where: Optional metadata filter applied to every query
+            max_workers: Maximum number of concurrent queries
+
+        Returns:
+            One query result per embedding, in input order
+        """
+        query_embeddings = _as_float32_matrix(query_embeddings)
+        if query_embeddings is None:
+            return []
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(query_embeddings)
+        misses = []
+        for position in range(len(query_embeddings)):
+            cache_key = self._query_cache_key(
+                collection_name, None, query_embeddings[position:position + 1], n_results, where
+            )
+            results[position] = self._get_cached_query(cache_key)
+            if results[position] is None:
+                misses.append(position)
+
+        if misses:
+            # Resolve the handle once before the threads share it
+            self.get_or_create_collection(collection_name)
+
+            def run(position: int) -> Dict[str, Any]:
+                return self.query(
+                    collection_name,
+                    query_embeddings=query_embeddings[position:position + 1],
+                    n_results=n_results,
+                    where=where,
+                )
+
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(misses))) as executor:
+                for position, result in zip(misses, executor.map(run, misses)):
+                    results[position] = result
+
+        logger.debug(
+            f"Batch query on '{collection_name}': {len(query_embeddings)} queries, "
+            f"{len(query_embeddings) - len(misses)} cached"
+        )
+        return results
+
+    def _query_scope(
+        self, collection_name: str, n_results: int, where: Optional[Dict[str, Any]]
+    ) -> str:
+        """Identify everything but the query itself (store, collection, size, filter)."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(
+            f"{self.config.persist_directory}\0{collection_name}\0{n_results}\0".encode("utf-8")
+        )
+        digest.update(json.dumps(where, sort_keys=True, default=str).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _semantic_lookup(
+        self,
+        collection_name: str,
+        query_embeddings: Optional[np.ndarray],
+        n_results: int,
+        where: Optional[Dict[str, Any]],
+    ):
+        """
+        Prepare a semantic cache lookup for a single-embedding query.
+
+        Returns:
+            (cache, scope, normalized embedding), or None if the semantic
+            cache is disabled or doesn't apply
+        """
+        if (
+            VECTOR_QUERY_CACHE_SIMILARITY >= 1.0
+            or VECTOR_QUERY_CACHE_SIZE <= 0
+            or query_embeddings is None
+            or len(query_embeddings) != 1
+        ):
+            return None
+
+        embedding = query_embeddings[0]
+        norm = float(np.linalg.norm(embedding))
+        if norm == 0.0:
+            return None
+
+        if VectorService._semantic_cache is None:
+            with self._query_cache_lock:
+                if VectorService._semantic_cache is None:
+                    VectorService._semantic_cache = _SemanticQueryCache(
+                        VECTOR_QUERY_CACHE_SIZE,
+                        VECTOR_QUERY_CACHE_TTL,
+                        VECTOR_QUERY_CACHE_SIMILARITY,
+                    )
+        scope = self._query_scope(collection_name, n_results, where)
+        return VectorService._semantic_cache, scope, embedding / norm
+
+    def _query_cache_key(
+        self,
+        collection_name: str,
+        query_texts: Optional[List[str]],
+        query_embeddings: Optional[List[List[float]]],
+        n_results: int,
+        where: Optional[Dict[str, Any]],
+    ) -> Optional[str]:
+        """
+        Build the query cache key, or None if caching is disabled.
+
+        Embeddings are hashed as float32 bytes and the where clause as
+        canonical JSON, so equal queries map to the same key.
+        """
+        if VECTOR_QUERY_CACHE_SIZE <= 0:
+            return None
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self._query_scope(collection_name, n_results, where).encode("utf-8"))
+        query_embeddings = _as_float32_matrix(query_embeddings)
+        if query_embeddings is not None:
+            digest.update(f"\0e{query_embeddings.shape}".encode("utf-8"))
+            digest.update(query_embeddings.tobytes())
+        else:
+            for text in query_texts or []:
+                digest.update(b"\0t")
+                digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _get_cached_query(self, cache_key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return a copy of a fresh cached query result, if any."""
+        if cache_key is None:
+            return None
+
+        with self._query_cache_lock:
+            entry = self._query_cache.get(cache_key)
+            if entry is None:
+                return None
+            created_at, generation, results = entry
+            if (
+                generation != VectorService.write_generation
+                or time.monotonic() - created_at >= VECTOR_QUERY_CACHE_TTL
+            ):
+                del self._query_cache[cache_key]
+                return None
+            self._query_cache.move_to_end(cache_key)
+
+        return _copy_query_result(results)
+
+    def _put_cached_query(
+        self, cache_key: Optional[str], generation: int, results: Dict[str, Any]
+    ):
+        """Store a copy of a query result, tagged with the write generation it reflects."""
+        if cache_key is None:
+            return
+
+        entry = (time.monotonic(), generation, _copy_query_result(results))
+        with self._query_cache_lock:
+            self._query_cache[cache_key] = entry
+            self._query_cache.move_to_end(cache_key)
+            while len(self._query_cache) > VECTOR_QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+
     def delete_collection(self, name: str):
         """
         Delete a collection.
@@ -188,8 +653,12 @@ class VectorService:
         Args:
             name: Collection name
         """
+        with self._collections_lock:
+            self._collections.pop((str(self.config.persist_directory), name), None)
+
         try:
             self.client.delete_collection(name=name)
+            self.mark_modified()
             logger.info(f"Deleted collection '{name}'")
         except Exception as e:
             logger.error(f"Error deleting collection '{name}': {e}")
@@ -237,13 +706,38 @@ class VectorService:
             collection_name: Name of the collection
             doc_id: Document ID to delete
         """
+        self.delete_documents(collection_name, [doc_id])
+        logger.info(f"Deleted document '{doc_id}' from '{collection_name}'")
+
+    def delete_documents(
+        self, collection_name: str, doc_ids: List[str], batch_size: int = DELETE_BATCH_SIZE
+    ):
+        """
+        Delete many documents from a collection.
+
+        Issues one collection.delete() per batch_size ids instead of one per id.
+
+        Args:
+            collection_name: Name of the collection
+            doc_ids: Document IDs to delete
+            batch_size: IDs per collection.delete() call
+        """
+        if not doc_ids:
+            return
+
+        deleted = 0
         try:
             collection = self.get_or_create_collection(collection_name)
-            collection.delete(ids=[doc_id])
-            logger.info(f"Deleted document '{doc_id}' from '{collection_name}'")
+            for start in range(0, len(doc_ids), batch_size):
+                batch = doc_ids[start:start + batch_size]
+                collection.delete(ids=batch)
+                deleted += len(batch)
+            logger.debug(f"Deleted {deleted} documents from '{collection_name}'")
         except Exception as e:
             logger.error(
-                f"Error deleting document '{doc_id}' from '{collection_name}': {e}"
+                f"Error deleting documents from '{collection_name}' after {deleted} deletions: {e}"
             )
             raise
-
+        finally:
+            if deleted:
+                self.mark_modified()
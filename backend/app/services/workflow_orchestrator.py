@@ -7,6 +7,9 @@ from backend.app.services.note_generation_service import NoteGenerationService
 
 logger = logging.getLogger(__name__)
 
+# Mode prefixes recognized at the start of a query
+_MODE_PREFIXES = ("/new", "/ask", "/enhance")
+
 
 class WorkflowOrchestrator:
     """
@@ -48,31 +51,12 @@ class WorkflowOrchestrator:
         """
         query = query.strip()
 
-        # Check for /new mode
-        if query.startswith("/new"):
-            actual_query = query[4:].strip()
-            if actual_query:
-                return "/new", actual_query
-            else:
-                logger.warning("Empty query after /new, using default mode")
-                return "default", query
-
-        # Check for /ask mode
-        if query.startswith("/ask"):
-            actual_query = query[4:].strip()
-            if actual_query:
-                return "/ask", actual_query
-            else:
-                logger.warning("Empty query after /ask, using default mode")
-                return "default", query
-
-        # Check for /enhance mode
-        if query.startswith("/enhance"):
-            actual_query = query[8:].strip()
-            if actual_query:
-                return "/enhance", actual_query
-            else:
-                logger.warning("Empty query after /enhance, using default mode")
+        for mode in _MODE_PREFIXES:
+            if query.startswith(mode):
+                actual_query = query[len(mode):].strip()
+                if actual_query:
+                    return mode, actual_query
+                logger.warning(f"Empty query after {mode}, using default mode")
                 return "default", query
 
         # Default mode: try to infer from context
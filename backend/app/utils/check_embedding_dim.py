@@ -1,5 +1,6 @@
 """Tool to check and diagnose embedding dimension mismatches."""
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 project_root = Path(__file__).parent
@@ -32,16 +33,20 @@ def check_embedding_dimensions():
     print(f"\nChecking {len(collections)} collection(s)...")
     print("-" * 80)
     
+    # Probe collections concurrently; each probe is an independent read
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(collections)))) as executor:
+        dimensions = list(executor.map(vs.get_collection_embedding_dimension, collections))
+    spaces = [vs.get_collection_distance_space(name) for name in collections]
+    
     all_match = True
-    for collection_name in collections:
-        coll_dim = vs.get_collection_embedding_dimension(collection_name)
+    for collection_name, coll_dim, space in zip(collections, dimensions, spaces):
         if coll_dim is None:
-            print(f"  {collection_name}: Empty collection (no dimension check needed)")
+            print(f"  {collection_name}: Empty collection (no dimension check needed), space={space}")
             continue
         
         match = coll_dim == current_dim
         status = "✅ MATCH" if match else "❌ MISMATCH"
-        print(f"  {collection_name}: {coll_dim}D {status}")
+        print(f"  {collection_name}: {coll_dim}D space={space} {status}")
         
         if not match:
             all_match = False
@@ -49,6 +54,11 @@ def check_embedding_dimensions():
     
     print("-" * 80)
     
+    if len(set(spaces)) > 1:
+        print("\n⚠️  Collections use different distance spaces: " + ", ".join(sorted(set(spaces))))
+        print("   Similarity scores and score thresholds are not comparable across them.")
+        print("   Set CHROMA_HNSW_SPACE consistently in .env and re-index to unify them.")
+    
     if all_match:
         print("\n✅ All collections match current embedding model dimension!")
     else:
@@ -2,8 +2,10 @@
 
 import logging
 import os
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 
 import chromadb
 from chromadb.config import Settings
@@ -16,6 +18,10 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# PersistentClients by persist directory, shared across ChromaDBConfig instances
+_clients: Dict[str, Any] = {}
+_clients_lock = threading.Lock()
+
 
 class ChromaDBConfig:
     """Configuration manager for ChromaDB."""
@@ -53,7 +59,6 @@ class ChromaDBConfig:
                 persist_directory = BASE_DIR / persist_directory
 
         self.persist_directory = Path(persist_directory)
-        self.persist_directory.mkdir(parents=True, exist_ok=True)
 
         self.anonymized_telemetry = anonymized_telemetry
 
@@ -63,19 +68,45 @@ class ChromaDBConfig:
         )
         self.notes_collection = os.getenv("CHROMA_NOTES_COLLECTION", "notes")
 
+        # HNSW index settings for new collections; M and construction_ef are
+        # fixed once a collection exists. The distance space stays ChromaDB's
+        # default (l2) unless CHROMA_HNSW_SPACE is set, so collections created
+        # before and after a change don't silently score differently.
+        self.hnsw_config = {
+            "hnsw:M": int(os.getenv("CHROMA_HNSW_M", "32")),
+            "hnsw:construction_ef": int(os.getenv("CHROMA_HNSW_CONSTRUCTION_EF", "200")),
+            "hnsw:search_ef": int(os.getenv("CHROMA_HNSW_SEARCH_EF", "64")),
+        }
+        hnsw_space = os.getenv("CHROMA_HNSW_SPACE")
+        if hnsw_space:
+            self.hnsw_config["hnsw:space"] = hnsw_space
+
         logger.info(f"ChromaDB config initialized: persist_dir={self.persist_directory}")
 
     def get_client(self) -> chromadb.Client:
         """
         Get ChromaDB client instance.
 
+        One client is created per persist directory and reused by every
+        config pointing there, since opening one re-opens the SQLite store
+        and reloads the HNSW indexes.
+
         Returns:
             ChromaDB PersistentClient instance
         """
-        return chromadb.PersistentClient(
-            path=str(self.persist_directory),
-            settings=Settings(anonymized_telemetry=self.anonymized_telemetry),
-        )
+        path = str(self.persist_directory.resolve())
+        client = _clients.get(path)
+        if client is None:
+            with _clients_lock:
+                client = _clients.get(path)
+                if client is None:
+                    self.persist_directory.mkdir(parents=True, exist_ok=True)
+                    client = chromadb.PersistentClient(
+                        path=path,
+                        settings=Settings(anonymized_telemetry=self.anonymized_telemetry),
+                    )
+                    _clients[path] = client
+        return client
 
     def get_collection_names(self) -> dict[str, str]:
         """
@@ -90,6 +121,67 @@ class ChromaDBConfig:
         }
 
 
-# Global ChromaDB configuration instance
-chromadb_config = ChromaDBConfig()
+def get_sqlite_connection(client) -> Optional[Any]:
+    """
+    Get the SQLite connection backing a ChromaDB PersistentClient.
+
+    This relies on ChromaDB internals (the Python SqliteDB component), so it
+    returns None for clients that don't expose one, e.g. Rust-backed releases.
+
+    Args:
+        client: ChromaDB client instance
+
+    Returns:
+        SQLite connection for the current thread, or None if unavailable
+    """
+    try:
+        from chromadb.db.impl.sqlite import SqliteDB
+
+        for component in client._system.components():
+            if isinstance(component, SqliteDB):
+                return component._conn_pool.connect()
+    except Exception as e:
+        logger.debug(f"ChromaDB SQLite connection not available: {e}")
+    return None
+
+
+def apply_sqlite_pragmas(client, pragmas: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Apply SQLite PRAGMAs to the store behind a ChromaDB client.
+
+    Best effort: PRAGMAs that can't be read or set are skipped.
+
+    Args:
+        client: ChromaDB client instance
+        pragmas: Mapping of PRAGMA name to value
+
+    Returns:
+        Previous values of the PRAGMAs that were applied, suitable for
+        passing back to this function to restore them
+    """
+    conn = get_sqlite_connection(client)
+    if conn is None:
+        return {}
+
+    previous = {}
+    for name, value in pragmas.items():
+        try:
+            row = conn.execute(f"PRAGMA {name}").fetchone()
+            conn.execute(f"PRAGMA {name} = {value}")
+            if row is not None:
+                previous[name] = row[0]
+        except Exception as e:
+            logger.debug(f"Could not apply PRAGMA {name}={value}: {e}")
+    return previous
+
+
+@lru_cache(maxsize=1)
+def get_chromadb_config() -> ChromaDBConfig:
+    """
+    Get the global ChromaDB configuration, created on first use.
+
+    Returns:
+        Shared ChromaDBConfig instance
+    """
+    return ChromaDBConfig()
 
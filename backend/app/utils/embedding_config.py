@@ -115,6 +115,8 @@ class EmbeddingConfig:
                 )
             self.model_name = model_name_env
             self.device = os.getenv("EMBEDDING_DEVICE", "auto")
+            # Model weight precision: float32, float16 or bfloat16 (GPU only)
+            self.dtype = os.getenv("EMBEDDING_DTYPE", "float32").lower()
             # Get dimension from mapping or use default
             self.dimension = self._get_model_dimension(self.model_name)
         elif self.provider == EmbeddingProvider.ZHIPU:
@@ -13,6 +13,32 @@ RESOURCES_DIR = BASE_DIR / "resources"
 CHROMA_DB_DIR = BASE_DIR / "chroma_db"
 
 
+def posix_path_str(file_path) -> str:
+    """
+    Render a path with forward slashes, as note paths are stored and compared.
+
+    Args:
+        file_path: File path (str or Path), with either separator style
+
+    Returns:
+        Path string using "/" as the separator
+    """
+    return str(file_path).replace("\\", "/")
+
+
+def note_id_from_path(file_path) -> str:
+    """
+    Derive a note ID from a note file path.
+
+    Args:
+        file_path: Note file path (str or Path), with either separator style
+
+    Returns:
+        Path with forward slashes and without the .md extension
+    """
+    return posix_path_str(file_path).removesuffix(".md")
+
+
 def ensure_directories():
     """Ensure all required directories exist."""
     directories = [NOTES_DIR, RESOURCES_DIR, CHROMA_DB_DIR]
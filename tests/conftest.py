@@ -0,0 +1,43 @@
+"""Shared pytest setup and fixtures."""
+
+import os
+import tempfile
+from unittest.mock import MagicMock
+
+import pytest
+
+# Module-level config in the backend reads these at import time
+os.environ.setdefault("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+os.environ.setdefault("CHROMA_DB_DIR", tempfile.mkdtemp(prefix="chroma_test_"))
+
+from backend.app.services.embedding_service import EmbeddingService  # noqa: E402
+from backend.app.services.vector_service import VectorService  # noqa: E402
+from backend.app.utils.chromadb_config import ChromaDBConfig  # noqa: E402
+
+
+@pytest.fixture
+def vector_service(tmp_path):
+    """VectorService backed by a fresh on-disk ChromaDB store."""
+    service = VectorService(config=ChromaDBConfig(persist_directory=str(tmp_path / "chroma")))
+    yield service
+    with VectorService._query_cache_lock:
+        VectorService._query_cache.clear()
+    VectorService._semantic_cache = None
+    with VectorService._collections_lock:
+        VectorService._collections.clear()
+
+
+@pytest.fixture
+def embedding_service():
+    """EmbeddingService stand-in producing small deterministic embeddings."""
+    service = MagicMock(spec=EmbeddingService)
+    service.model_name = "fake-model"
+    service.dtype = "float32"
+
+    def embed(text):
+        return [float(len(text)), float(sum(map(ord, text)) % 97), 1.0]
+
+    service.embed_text.side_effect = embed
+    service.embed_texts.side_effect = lambda texts, **kwargs: [embed(t) for t in texts]
+    service.get_embedding_dimension.return_value = 3
+    return service
@@ -0,0 +1,46 @@
+"""Helpers for building test data."""
+
+from typing import List
+
+from backend.app.models.metadata import DocType, DocumentMetadata, SourceType
+from backend.app.services.vector_service import VectorService
+
+
+def store_notes(
+    vector_service: VectorService,
+    collection_name: str,
+    count: int,
+    chunks_per_note: int = 2,
+    tags: str = "#topic",
+) -> List[str]:
+    """
+    Store `count` notes as chunked documents, the way note vectorization does.
+
+    Returns:
+        doc_ids of the stored notes, in order
+    """
+    doc_ids, ids, texts, metadatas, embeddings = [], [], [], [], []
+    for i in range(count):
+        doc_id = f"note-{i:04d}"
+        doc_ids.append(doc_id)
+        for chunk_index in range(chunks_per_note):
+            metadata = DocumentMetadata(
+                doc_id=doc_id,
+                doc_type=DocType.NOTE,
+                file_path=f"/vault/note-{i:04d}.md",
+                title=f"Note {i}",
+                created_at="2024-01-01T00:00:00",
+                tags=tags.split(","),
+                source=SourceType.NOTE,
+                chunk_index=chunk_index,
+                chunk_total=chunks_per_note,
+            )
+            ids.append(f"{doc_id}_chunk_{chunk_index}")
+            texts.append(f"note {i} chunk {chunk_index}")
+            metadatas.append(metadata.to_chromadb_metadata())
+            embeddings.append([float(i), float(chunk_index), 1.0])
+
+    vector_service.add_documents(
+        collection_name, documents=texts, ids=ids, metadatas=metadatas, embeddings=embeddings
+    )
+    return doc_ids
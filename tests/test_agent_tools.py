@@ -0,0 +1,124 @@
+"""Tests for the per-note cache in AgentTools."""
+
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.app.models.metadata import NoteMetadata
+from backend.app.services.agent_tools import AgentTools
+from backend.app.services.embedding_service import EmbeddingService
+from backend.app.services.note_file_service import NoteFileService
+from backend.app.services.note_metadata_service import NoteMetadataService
+from backend.app.services.vector_service import VectorService
+
+
+def _note(note_id: str) -> NoteMetadata:
+    now = datetime(2024, 1, 1)
+    return NoteMetadata(
+        note_id=note_id,
+        title=note_id.title(),
+        file_path=f"{note_id}.md",
+        created_at=now,
+        updated_at=now,
+        tags=["#tag"],
+        links=["other"],
+    )
+
+
+@pytest.fixture
+def tools():
+    metadata_service = MagicMock(spec=NoteMetadataService)
+    metadata_service.get_note_metadata.side_effect = _note
+    metadata_service.get_note_metadata_by_ids.side_effect = lambda ids: {
+        note_id: _note(note_id) for note_id in ids
+    }
+    metadata_service.get_linked_notes.side_effect = lambda note_id: [_note("other")]
+
+    file_service = MagicMock(spec=NoteFileService)
+    file_service.read_note.side_effect = lambda path: ("Title", {}, f"content of {path}")
+
+    return AgentTools(
+        note_metadata_service=metadata_service,
+        note_file_service=file_service,
+        vector_service=MagicMock(spec=VectorService),
+        embedding_service=MagicMock(spec=EmbeddingService),
+    )
+
+
+def test_get_note_metadata_is_cached(tools):
+    first = tools.get_note_metadata("a")
+    second = tools.get_note_metadata("a")
+
+    assert first == second
+    assert first["note_id"] == "a"
+    assert tools.note_metadata_service.get_note_metadata.call_count == 1
+
+
+def test_get_linked_notes_is_cached(tools):
+    first = tools.get_linked_notes("a")
+    second = tools.get_linked_notes("a")
+
+    assert first == second == [
+        {"note_id": "other", "title": "Other", "file_path": "other.md", "tags": ["#tag"]}
+    ]
+    assert tools.note_metadata_service.get_linked_notes.call_count == 1
+
+
+def test_read_note_content_is_cached(tools):
+    assert tools.read_note_content("a") == "content of a.md"
+    assert tools.read_note_content("a") == "content of a.md"
+    assert tools.note_file_service.read_note.call_count == 1
+
+
+def test_get_notes_metadata_batches_and_caches(tools):
+    first = tools.get_notes_metadata(["a", "b", "a"])
+    second = tools.get_notes_metadata(["a", "b"])
+
+    assert set(first) == {"a", "b"}
+    assert first == second
+    tools.note_metadata_service.get_note_metadata_by_ids.assert_called_once_with(["a", "b"])
+
+
+def test_read_note_contents_batches_and_caches(tools):
+    first = tools.read_note_contents(["a", "b"])
+    second = tools.read_note_contents(["a", "b"])
+
+    assert first == second == {"a": "content of a.md", "b": "content of b.md"}
+    tools.note_metadata_service.get_note_metadata_by_ids.assert_called_once_with(["a", "b"])
+    assert tools.note_file_service.read_note.call_count == 2
+
+
+def test_batch_and_single_lookups_share_the_cache(tools):
+    tools.get_notes_metadata(["a"])
+    tools.get_note_metadata("a")
+    tools.read_note_content("b")
+    tools.read_note_contents(["b"])
+
+    tools.note_metadata_service.get_note_metadata.assert_called_once_with("b")
+    tools.note_metadata_service.get_note_metadata_by_ids.assert_called_once_with(["a"])
+
+
+def test_cached_results_are_copies(tools):
+    tools.get_note_metadata("a")["title"] = "changed"
+    tools.get_linked_notes("a")[0]["title"] = "changed"
+
+    assert tools.get_note_metadata("a")["title"] == "A"
+    assert tools.get_linked_notes("a")[0]["title"] == "Other"
+
+
+def test_expired_entries_are_refetched(tools, monkeypatch):
+    monkeypatch.setattr("backend.app.services.agent_tools.NOTE_CACHE_TTL", 0)
+
+    tools.get_note_metadata("a")
+    tools.get_note_metadata("a")
+
+    assert tools.note_metadata_service.get_note_metadata.call_count == 2
+
+
+def test_clear_note_cache(tools):
+    tools.get_note_metadata("a")
+    tools.clear_note_cache()
+    tools.get_note_metadata("a")
+
+    assert tools.note_metadata_service.get_note_metadata.call_count == 2
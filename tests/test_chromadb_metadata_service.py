@@ -0,0 +1,106 @@
+"""Tests for ChromaDBMetadataService note snapshot and batched lookups."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.app.services import chromadb_metadata_service as metadata_module
+from backend.app.services.chromadb_metadata_service import ChromaDBMetadataService
+from backend.app.services.vector_service import VectorService
+from tests.helpers import store_notes
+
+
+@pytest.fixture
+def service(vector_service):
+    service = ChromaDBMetadataService(vector_service=vector_service)
+    service._collection = MagicMock(wraps=service.collection)
+    return service
+
+
+@pytest.fixture
+def doc_ids(service, vector_service):
+    return store_notes(vector_service, service.collection_name, 5)
+
+
+def test_note_snapshot_is_loaded_once(service, doc_ids):
+    service.get_note_metadata(doc_ids[0])
+    service.get_note_metadata(doc_ids[1])
+    service.get_note_metadata_by_ids(doc_ids)
+
+    assert service._collection.get.call_count == 1
+
+
+def test_note_snapshot_is_shared_between_instances(service, doc_ids, vector_service):
+    service.get_note_metadata(doc_ids[0])
+    other = ChromaDBMetadataService(vector_service=vector_service)
+    other._collection = MagicMock(wraps=service.collection)
+
+    assert other.get_note_metadata(doc_ids[1]).title == "Note 1"
+    other._collection.get.assert_not_called()
+
+
+def test_note_snapshot_reloads_after_writes(service, doc_ids, vector_service):
+    assert service.get_note_metadata("note-0005") is None
+
+    store_notes(vector_service, service.collection_name, 6)
+
+    assert service.get_note_metadata("note-0005").title == "Note 5"
+    assert service._collection.get.call_count == 2
+
+
+def test_invalidate_cache_forces_reload(service, doc_ids):
+    service.get_note_metadata(doc_ids[0])
+    service.invalidate_cache()
+    service.get_note_metadata(doc_ids[0])
+
+    assert service._collection.get.call_count == 2
+
+
+def test_get_note_metadata_by_ids_from_snapshot(service, doc_ids):
+    notes = service.get_note_metadata_by_ids([doc_ids[3], "missing", doc_ids[0]])
+
+    assert {note_id: note.title for note_id, note in notes.items()} == {
+        doc_ids[3]: "Note 3",
+        doc_ids[0]: "Note 0",
+    }
+
+
+def test_get_note_metadata_by_ids_batches_without_snapshot(service, doc_ids, monkeypatch):
+    monkeypatch.setattr(metadata_module, "NOTE_CACHE_MAX_NOTES", 0)
+    monkeypatch.setattr(metadata_module, "IN_FILTER_BATCH_SIZE", 2)
+
+    notes = service.get_note_metadata_by_ids(doc_ids + [doc_ids[0], "missing"])
+
+    assert sorted(notes) == doc_ids
+    assert notes[doc_ids[4]].title == "Note 4"
+    # One snapshot attempt, then ceil(6 unique ids / 2) `$in` lookups
+    assert service._collection.get.call_count == 1 + 3
+
+
+def test_get_note_metadata_by_paths_batches_without_snapshot(service, doc_ids, monkeypatch):
+    monkeypatch.setattr(metadata_module, "NOTE_CACHE_MAX_NOTES", 0)
+    monkeypatch.setattr(metadata_module, "IN_FILTER_BATCH_SIZE", 2)
+    paths = [f"/vault/note-{i:04d}.md" for i in (1, 2, 3)]
+
+    notes = service.get_note_metadata_by_paths(paths + ["/vault/missing.md"])
+
+    assert {path: note.title for path, note in notes.items()} == {
+        paths[0]: "Note 1",
+        paths[1]: "Note 2",
+        paths[2]: "Note 3",
+    }
+    assert service._collection.get.call_count == 1 + 2
+
+
+def test_lookups_agree_with_and_without_snapshot(service, doc_ids, monkeypatch):
+    cached = service.get_note_metadata_by_ids(doc_ids)
+
+    monkeypatch.setattr(metadata_module, "NOTE_CACHE_MAX_NOTES", 0)
+    VectorService.mark_modified()
+    direct = service.get_note_metadata_by_ids(doc_ids)
+
+    # updated_at falls back to the lookup time for notes stored without one
+    exclude = {"updated_at"}
+    assert {k: v.model_dump(exclude=exclude) for k, v in cached.items()} == {
+        k: v.model_dump(exclude=exclude) for k, v in direct.items()
+    }
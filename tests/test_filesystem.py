@@ -0,0 +1,16 @@
+"""Tests for path helpers in backend.app.utils.filesystem."""
+
+from pathlib import PurePosixPath, PureWindowsPath
+
+from backend.app.utils.filesystem import note_id_from_path, posix_path_str
+
+
+def test_posix_path_str_normalizes_separators():
+    assert posix_path_str("dir\\sub\\note.md") == "dir/sub/note.md"
+    assert posix_path_str(PureWindowsPath("dir/sub/note.md")) == "dir/sub/note.md"
+    assert posix_path_str(PurePosixPath("dir/sub/note.md")) == "dir/sub/note.md"
+
+
+def test_note_id_from_path_strips_extension():
+    assert note_id_from_path("dir\\sub\\note.md") == "dir/sub/note"
+    assert note_id_from_path("note.markdown") == "note.markdown"
@@ -0,0 +1,47 @@
+"""Tests for note discovery in NoteFileService."""
+
+from pathlib import Path
+
+import pytest
+
+from backend.app.services.note_file_service import NoteFileService
+
+
+@pytest.fixture
+def notes_dir(tmp_path):
+    root = tmp_path / "notes"
+    for relative in ["a.md", "b/c.md", "b/d/e.md", "f/g.md", "h.txt"]:
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("# Note\n", encoding="utf-8")
+    return root
+
+
+def test_list_notes_finds_markdown_recursively(notes_dir):
+    notes = NoteFileService(notes_dir).list_notes()
+
+    assert sorted(notes) == [Path("a.md"), Path("b/c.md"), Path("b/d/e.md"), Path("f/g.md")]
+
+
+def test_list_notes_matches_rglob_order(notes_dir):
+    expected = [path.relative_to(notes_dir) for path in notes_dir.rglob("*.md")]
+
+    assert NoteFileService(notes_dir).list_notes() == expected
+
+
+def test_list_notes_in_subdirectory(notes_dir):
+    notes = NoteFileService(notes_dir).list_notes("b")
+
+    assert sorted(notes) == [Path("b/c.md"), Path("b/d/e.md")]
+
+
+def test_symlinked_directories_are_not_followed(notes_dir):
+    (notes_dir / "b" / "loop").symlink_to(notes_dir, target_is_directory=True)
+
+    notes = list(NoteFileService(notes_dir).iter_notes())
+
+    assert len(notes) == len(set(notes)) == 4
+
+
+def test_missing_directory_yields_nothing(tmp_path):
+    assert NoteFileService(tmp_path / "notes").list_notes("missing") == []
@@ -0,0 +1,57 @@
+"""Tests for paged note listing in NoteMetadataService."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from backend.app.services.chromadb_metadata_service import ChromaDBMetadataService
+from backend.app.services.note_metadata_service import NoteMetadataService
+from tests.helpers import store_notes
+
+
+@pytest.fixture
+def service(vector_service):
+    with patch(
+        "backend.app.services.note_metadata_service.ChromaDBMetadataService",
+        lambda: ChromaDBMetadataService(vector_service=vector_service),
+    ):
+        return NoteMetadataService()
+
+
+@pytest.fixture
+def doc_ids(service, vector_service):
+    return store_notes(vector_service, service.chromadb_service.collection_name, 7)
+
+
+def test_list_notes_page_returns_one_row_per_note(service, doc_ids):
+    first = service.list_notes_page(offset=0, limit=4)
+    rest = service.list_notes_page(offset=4, limit=4)
+
+    assert len(first) == 4
+    assert len(rest) == 3
+    assert {note.title for note in first + rest} == {f"Note {i}" for i in range(7)}
+
+
+def test_iter_all_notes_pages_through_everything(service, doc_ids):
+    notes = list(service.iter_all_notes(page_size=3))
+
+    assert sorted(note.title for note in notes) == sorted(f"Note {i}" for i in range(7))
+
+
+def test_list_notes_page_returns_empty_on_error(service):
+    service.chromadb_service._collection = MagicMock()
+    service.chromadb_service._collection.get.side_effect = RuntimeError("store unavailable")
+
+    assert service.list_notes_page() == []
+
+
+def test_iter_all_notes_raises_mid_iteration_errors(service, doc_ids):
+    collection = MagicMock(wraps=service.chromadb_service.collection)
+    service.chromadb_service._collection = collection
+    notes = service.iter_all_notes(page_size=3)
+
+    assert len([next(notes) for _ in range(3)]) == 3
+
+    collection.get.side_effect = RuntimeError("store unavailable")
+    with pytest.raises(RuntimeError, match="store unavailable"):
+        next(notes)
@@ -0,0 +1,163 @@
+"""Tests for batched note vectorization."""
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.app.services.document_service import DocumentService
+from backend.app.services.note_file_service import NoteFileService
+from backend.app.services.note_metadata_service import NoteMetadataService
+from backend.app.services.note_vectorization_service import NoteVectorizationService
+
+
+@pytest.fixture
+def notes_dir(tmp_path, monkeypatch):
+    # Notes are recognized by living under resources/notes/
+    root = tmp_path / "resources" / "notes"
+    monkeypatch.setattr("backend.app.services.document_service.RESOURCES_DIR", root.parent)
+    monkeypatch.setattr("backend.app.services.document_service.NOTES_DIR", root)
+    (root / "sub").mkdir(parents=True)
+    (root / "alpha.md").write_text("# Alpha\n\nFirst note about alpha.", encoding="utf-8")
+    (root / "beta.md").write_text("# Beta\n\nSecond note, links [[alpha]].", encoding="utf-8")
+    (root / "sub" / "gamma.md").write_text("# Gamma\n\nNested note.", encoding="utf-8")
+    (root / "ignored.txt").write_text("not a note", encoding="utf-8")
+    return root
+
+
+@pytest.fixture
+def service(notes_dir, vector_service, embedding_service):
+    note_metadata_service = MagicMock(spec=NoteMetadataService)
+    return NoteVectorizationService(
+        note_file_service=NoteFileService(notes_dir),
+        document_service=DocumentService(
+            vector_service=vector_service,
+            embedding_service=embedding_service,
+            note_metadata_service=note_metadata_service,
+        ),
+        note_metadata_service=note_metadata_service,
+        vector_service=vector_service,
+        embedding_service=embedding_service,
+    )
+
+
+def _stored_note_paths(service):
+    results = service.collection.get(include=["metadatas"])
+    return {metadata["file_path"] for metadata in results["metadatas"]}
+
+
+def test_batched_vectorization_stores_every_note(service, notes_dir):
+    vectorized, skipped = service.vectorize_all_notes_batched(force=True, max_workers=2)
+
+    assert (vectorized, skipped) == (3, 0)
+    assert _stored_note_paths(service) == {
+        str(notes_dir / "alpha.md"),
+        str(notes_dir / "beta.md"),
+        str(notes_dir / "sub" / "gamma.md"),
+    }
+
+
+def test_batched_vectorization_skips_unchanged_notes(service):
+    service.vectorize_all_notes_batched(force=True, max_workers=2)
+    chunk_count = service.collection.count()
+
+    vectorized, skipped = service.vectorize_all_notes_batched(incremental=False, max_workers=2)
+
+    assert (vectorized, skipped) == (0, 3)
+    assert service.collection.count() == chunk_count
+
+
+def _stored_doc_ids(service, note_path):
+    results = service.collection.get(where={"file_path": str(note_path)}, include=["metadatas"])
+    return {metadata["doc_id"] for metadata in results["metadatas"]}
+
+
+def test_changed_note_replaces_its_chunks(service, notes_dir):
+    service.vectorize_all_notes_batched(force=True, max_workers=2)
+    old_doc_ids = _stored_doc_ids(service, notes_dir / "alpha.md")
+    (notes_dir / "alpha.md").write_text("# Alpha\n\nRewritten alpha note.", encoding="utf-8")
+
+    vectorized, skipped = service.vectorize_all_notes_batched(incremental=False, max_workers=2)
+
+    new_doc_ids = _stored_doc_ids(service, notes_dir / "alpha.md")
+    assert (vectorized, skipped) == (1, 2)
+    assert len(new_doc_ids) == 1
+    assert not new_doc_ids & old_doc_ids
+
+
+def test_changed_note_survives_failed_embedding(service, notes_dir, monkeypatch):
+    service.vectorize_all_notes_batched(force=True, max_workers=2)
+    old_doc_ids = _stored_doc_ids(service, notes_dir / "alpha.md")
+    (notes_dir / "alpha.md").write_text("# Alpha\n\nRewritten alpha note.", encoding="utf-8")
+
+    def fail(texts, batch_size):
+        raise RuntimeError("embedding model unavailable")
+
+    monkeypatch.setattr(service, "_embed_chunks", fail)
+    vectorized, _ = service.vectorize_all_notes_batched(incremental=False, max_workers=2)
+
+    assert vectorized == 0
+    assert _stored_doc_ids(service, notes_dir / "alpha.md") == old_doc_ids
+
+
+def test_single_note_is_replaced_after_storing(service, notes_dir):
+    first = service.vectorize_note("alpha.md")
+    (notes_dir / "alpha.md").write_text("# Alpha\n\nRewritten alpha note.", encoding="utf-8")
+
+    second = service.vectorize_note(str(notes_dir / "alpha.md"))
+
+    assert second.doc_id != first.doc_id
+    assert _stored_doc_ids(service, notes_dir / "alpha.md") == {second.doc_id}
+
+
+def test_forced_revectorization_replaces_chunks(service):
+    service.vectorize_all_notes_batched(force=True, max_workers=2)
+    chunk_count = service.collection.count()
+
+    vectorized, _ = service.vectorize_all_notes_batched(force=True, max_workers=2)
+
+    assert vectorized == 3
+    assert service.collection.count() == chunk_count
+
+
+def test_batched_vectorization_with_no_notes(tmp_path, service):
+    service.note_file_service = NoteFileService(tmp_path / "empty")
+
+    assert service.vectorize_all_notes_batched() == (0, 0)
+
+
+def test_writer_failure_is_raised_instead_of_hanging(service, monkeypatch):
+    original_bulk_load = service.vector_service.bulk_load
+
+    def bulk_load():
+        if threading.current_thread().name == "note-vector-writer":
+            raise OSError("store unavailable")
+        return original_bulk_load()
+
+    monkeypatch.setattr(service.vector_service, "bulk_load", bulk_load)
+    monkeypatch.setattr(
+        "backend.app.services.note_vectorization_service.WRITE_QUEUE_POLL_INTERVAL", 0.01
+    )
+
+    errors = []
+
+    def run():
+        try:
+            service.vectorize_all_notes_batched(force=True, max_workers=2, max_pending_writes=1)
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout=30)
+
+    assert not thread.is_alive(), "vectorize_all_notes_batched hung after the writer died"
+    assert len(errors) == 1
+    assert isinstance(errors[0], RuntimeError)
+    assert isinstance(errors[0].__cause__, OSError)
+
+
+def test_update_all_notes_metadata_counts_notes(service):
+    service.note_metadata_service.get_note_metadata.return_value = MagicMock()
+
+    assert service.update_all_notes_metadata() == (3, 0)
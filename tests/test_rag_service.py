@@ -0,0 +1,117 @@
+"""Tests for the RAG response cache."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.app.services.llm_service import LLMService
+from backend.app.services.rag_service import RAGService
+from backend.app.utils.llm_config import LLMConfig
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    yield
+    with RAGService._response_cache_lock:
+        RAGService._response_cache.clear()
+
+
+@pytest.fixture
+def collection(vector_service, embedding_service):
+    texts = ["alpha is the first letter", "beta comes second", "gamma is third"]
+    vector_service.add_documents(
+        "docs",
+        documents=texts,
+        ids=["a", "b", "c"],
+        metadatas=[{"title": text.split()[0], "doc_id": text[0]} for text in texts],
+        embeddings=[embedding_service.embed_text(text) for text in texts],
+    )
+    return "docs"
+
+
+def _llm(model: str = "model-a", temperature: float = 0.7) -> MagicMock:
+    llm = MagicMock(spec=LLMService)
+    llm.config = LLMConfig()
+    llm.config.model = model
+    llm.config.temperature = temperature
+    llm.invoke.return_value = f"answer from {model}"
+    return llm
+
+
+def _rag(vector_service, embedding_service, collection, llm) -> RAGService:
+    return RAGService(
+        vector_service=vector_service,
+        embedding_service=embedding_service,
+        llm_service=llm,
+        collection_name=collection,
+        k=2,
+    )
+
+
+def test_repeated_question_is_served_from_cache(vector_service, embedding_service, collection):
+    llm = _llm()
+    rag = _rag(vector_service, embedding_service, collection, llm)
+
+    first = rag.query("what is alpha?")
+    second = rag.query("what is alpha?")
+
+    assert first == second
+    assert first["answer"] == "answer from model-a"
+    assert llm.invoke.call_count == 1
+
+
+def test_cache_is_shared_across_instances(vector_service, embedding_service, collection):
+    llm = _llm()
+    _rag(vector_service, embedding_service, collection, llm).query("what is alpha?")
+    _rag(vector_service, embedding_service, collection, llm).query("what is alpha?")
+
+    assert llm.invoke.call_count == 1
+
+
+def test_write_invalidates_cached_answers(vector_service, embedding_service, collection):
+    llm = _llm()
+    rag = _rag(vector_service, embedding_service, collection, llm)
+
+    rag.query("what is alpha?")
+    vector_service.mark_modified()
+    rag.query("what is alpha?")
+
+    assert llm.invoke.call_count == 2
+
+
+def test_expired_answers_are_regenerated(
+    vector_service, embedding_service, collection, monkeypatch
+):
+    monkeypatch.setattr("backend.app.services.rag_service.RESPONSE_CACHE_TTL", 0)
+    llm = _llm()
+    rag = _rag(vector_service, embedding_service, collection, llm)
+
+    rag.query("what is alpha?")
+    rag.query("what is alpha?")
+
+    assert llm.invoke.call_count == 2
+
+
+@pytest.mark.parametrize("other", [_llm(model="model-b"), _llm(temperature=0.0)])
+def test_llm_settings_are_part_of_the_key(vector_service, embedding_service, collection, other):
+    llm = _llm()
+    _rag(vector_service, embedding_service, collection, llm).query("what is alpha?")
+    _rag(vector_service, embedding_service, collection, other).query("what is alpha?")
+
+    assert llm.invoke.call_count == 1
+    assert other.invoke.call_count == 1
+
+
+def test_cached_response_is_a_copy(vector_service, embedding_service, collection):
+    rag = _rag(vector_service, embedding_service, collection, _llm())
+
+    first = rag.query("what is alpha?")
+    first["answer"] = "changed"
+    first["sources"][0]["title"] = "changed"
+    first["sources"].clear()
+    first["metadata"]["retrieved_count"] = -1
+
+    second = rag.query("what is alpha?")
+    assert second["answer"] == "answer from model-a"
+    assert second["sources"] and second["sources"][0]["title"] != "changed"
+    assert second["metadata"]["retrieved_count"] != -1
@@ -0,0 +1,81 @@
+"""Tests for the RerankService score and embedding caches."""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from backend.app.services import rerank_service as rerank_module
+from backend.app.services.embedding_service import EmbeddingService
+from backend.app.services.rerank_service import RerankService
+
+
+@pytest.fixture
+def service():
+    service = RerankService(provider="local")
+    scored = []
+
+    def predict(pairs, **kwargs):
+        scored.append([document for _, document in pairs])
+        return np.array([float(len(document)) for _, document in pairs], dtype=np.float32)
+
+    # Stands in for the CrossEncoder, scoring documents by length
+    service._model = MagicMock()
+    service._model.predict.side_effect = predict
+    service.scored = scored
+    return service
+
+
+def test_rerank_sorts_by_score(service):
+    ranked = service.rerank("q", ["bb", "a", "ccc"], top_k=2)
+
+    assert ranked == [("ccc", 3.0), ("bb", 2.0)]
+
+
+def test_repeated_pairs_are_not_rescored(service):
+    service.rerank("q", ["a", "bb"])
+    ranked = service.rerank("q", ["bb", "ccc", "a"])
+
+    assert service.scored == [["a", "bb"], ["ccc"]]
+    assert ranked == [("ccc", 3.0), ("bb", 2.0), ("a", 1.0)]
+
+
+def test_scores_are_cached_per_query(service):
+    service.rerank("first", ["a", "bb"])
+    service.rerank("second", ["a", "bb"])
+
+    assert service.scored == [["a", "bb"], ["a", "bb"]]
+
+
+def test_duplicate_documents_are_scored_once(service):
+    ranked = service.rerank("q", ["a", "bb", "a"])
+
+    assert service.scored == [["a", "bb"]]
+    assert sorted(ranked) == [("a", 1.0), ("a", 1.0), ("bb", 2.0)]
+
+
+def test_score_cache_is_bounded(service, monkeypatch):
+    monkeypatch.setattr(rerank_module, "RERANK_CACHE_SIZE", 2)
+
+    service.rerank("q", ["a", "bb", "ccc"])
+    service.rerank("q", ["a"])
+
+    assert len(service._score_cache) == 2
+    assert service.scored[-1] == ["a"]
+
+
+def test_document_embedding_cache_is_bounded_and_float32(monkeypatch):
+    monkeypatch.setattr(rerank_module, "RERANK_EMBED_CACHE_SIZE", 2)
+    vectors = {"q": [1.0, 0.0], "a": [1.0, 0.0], "bb": [0.0, 1.0], "ccc": [1.0, 1.0]}
+    embedding_service = MagicMock(spec=EmbeddingService)
+    embedding_service.embed_text.side_effect = lambda text: vectors[text]
+    embedding_service.embed_texts.side_effect = lambda texts: [vectors[text] for text in texts]
+    service = RerankService(provider="openai", embedding_service=embedding_service)
+
+    ranked = service.rerank("q", ["bb", "a", "ccc"])
+
+    assert [document for document, _ in ranked] == ["a", "ccc", "bb"]
+    assert len(service._doc_embedding_cache) == 2
+    assert all(
+        embedding.dtype == np.float32 for embedding in service._doc_embedding_cache.values()
+    )
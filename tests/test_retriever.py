@@ -0,0 +1,39 @@
+"""Tests for the shared query embedding cache."""
+
+import pytest
+
+from backend.app.services import retriever
+from backend.app.services.retriever import embed_query_cached
+
+
+@pytest.fixture(autouse=True)
+def clear_query_embedding_cache():
+    yield
+    with retriever._query_embedding_lock:
+        retriever._query_embedding_caches.clear()
+
+
+def test_repeated_query_is_embedded_once(embedding_service):
+    first = embed_query_cached(embedding_service, "what is rag")
+    second = embed_query_cached(embedding_service, "what is rag")
+
+    assert second == first
+    embedding_service.embed_text.assert_called_once_with("what is rag")
+
+
+def test_cache_is_keyed_by_model(embedding_service):
+    embed_query_cached(embedding_service, "query")
+    embedding_service.model_name = "other-model"
+    embed_query_cached(embedding_service, "query")
+
+    assert embedding_service.embed_text.call_count == 2
+
+
+def test_cache_is_bounded(embedding_service, monkeypatch):
+    monkeypatch.setattr(retriever, "QUERY_EMB_CACHE_SIZE", 2)
+
+    for query in ("one", "two", "three", "one"):
+        embed_query_cached(embedding_service, query)
+
+    assert embedding_service.embed_text.call_count == 4
+    assert len(retriever._query_embedding_caches["fake-model:float32"]) == 2
@@ -0,0 +1,63 @@
+"""Tests for StructuredCodeRetriever batch search."""
+
+import pytest
+
+from backend.app.services import retriever as retriever_module
+from backend.app.services.structured_code_retriever import StructuredCodeRetriever
+
+
+@pytest.fixture(autouse=True)
+def clear_query_embedding_cache():
+    yield
+    with retriever_module._query_embedding_lock:
+        retriever_module._query_embedding_caches.clear()
+
+
+@pytest.fixture
+def retriever(vector_service, embedding_service):
+    query_embedding = embedding_service.embed_text("q")
+    # lib/ files sit on the query embedding, so they outrank every src/ file
+    files = {
+        "lib/b.py": query_embedding,
+        "lib/d.py": query_embedding,
+        "src/a.py": [5.0, 30.0, 1.0],
+        "src/c.py": [6.0, 40.0, 1.0],
+    }
+    vector_service.add_documents(
+        "code",
+        documents=[f"code in {path}" for path in files],
+        ids=list(files),
+        metadatas=[{"file_path": path} for path in files],
+        embeddings=list(files.values()),
+    )
+    return StructuredCodeRetriever(
+        vector_service=vector_service,
+        embedding_service=embedding_service,
+        collection_name="code",
+    )
+
+
+def _paths(results):
+    return [result["metadata"]["file_path"] for result in results]
+
+
+def test_batch_search_applies_regex_filters(retriever):
+    src_results, lib_results = retriever.batch_search(
+        [
+            ("q", {"file_path": {"$regex": "^src/"}}),
+            ("q", {"file_path": {"$regex": "^lib/"}}),
+        ],
+        k=1,
+    )
+
+    assert _paths(src_results) == ["src/a.py"]
+    assert _paths(lib_results) in (["lib/b.py"], ["lib/d.py"])
+
+
+def test_batch_search_matches_hybrid_search(retriever):
+    metadata_filter = {"file_path": {"$regex": "^src/"}}
+
+    (batched,) = retriever.batch_search([("q", metadata_filter)], k=2)
+
+    assert _paths(batched) == _paths(retriever.hybrid_search("q", metadata_filter, k=2))
+    assert _paths(batched) == ["src/a.py", "src/c.py"]
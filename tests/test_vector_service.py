@@ -0,0 +1,234 @@
+"""Tests for VectorService collection setup, caches and batch APIs."""
+
+from unittest.mock import MagicMock
+
+from backend.app.services import vector_service as vector_service_module
+from backend.app.services.vector_service import VectorService
+from backend.app.utils.chromadb_config import ChromaDBConfig
+
+
+def test_new_collections_keep_default_space(vector_service):
+    vector_service.get_or_create_collection("notes-default")
+
+    assert vector_service.get_collection_distance_space("notes-default") == "l2"
+
+
+def test_new_collections_get_hnsw_settings(vector_service):
+    collection = vector_service.get_or_create_collection("notes-hnsw")
+
+    assert collection.metadata["hnsw:M"] == vector_service.config.hnsw_config["hnsw:M"]
+
+
+def test_configured_space_applies_to_new_collections_only(tmp_path, monkeypatch):
+    path = str(tmp_path / "chroma")
+    VectorService(config=ChromaDBConfig(persist_directory=path)).get_or_create_collection(
+        "existing"
+    )
+
+    monkeypatch.setenv("CHROMA_HNSW_SPACE", "cosine")
+    service = VectorService(config=ChromaDBConfig(persist_directory=path))
+    service.get_or_create_collection("created-later")
+
+    assert service.get_collection_distance_space("existing") == "l2"
+    assert service.get_collection_distance_space("created-later") == "cosine"
+
+
+def test_caller_metadata_overrides_hnsw_settings(vector_service):
+    vector_service.get_or_create_collection("inner-product", metadata={"hnsw:space": "ip"})
+
+    assert vector_service.get_collection_distance_space("inner-product") == "ip"
+
+
+def _spy_collection(vector_service, collection_name):
+    """Swap the shared collection handle for a spy that still hits ChromaDB."""
+    collection = vector_service.get_or_create_collection(collection_name)
+    spy = MagicMock(wraps=collection)
+    key = (str(vector_service.config.persist_directory), collection_name)
+    with VectorService._collections_lock:
+        VectorService._collections[key] = spy
+    return spy
+
+
+def _store(vector_service, collection_name, count):
+    vector_service.add_documents(
+        collection_name,
+        documents=[f"doc {i}" for i in range(count)],
+        ids=[f"doc-{i}" for i in range(count)],
+        embeddings=[[float(i), 1.0, 0.0] for i in range(count)],
+    )
+
+
+def test_repeated_query_is_served_from_cache(vector_service):
+    _store(vector_service, "cached", 5)
+    spy = _spy_collection(vector_service, "cached")
+
+    first = vector_service.query("cached", query_embeddings=[[1.0, 1.0, 0.0]], n_results=2)
+    second = vector_service.query("cached", query_embeddings=[[1.0, 1.0, 0.0]], n_results=2)
+
+    assert spy.query.call_count == 1
+    assert second == first
+
+
+def test_cached_results_are_copies(vector_service):
+    _store(vector_service, "copies", 3)
+    vector_service.add_documents(
+        "copies", documents=["tagged"], ids=["tagged"],
+        metadatas=[{"tag": "a"}], embeddings=[[0.0, 0.0, 1.0]],
+    )
+
+    first = vector_service.query("copies", query_embeddings=[[0.0, 0.0, 1.0]], n_results=1)
+    first["ids"][0].append("mutated")
+    first["metadatas"][0][0]["tag"] = "mutated"
+    second = vector_service.query("copies", query_embeddings=[[0.0, 0.0, 1.0]], n_results=1)
+
+    assert second["ids"] == [["tagged"]]
+    assert second["metadatas"][0][0]["tag"] == "a"
+
+
+def test_writes_invalidate_cached_queries(vector_service):
+    _store(vector_service, "invalidated", 3)
+    query = [[10.0, 1.0, 0.0]]
+    before = vector_service.query("invalidated", query_embeddings=query, n_results=1)
+
+    vector_service.add_documents(
+        "invalidated", documents=["closest"], ids=["closest"], embeddings=[[10.0, 1.0, 0.0]]
+    )
+    after = vector_service.query("invalidated", query_embeddings=query, n_results=1)
+
+    assert before["ids"] == [["doc-2"]]
+    assert after["ids"] == [["closest"]]
+
+
+def test_mark_modified_invalidates_cached_queries(vector_service):
+    _store(vector_service, "marked", 3)
+    spy = _spy_collection(vector_service, "marked")
+
+    vector_service.query("marked", query_embeddings=[[1.0, 1.0, 0.0]], n_results=1)
+    VectorService.mark_modified()
+    vector_service.query("marked", query_embeddings=[[1.0, 1.0, 0.0]], n_results=1)
+
+    assert spy.query.call_count == 2
+
+
+def test_cached_queries_expire(vector_service, monkeypatch):
+    monkeypatch.setattr(vector_service_module, "VECTOR_QUERY_CACHE_TTL", 0)
+    _store(vector_service, "expiring", 3)
+    spy = _spy_collection(vector_service, "expiring")
+
+    vector_service.query("expiring", query_embeddings=[[1.0, 1.0, 0.0]], n_results=1)
+    vector_service.query("expiring", query_embeddings=[[1.0, 1.0, 0.0]], n_results=1)
+
+    assert spy.query.call_count == 2
+
+
+def test_similar_queries_hit_semantic_cache_only_when_enabled(vector_service, monkeypatch):
+    _store(vector_service, "semantic", 3)
+    spy = _spy_collection(vector_service, "semantic")
+
+    vector_service.query("semantic", query_embeddings=[[1.0, 1.0, 0.0]], n_results=1)
+    vector_service.query("semantic", query_embeddings=[[1.0, 1.001, 0.0]], n_results=1)
+    assert spy.query.call_count == 2
+
+    monkeypatch.setattr(vector_service_module, "VECTOR_QUERY_CACHE_SIMILARITY", 0.99)
+    vector_service.query("semantic", query_embeddings=[[2.0, 2.0, 0.0]], n_results=1)
+    vector_service.query("semantic", query_embeddings=[[2.0, 2.002, 0.0]], n_results=1)
+    vector_service.query("semantic", query_embeddings=[[0.0, 0.0, 1.0]], n_results=1)
+    assert spy.query.call_count == 4
+
+
+def test_batch_query_keeps_input_order(vector_service):
+    _store(vector_service, "batched", 10)
+    embeddings = [[float(i), 1.0, 0.0] for i in (7, 2, 9, 0)]
+
+    results = vector_service.batch_query("batched", embeddings, n_results=1, max_workers=3)
+
+    assert [result["ids"] for result in results] == [
+        [["doc-7"]], [["doc-2"]], [["doc-9"]], [["doc-0"]]
+    ]
+
+
+def test_batch_query_reuses_cached_queries(vector_service):
+    _store(vector_service, "batched-cache", 5)
+    vector_service.query("batched-cache", query_embeddings=[[1.0, 1.0, 0.0]], n_results=1)
+    spy = _spy_collection(vector_service, "batched-cache")
+
+    results = vector_service.batch_query(
+        "batched-cache", [[1.0, 1.0, 0.0], [3.0, 1.0, 0.0]], n_results=1
+    )
+
+    assert spy.query.call_count == 1
+    assert [result["ids"] for result in results] == [[["doc-1"]], [["doc-3"]]]
+
+
+def test_add_documents_writes_in_sub_batches(vector_service):
+    spy = _spy_collection(vector_service, "sub-batches")
+
+    vector_service.add_documents(
+        "sub-batches",
+        documents=[f"doc {i}" for i in range(5)],
+        ids=[f"doc-{i}" for i in range(5)],
+        embeddings=[[float(i), 1.0, 0.0] for i in range(5)],
+        batch_size=2,
+    )
+
+    assert [len(call.kwargs["ids"]) for call in spy.add.call_args_list] == [2, 2, 1]
+    assert spy.count() == 5
+
+
+def test_add_documents_skips_stored_ids(vector_service):
+    count = vector_service_module.EXISTING_ID_PROBE_MIN
+    _store(vector_service, "existing", count)
+    spy = _spy_collection(vector_service, "existing")
+
+    vector_service.add_documents(
+        "existing",
+        documents=[f"doc {i}" for i in range(count + 1)],
+        ids=[f"doc-{i}" for i in range(count + 1)],
+        embeddings=[[float(i), 1.0, 0.0] for i in range(count + 1)],
+    )
+
+    assert spy.add.call_args.kwargs["ids"] == [f"doc-{count}"]
+    assert spy.count() == count + 1
+
+
+def test_delete_documents_batches_and_marks_modified(vector_service):
+    _store(vector_service, "deleted", 5)
+    spy = _spy_collection(vector_service, "deleted")
+    generation = VectorService.write_generation
+
+    vector_service.delete_documents("deleted", ["doc-0", "doc-1", "doc-2"], batch_size=2)
+
+    assert [call.kwargs["ids"] for call in spy.delete.call_args_list] == [
+        ["doc-0", "doc-1"], ["doc-2"]
+    ]
+    assert VectorService.write_generation > generation
+    assert spy.count() == 2
+
+
+def test_empty_inputs_skip_chromadb(vector_service):
+    spy = _spy_collection(vector_service, "empty")
+    generation = VectorService.write_generation
+
+    vector_service.add_documents("empty", documents=[], ids=[])
+    vector_service.delete_documents("empty", [])
+    result = vector_service.query("empty", query_embeddings=[])
+
+    assert result["ids"] == [[]]
+    assert vector_service.batch_query("empty", []) == []
+    spy.add.assert_not_called()
+    spy.delete.assert_not_called()
+    spy.query.assert_not_called()
+    assert VectorService.write_generation == generation
+
+
+def test_bulk_load_warns_without_sqlite_connection(vector_service, monkeypatch, caplog):
+    apply_pragmas = MagicMock()
+    monkeypatch.setattr(vector_service_module, "get_sqlite_connection", lambda client: None)
+    monkeypatch.setattr(vector_service_module, "apply_sqlite_pragmas", apply_pragmas)
+
+    with caplog.at_level("WARNING", logger=vector_service_module.__name__):
+        with vector_service.bulk_load():
+            pass
+
+    assert "Bulk load mode unavailable" in caplog.text
+    apply_pragmas.assert_not_called()